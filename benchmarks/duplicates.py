@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Benchmark find_duplicate_tracks blocking on a synthetic library.
+
+    python benchmarks/duplicates.py [rows]
+"""
+
+import random
+import sys
+import time
+from types import SimpleNamespace
+
+from library_analysis import make_rows
+
+from rekordbox_mcp.duplicates import DuplicateBlocks
+from rekordbox_mcp.rows import TrackRow
+
+
+def main(n: int) -> None:
+    rows = make_rows(n)
+    # Re-add 2% of the library as near-identical copies
+    rng = random.Random(3)
+    for i, row in enumerate(rng.sample(rows, n // 50)):
+        rows.append(
+            TrackRow.from_content(
+                SimpleNamespace(
+                    ID=n + i,
+                    Title=f"{row.title} (Original Mix)",
+                    ArtistName=row.artist,
+                    Length=row.length + rng.randint(-1, 1),
+                )
+            )
+        )
+
+    start = time.perf_counter()
+    blocks = DuplicateBlocks(rows)
+    build_ms = (time.perf_counter() - start) * 1e3
+    start = time.perf_counter()
+    clusters = blocks.clusters()
+    cluster_ms = (time.perf_counter() - start) * 1e3
+    print(
+        f"{len(rows)} rows: blocked in {build_ms:.0f} ms, "
+        f"{len(clusters)} clusters in {cluster_ms:.1f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Benchmark fuzzy search latency on a synthetic library.
+
+    python benchmarks/fuzzy_search.py [rows]
+"""
+
+import random
+import string
+import sys
+import time
+from types import SimpleNamespace
+
+from rekordbox_mcp.fuzzy import FuzzyIndex
+from rekordbox_mcp.rows import TrackRow
+
+
+def make_rows(n: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    words = [
+        "".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 9)))
+        for _ in range(20_000)
+    ]
+    artists = [" ".join(rng.sample(words, 2)).title() for _ in range(n // 10)]
+    return [
+        TrackRow.from_content(
+            SimpleNamespace(
+                ID=i,
+                Title=" ".join(rng.sample(words, rng.randint(1, 4))).title(),
+                ArtistName=rng.choice(artists),
+                AlbumName=" ".join(rng.sample(words, 2)).title(),
+            )
+        )
+        for i in range(n)
+    ]
+
+
+def main(n: int) -> None:
+    rows = make_rows(n)
+    start = time.perf_counter()
+    index = FuzzyIndex(rows)
+    build_ms = (time.perf_counter() - start) * 1e3
+    print(f"{n} rows, {index.vocabulary_size} tokens, index built in {build_ms:.0f} ms")
+
+    rng = random.Random(1)
+    queries = []
+    for row in rng.sample(rows, 200):
+        word = list(row.artist.split()[0].lower())
+        word[rng.randrange(len(word))] = rng.choice(string.ascii_lowercase)
+        queries.append("".join(word))
+
+    timings = []
+    for query in queries:
+        start = time.perf_counter()
+        index.search(query)
+        timings.append((time.perf_counter() - start) * 1e3)
+    timings.sort()
+    print(
+        f"single-typo queries: median {timings[len(timings) // 2]:.2f} ms, "
+        f"p95 {timings[int(len(timings) * 0.95)]:.2f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
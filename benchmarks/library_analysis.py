@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Benchmark multi-dimensional analyze_library pivots on a synthetic library.
+
+    python benchmarks/library_analysis.py [rows]
+"""
+
+import random
+import sys
+import time
+from types import SimpleNamespace
+
+from rekordbox_mcp.analytics import LibraryColumns, group_stats, top_groups
+from rekordbox_mcp.rows import TrackRow
+
+GENRES = [f"Genre {i}" for i in range(60)]
+KEYS = [f"{n}{m}" for n in range(1, 13) for m in "AB"]
+
+
+def make_rows(n: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    artists = [f"Artist {i}" for i in range(n // 8)]
+    return [
+        TrackRow.from_content(
+            SimpleNamespace(
+                ID=i,
+                Title=f"Track {i}",
+                ArtistName=rng.choice(artists),
+                GenreName=rng.choice(GENRES),
+                KeyName=rng.choice(KEYS),
+                BPM=rng.randint(8000, 17500),
+                Rating=rng.randint(0, 5),
+                DJPlayCount=rng.randint(0, 50),
+                Length=rng.randint(120, 600),
+                ReleaseYear=rng.randint(1990, 2024),
+            )
+        )
+        for i in range(n)
+    ]
+
+
+def main(n: int) -> None:
+    rows = make_rows(n)
+    start = time.perf_counter()
+    columns = LibraryColumns(rows)
+    for column in ("genre", "key", "artist"):
+        columns.factor(column)
+    build_ms = (time.perf_counter() - start) * 1e3
+    print(f"{n} rows, columns built in {build_ms:.0f} ms")
+
+    for dimensions in (["genre", "key"], ["year", "genre"], ["bpm_bucket", "rating"]):
+        timings = []
+        for _ in range(20):
+            start = time.perf_counter()
+            labels, stats = group_stats(columns, dimensions)
+            top_groups(labels, stats, "count", 20)
+            timings.append((time.perf_counter() - start) * 1e3)
+        timings.sort()
+        print(
+            f"{' x '.join(dimensions)}: {len(labels)} groups, "
+            f"median {timings[len(timings) // 2]:.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
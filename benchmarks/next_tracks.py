@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Benchmark suggest_next_tracks lookups on a synthetic library.
+
+    python benchmarks/next_tracks.py [rows]
+"""
+
+import random
+import sys
+import time
+
+from library_analysis import make_rows
+
+from rekordbox_mcp.analytics import LibraryColumns
+from rekordbox_mcp.suggest import NextTrackIndex
+
+
+def main(n: int) -> None:
+    rows = make_rows(n)
+    columns = LibraryColumns(rows)
+    start = time.perf_counter()
+    index = NextTrackIndex(columns)
+    build_ms = (time.perf_counter() - start) * 1e3
+    print(f"{n} rows, index built in {build_ms:.0f} ms")
+
+    rng = random.Random(1)
+    for max_key_distance in (1, 2):
+        timings = []
+        for _ in range(200):
+            seed = rng.randrange(n)
+            start = time.perf_counter()
+            index.suggest(seed, 10, max_key_distance=max_key_distance)
+            timings.append((time.perf_counter() - start) * 1e3)
+        timings.sort()
+        print(
+            f"max_key_distance={max_key_distance}: "
+            f"median {timings[len(timings) // 2]:.2f} ms, "
+            f"p99 {timings[int(len(timings) * 0.99)]:.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
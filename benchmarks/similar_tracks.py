@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Benchmark find_similar_tracks nearest-neighbour queries on a synthetic library.
+
+    python benchmarks/similar_tracks.py [rows]
+"""
+
+import random
+import sys
+import time
+
+from library_analysis import make_rows
+
+from rekordbox_mcp.analytics import LibraryColumns
+from rekordbox_mcp.similarity import TrackVectors
+
+
+def main(n: int) -> None:
+    columns = LibraryColumns(make_rows(n))
+    start = time.perf_counter()
+    vectors = TrackVectors(columns)
+    build_ms = (time.perf_counter() - start) * 1e3
+    print(
+        f"{n} rows, {vectors.matrix.shape[1]}-dimensional vectors "
+        f"built in {build_ms:.0f} ms"
+    )
+
+    rng = random.Random(1)
+    timings = []
+    for _ in range(100):
+        seed = rng.randrange(n)
+        start = time.perf_counter()
+        vectors.nearest(seed, 10)
+        timings.append((time.perf_counter() - start) * 1e3)
+    timings.sort()
+    print(
+        f"k=10: median {timings[len(timings) // 2]:.2f} ms, "
+        f"p99 {timings[int(len(timings) * 0.99)]:.2f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
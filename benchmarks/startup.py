@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Benchmark server start-up against a synthetic library: time to connect, time
+to the first tool response, and time until the cache warm-up finishes.
+
+    python benchmarks/startup.py [rows]
+
+The synthetic database builds a fresh object per row on every table scan, as
+the ORM does, and answers COUNT queries without touching rows.
+"""
+
+import asyncio
+import random
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from loguru import logger
+
+import rekordbox_mcp.server as srv
+from rekordbox_mcp.database import RekordboxDatabase
+
+GENRES = [f"Genre {i}" for i in range(60)]
+KEYS = [f"{n}{m}" for n in range(1, 13) for m in "AB"]
+
+
+class Table:
+    """Query stand-in: every iteration hydrates new row objects."""
+
+    def __init__(self, rows: list):
+        self._rows = rows
+
+    def __iter__(self):
+        return (SimpleNamespace(**row) for row in self._rows)
+
+    def filter_by(self, **kwargs):
+        return Table(
+            [r for r in self._rows if all(r.get(k) == v for k, v in kwargs.items())]
+        )
+
+    def count(self) -> int:
+        return len(self._rows)
+
+
+class SyntheticRekordbox:
+    def __init__(self, n: int, seed: int = 7):
+        rng = random.Random(seed)
+        self.content = [
+            dict(
+                ID=i,
+                Title=f"Track {i}",
+                ArtistName=f"Artist {rng.randrange(n // 8 or 1)}",
+                AlbumName="",
+                GenreName=rng.choice(GENRES),
+                KeyName=rng.choice(KEYS),
+                BPM=rng.randint(8000, 17500),
+                Rating=rng.randint(0, 5),
+                DJPlayCount=rng.randint(0, 50),
+                Length=rng.randint(120, 600),
+                FolderPath=f"/music/{i}.mp3",
+                DateCreated="2024-01-01",
+                rb_local_deleted=0,
+                rb_local_usn=i,
+            )
+            for i in range(n)
+        ]
+        self.playlists = [
+            dict(ID=p, Name=f"Playlist {p}", ParentID="root", Attribute=0, Seq=p)
+            for p in range(200)
+        ]
+        self.playlist_songs = [
+            dict(ID=s, PlaylistID=s % 200, ContentID=rng.randrange(n), TrackNo=s)
+            for s in range(n // 2)
+        ]
+        self.histories = [
+            dict(ID=h, Name="", Attribute=0, DateCreated="2024-08-15 22:00:00")
+            for h in range(300)
+        ]
+        self.history_songs = [
+            dict(ID=s, HistoryID=s % 300, ContentID=rng.randrange(n), TrackNo=s)
+            for s in range(9000)
+        ]
+
+    def __call__(self, *args, **kwargs):
+        return self
+
+    def get_content(self, **kwargs):
+        return Table(self.content)
+
+    def get_playlist(self, **kwargs):
+        return Table(self.playlists)
+
+    def get_playlist_songs(self, **kwargs):
+        return Table(self.playlist_songs)
+
+    def get_history(self, **kwargs):
+        return Table(self.histories)
+
+    def get_history_songs(self, **kwargs):
+        return Table(self.history_songs)
+
+    def close(self):
+        pass
+
+
+async def start_and_query() -> dict:
+    search = getattr(srv.search_tracks, "fn", srv.search_tracks)
+    started = time.perf_counter()
+    srv.start_background_initialization()
+    await search(genre="Genre 7", bpm_min=120, bpm_max=130, limit=10)
+    first_response = time.perf_counter() - started
+    if srv._warmup_task is not None:
+        await srv._warmup_task
+    return {
+        "connect_ms": srv._startup_status["connect_ms"],
+        "first_response_ms": round(first_response * 1000, 1),
+        "warm_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
+
+
+def main(n: int) -> None:
+    logger.remove()
+    synthetic = SyntheticRekordbox(n)
+    with (
+        patch("rekordbox_mcp.database.Rekordbox6Database", synthetic),
+        patch.object(
+            RekordboxDatabase, "_detect_database_path", return_value=Path(".")
+        ),
+    ):
+        timings = asyncio.run(start_and_query())
+    print(
+        f"{n} tracks: connected in {timings['connect_ms']:g} ms, "
+        f"first tool response after {timings['first_response_ms']:g} ms, "
+        f"caches warm after {timings['warm_ms']:g} ms"
+    )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
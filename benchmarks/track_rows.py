@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-row track conversion cost.
+
+Compares building a validated pydantic Track for every row (the old hot path)
+with building slotted TrackRows once per content snapshot and validating only
+the rows that are returned. Uses synthetic content, no rekordbox install needed.
+
+    python benchmarks/track_rows.py [rows]
+"""
+
+import asyncio
+import sys
+import time
+from types import SimpleNamespace
+
+from rekordbox_mcp.database import RekordboxDatabase
+from rekordbox_mcp.models import SearchOptions, Track
+from rekordbox_mcp.rows import TrackRow
+
+
+def make_content(n: int) -> list:
+    genres = ["House", "Techno", "Trance", "Drum and Bass", "Ambient"]
+    return [
+        SimpleNamespace(
+            ID=i,
+            Title=f"Track {i}",
+            ArtistName=f"Artist {i % 500}",
+            AlbumName=f"Album {i % 900}",
+            GenreName=genres[i % len(genres)],
+            KeyName=f"{i % 12 + 1}{'AB'[i % 2]}",
+            BPM=9000 + (i * 37) % 9000,
+            Rating=i % 6,
+            DJPlayCount=i % 40,
+            Length=180 + i % 400,
+            FolderPath=f"/music/{i}.mp3",
+            DateCreated="2024-01-01",
+            StockDate="2024-01-02",
+            BitRate=320,
+            SampleRate=44100,
+            Commnt="",
+            rb_local_deleted=0,
+            rb_local_usn=i,
+        )
+        for i in range(n)
+    ]
+
+
+def per_row_us(fn, content: list) -> float:
+    start = time.perf_counter()
+    for c in content:
+        fn(c)
+    return (time.perf_counter() - start) / len(content) * 1e6
+
+
+def legacy_track(content) -> Track:
+    return TrackRow.from_content(content).to_track()
+
+
+async def search_ms(db: RekordboxDatabase, options: SearchOptions, runs: int) -> float:
+    start = time.perf_counter()
+    for _ in range(runs):
+        await db.search_tracks(options)
+    return (time.perf_counter() - start) / runs * 1e3
+
+
+async def main(n: int) -> None:
+    content = make_content(n)
+    rows = [TrackRow.from_content(c) for c in content]
+
+    print(f"Per-row conversion ({n} rows)")
+    print(f"  pydantic Track:    {per_row_us(legacy_track, content):7.2f} us")
+    print(f"  TrackRow:          {per_row_us(TrackRow.from_content, content):7.2f} us")
+    print(f"  cached row access: {per_row_us(lambda r: r.as_dict(), rows):7.2f} us")
+
+    db = RekordboxDatabase()
+    db.db = SimpleNamespace(get_content=lambda **kwargs: content)
+    options = SearchOptions(query="track", limit=50)
+    await db.search_tracks(options)  # warm the content cache and rows
+
+    legacy_start = time.perf_counter()
+    [legacy_track(c) for c in content][: options.limit]
+    legacy_ms = (time.perf_counter() - legacy_start) * 1e3
+
+    print(f"\nsearch_tracks, {n} matches, limit {options.limit}")
+    print(f"  validate every match: {legacy_ms:8.2f} ms")
+    print(f"  rows + validate page: {await search_ms(db, options, 10):8.2f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000))
@@ -0,0 +1,475 @@
+"""
+Library Analytics
+
+Columnar numpy snapshot of the track rows and vectorised group-by over one or
+more dimensions. Categorical columns are factorised once per content version,
+so a pivot is a handful of ``np.unique``/``np.bincount`` passes over integer
+codes rather than a Python loop over rows.
+"""
+
+import threading
+from bisect import bisect_left, insort
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .rows import TrackRow
+
+DIMENSIONS = ("genre", "key", "artist", "year", "rating", "bpm_bucket")
+AGGREGATES = (
+    "count",
+    "playCount",
+    "totalTime",
+    "meanBpm",
+    "medianBpm",
+    "distinctArtists",
+)
+DEFAULT_BPM_BUCKET = 5.0
+
+NUMERIC_COLUMNS = ("bpm", "length", "year", "play_count", "rating", "bitrate")
+DEFAULT_PERCENTILES = (5, 25, 50, 75, 95)
+DEFAULT_BINS = 20
+MAX_BINS = 10_000
+
+# Columns where 0 means "not known" rather than a real value
+_ZERO_IS_UNKNOWN = frozenset({"bpm", "length", "year", "bitrate"})
+
+# Entries in the genre distribution and the most-played/recently-added lists
+STATS_TOP_N = 10
+
+_CATEGORICAL = ("genre", "key", "artist")
+
+
+def _label(value: Any) -> str:
+    return str(value) if value else "Unknown"
+
+
+class LibraryColumns:
+    """Numeric columns and factorised categorical columns of a row snapshot."""
+
+    def __init__(self, rows: List[TrackRow]):
+        n = len(rows)
+        self.size = n
+        self.bpm = np.fromiter((r.bpm for r in rows), dtype=np.float64, count=n)
+        self.length = np.fromiter((r.length for r in rows), dtype=np.int64, count=n)
+        self.play_count = np.fromiter(
+            (r.play_count for r in rows), dtype=np.int64, count=n
+        )
+        self.rating = np.fromiter((r.rating for r in rows), dtype=np.int64, count=n)
+        self.year = np.fromiter((r.year for r in rows), dtype=np.int64, count=n)
+        self.bitrate = np.fromiter((r.bitrate for r in rows), dtype=np.int64, count=n)
+        self.rows = rows
+        self._factors: Dict[str, Tuple[np.ndarray, List[str]]] = {}
+        self._known_bpm_order: Optional[np.ndarray] = None
+        self._artist_order: Optional[np.ndarray] = None
+        self._positions: Optional[Dict[str, int]] = None
+
+    def factor(self, column: str) -> Tuple[np.ndarray, List[str]]:
+        """Integer codes and their labels for a categorical column (cached)."""
+        entry = self._factors.get(column)
+        if entry is None:
+            codes: Dict[str, int] = {}
+            values = np.fromiter(
+                (
+                    codes.setdefault(getattr(r, column) or "", len(codes))
+                    for r in self.rows
+                ),
+                dtype=np.int64,
+                count=self.size,
+            )
+            entry = (values, [_label(v) for v in codes])
+            self._factors[column] = entry
+        return entry
+
+    def dimension(
+        self, name: str, bpm_bucket: float = DEFAULT_BPM_BUCKET
+    ) -> Tuple[np.ndarray, List[str]]:
+        """Codes and labels for a group-by dimension (cached)."""
+        if name in _CATEGORICAL:
+            return self.factor(name)
+        cache_key = f"{name}:{bpm_bucket}" if name == "bpm_bucket" else name
+        entry = self._factors.get(cache_key)
+        if entry is None:
+            if name == "bpm_bucket":
+                # Unknown BPM (0) gets its own bucket below every real one
+                buckets = np.where(
+                    self.bpm > 0, np.floor(self.bpm / bpm_bucket).astype(np.int64), -1
+                )
+                uniques, codes = np.unique(buckets, return_inverse=True)
+                labels = [
+                    (
+                        f"{b * bpm_bucket:g}-{(b + 1) * bpm_bucket:g}"
+                        if b >= 0
+                        else "Unknown"
+                    )
+                    for b in uniques.tolist()
+                ]
+            else:
+                uniques, codes = np.unique(getattr(self, name), return_inverse=True)
+                labels = [_label(v) for v in uniques.tolist()]
+            entry = (codes, labels)
+            self._factors[cache_key] = entry
+        return entry
+
+    @property
+    def known_bpm_order(self) -> np.ndarray:
+        """Positions of tracks with a BPM, in ascending BPM order (cached)."""
+        if self._known_bpm_order is None:
+            known = np.flatnonzero(self.bpm > 0)
+            self._known_bpm_order = known[np.argsort(self.bpm[known], kind="stable")]
+        return self._known_bpm_order
+
+    @property
+    def artist_order(self) -> np.ndarray:
+        """Positions in ascending artist-code order (cached)."""
+        if self._artist_order is None:
+            self._artist_order = np.argsort(self.factor("artist")[0], kind="stable")
+        return self._artist_order
+
+    def positions(self, track_ids: Iterable[str]) -> np.ndarray:
+        """Row positions of the given track IDs, skipping unknown IDs."""
+        if self._positions is None:
+            self._positions = {row.id: pos for pos, row in enumerate(self.rows)}
+        found = (self._positions.get(tid) for tid in track_ids)
+        return np.fromiter((p for p in found if p is not None), dtype=np.int64)
+
+    def contains_mask(self, column: str, needle: str) -> np.ndarray:
+        """Rows whose categorical ``column`` contains ``needle`` (any case)."""
+        codes, labels = self.factor(column)
+        needle = needle.lower()
+        matching = [i for i, label in enumerate(labels) if needle in label.lower()]
+        return np.isin(codes, matching)
+
+
+def _densify(keys: np.ndarray, bound: int) -> np.ndarray:
+    """Renumber non-negative keys below ``bound`` to 0..k-1, preserving order."""
+    if bound <= max(4 * len(keys), 1 << 16):
+        present = np.zeros(bound, dtype=bool)
+        present[keys] = True
+        return (np.cumsum(present) - 1)[keys]
+    return np.unique(keys, return_inverse=True)[1]
+
+
+def _group_order(groups: np.ndarray, n_groups: int) -> np.ndarray:
+    """Stable sort order of group codes; small codes take numpy's radix sort."""
+    if n_groups <= 1 << 16:
+        groups = groups.astype(np.uint16)
+    return np.argsort(groups, kind="stable")
+
+
+def check_numeric_column(column: str) -> str:
+    """Validate a numeric column name."""
+    if column not in NUMERIC_COLUMNS:
+        raise ValueError(
+            f"Unknown column {column!r}. Available: {', '.join(NUMERIC_COLUMNS)}"
+        )
+    return column
+
+
+def distribution(
+    values: np.ndarray,
+    column: str,
+    bins: int = DEFAULT_BINS,
+    bin_width: Optional[float] = None,
+    percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+) -> Dict[str, Any]:
+    """Summary statistics, percentiles and a histogram of ``values``.
+
+    Zeros in columns where 0 means unknown (BPM, length, year, bitrate) are
+    counted as ``unknown`` and left out of everything else. ``bin_width``
+    gives bins aligned to multiples of the width instead of ``bins`` equal
+    bins over the value range.
+    """
+    unknown = 0
+    if column in _ZERO_IS_UNKNOWN:
+        known = values > 0
+        unknown = int(len(values) - np.count_nonzero(known))
+        values = values[known]
+
+    result: Dict[str, Any] = {
+        "column": column,
+        "count": int(len(values)),
+        "unknown": unknown,
+        "min": None,
+        "max": None,
+        "mean": None,
+        "percentiles": {},
+        "histogram": {"edges": [], "counts": []},
+    }
+    if not len(values):
+        return result
+
+    low, high = values.min(), values.max()
+    if bin_width:
+        start = np.floor(low / bin_width) * bin_width
+        if (high - start) / bin_width >= MAX_BINS:
+            raise ValueError(f"bin_width {bin_width:g} gives more than {MAX_BINS} bins")
+        edges = np.arange(start, high + bin_width, bin_width)
+        if len(edges) < 2 or edges[-1] <= high:
+            edges = np.append(edges, edges[-1] + bin_width)
+    else:
+        edges = np.histogram_bin_edges(values, bins=bins)
+    counts, edges = np.histogram(values, bins=edges)
+
+    result.update(
+        {
+            "min": values.min().item(),
+            "max": values.max().item(),
+            "mean": round(float(values.mean()), 2),
+            "percentiles": {
+                f"p{p:g}": round(float(v), 2)
+                for p, v in zip(percentiles, np.percentile(values, percentiles))
+            },
+            "histogram": {
+                "edges": [round(float(e), 2) for e in edges],
+                "counts": counts.tolist(),
+            },
+        }
+    )
+    return result
+
+
+def check_dimensions(group_by: Sequence[str]) -> List[str]:
+    """Validate group-by dimension names."""
+    dimensions = list(group_by)
+    unknown = [d for d in dimensions if d not in DIMENSIONS]
+    if unknown or not dimensions:
+        raise ValueError(
+            f"Unknown group_by {', '.join(unknown) or '(none)'}. "
+            f"Available: {', '.join(DIMENSIONS)}"
+        )
+    return dimensions
+
+
+def group_stats(
+    columns: LibraryColumns,
+    dimensions: Sequence[str],
+    bpm_bucket: float = DEFAULT_BPM_BUCKET,
+) -> Tuple[List[Tuple[str, ...]], Dict[str, np.ndarray]]:
+    """Aggregate every group of ``dimensions``.
+
+    Returns the group labels (one tuple per group) and one array per name in
+    ``AGGREGATES``, aligned with the labels. BPM aggregates ignore tracks
+    without a BPM.
+    """
+    factors = [columns.dimension(d, bpm_bucket) for d in dimensions]
+
+    # Combine dimensions one at a time, re-densifying after each step so the
+    # combined codes stay below rows * cardinality and never overflow
+    groups = np.zeros(columns.size, dtype=np.int64)
+    n_groups = 1 if columns.size else 0
+    for codes, dim_labels in factors:
+        groups = _densify(groups * len(dim_labels) + codes, n_groups * len(dim_labels))
+        n_groups = int(groups.max()) + 1 if columns.size else 0
+
+    # Any row of a group can stand for it: all share the same labels
+    representative = np.zeros(n_groups, dtype=np.int64)
+    representative[groups] = np.arange(columns.size)
+    labels = [
+        tuple(dim_labels[codes[i]] for codes, dim_labels in factors)
+        for i in representative.tolist()
+    ]
+
+    stats = {
+        "count": np.bincount(groups, minlength=n_groups),
+        "playCount": np.bincount(
+            groups, weights=columns.play_count, minlength=n_groups
+        ).astype(np.int64),
+        "totalTime": np.bincount(
+            groups, weights=columns.length, minlength=n_groups
+        ).astype(np.int64),
+    }
+
+    # BPM-ordered known rows, stably regrouped: (group, bpm) order in O(n)
+    by_bpm = columns.known_bpm_order
+    known_groups = groups[by_bpm]
+    order = _group_order(known_groups, n_groups)
+    sorted_bpm = columns.bpm[by_bpm][order]
+    known_count = np.bincount(known_groups, minlength=n_groups)
+    bpm_sum = np.bincount(known_groups, weights=columns.bpm[by_bpm], minlength=n_groups)
+    stats["meanBpm"] = np.divide(
+        bpm_sum, known_count, out=np.zeros(n_groups), where=known_count > 0
+    )
+
+    starts = np.cumsum(known_count) - known_count
+    has = known_count > 0
+    median = np.zeros(n_groups)
+    low = (starts + (known_count - 1) // 2)[has]
+    high = (starts + known_count // 2)[has]
+    median[has] = (sorted_bpm[low] + sorted_bpm[high]) / 2
+    stats["medianBpm"] = median
+
+    # Same trick for (group, artist): count artist changes within each group
+    by_artist = columns.artist_order
+    artist_groups = groups[by_artist]
+    order = _group_order(artist_groups, n_groups)
+    sorted_groups = artist_groups[order]
+    sorted_artists = columns.factor("artist")[0][by_artist][order]
+    first = np.ones(columns.size, dtype=bool)
+    first[1:] = (sorted_groups[1:] != sorted_groups[:-1]) | (
+        sorted_artists[1:] != sorted_artists[:-1]
+    )
+    stats["distinctArtists"] = np.bincount(sorted_groups[first], minlength=n_groups)
+    return labels, stats
+
+
+def top_groups(
+    labels: List[Tuple[str, ...]],
+    stats: Dict[str, np.ndarray],
+    aggregate_by: str,
+    top_n: int,
+) -> List[Tuple[Tuple[str, ...], Dict[str, Any]]]:
+    """The ``top_n`` groups by ``aggregate_by`` (descending) with plain values."""
+    if aggregate_by not in AGGREGATES:
+        raise ValueError(
+            f"Unknown aggregate_by {aggregate_by!r}. "
+            f"Available: {', '.join(AGGREGATES)}"
+        )
+    order = np.argsort(-stats[aggregate_by], kind="stable")[:top_n]
+    top = []
+    for i in order.tolist():
+        values = {}
+        for name in AGGREGATES:
+            value = stats[name][i]
+            values[name] = (
+                round(float(value), 2) if name.endswith("Bpm") else int(value)
+            )
+        top.append((labels[i], values))
+    return top
+
+
+class LibraryAggregates:
+    """Materialised library totals and distributions.
+
+    ``sync()`` takes a full row snapshot and compares each row's contribution
+    with the one already counted: one tuple comparison per row. Only rows
+    that were added, changed or removed update the totals, counters and
+    ordered most-played/recently-added lists. ``summary()`` then only reads
+    them.
+
+    The snapshot is still a full reload of the content table. The content
+    cache only produces a new snapshot when its fingerprint changes, so an
+    unchanged TTL reload never reaches ``sync()``.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._contributions: Dict[str, tuple] = {}
+        self.total_tracks = 0
+        self.total_length = 0
+        self._bpm_centi = 0
+        self.total_size = 0
+        self.sized_tracks = 0
+        self.genres: Counter = Counter()
+        self.keys: Counter = Counter()
+        self.ratings: Counter = Counter()
+        # Ascending (-play_count, id) of played tracks and (date_added, id)
+        self._by_plays: List[Tuple[int, str]] = []
+        self._by_added: List[Tuple[str, str]] = []
+        self.updated_at: Optional[datetime] = None
+
+    @staticmethod
+    def _contribution(row: TrackRow) -> tuple:
+        return (
+            row.genre or "Unknown",
+            row.key or "Unknown",
+            row.rating,
+            row.play_count,
+            row.length,
+            round(row.bpm * 100),
+            row.date_added,
+            row.file_size,
+        )
+
+    def sync(self, rows: Iterable[TrackRow]) -> Dict[str, int]:
+        """Patch the aggregates to match ``rows``; returns change counts."""
+        with self._lock:
+            # On the first sync, sort the ordered lists once instead of
+            # inserting row by row
+            cold = not self._contributions
+            added = updated = 0
+            seen = set()
+            for row in rows:
+                seen.add(row.id)
+                new = self._contribution(row)
+                old = self._contributions.get(row.id)
+                if old == new:
+                    continue
+                if old is None:
+                    added += 1
+                else:
+                    self._apply(row.id, old, -1)
+                    updated += 1
+                self._apply(row.id, new, 1, ordered=not cold)
+
+            removed = [tid for tid in self._contributions if tid not in seen]
+            for track_id in removed:
+                self._apply(track_id, self._contributions[track_id], -1)
+
+            if cold:
+                self._by_plays = sorted(
+                    (-c[3], tid) for tid, c in self._contributions.items() if c[3]
+                )
+                self._by_added = sorted(
+                    (c[6], tid) for tid, c in self._contributions.items() if c[6]
+                )
+
+            if added or updated or removed or self.updated_at is None:
+                self.updated_at = datetime.now()
+        return {"added": added, "updated": updated, "removed": len(removed)}
+
+    def _apply(
+        self, track_id: str, contribution: tuple, sign: int, ordered: bool = True
+    ) -> None:
+        genre, key, rating, plays, length, bpm_centi, date_added, size = contribution
+        self.total_tracks += sign
+        self.total_length += sign * length
+        self._bpm_centi += sign * bpm_centi
+        if size:
+            self.total_size += sign * size
+            self.sized_tracks += sign
+        for counter, value in (
+            (self.genres, genre),
+            (self.keys, key),
+            (self.ratings, rating),
+        ):
+            counter[value] += sign
+            if counter[value] <= 0:
+                del counter[value]
+
+        entries = []
+        if ordered and plays:
+            entries.append((self._by_plays, (-plays, track_id)))
+        if ordered and date_added:
+            entries.append((self._by_added, (date_added, track_id)))
+        for entry_list, entry in entries:
+            if sign > 0:
+                insort(entry_list, entry)
+            else:
+                del entry_list[bisect_left(entry_list, entry)]
+
+        if sign > 0:
+            self._contributions[track_id] = contribution
+        else:
+            del self._contributions[track_id]
+
+    def summary(self) -> Dict[str, Any]:
+        """Current aggregates as ``LibraryStats`` fields."""
+        with self._lock:
+            total = self.total_tracks
+            return {
+                "total_tracks": total,
+                "total_playtime_seconds": self.total_length,
+                "total_size_bytes": self.total_size if self.sized_tracks else None,
+                "average_bpm": round(self._bpm_centi / 100 / total, 2) if total else 0,
+                "genre_distribution": dict(self.genres.most_common(STATS_TOP_N)),
+                "key_distribution": dict(self.keys.most_common()),
+                "rating_distribution": dict(sorted(self.ratings.items())),
+                "most_played_tracks": [tid for _, tid in self._by_plays[:STATS_TOP_N]],
+                "recently_added_tracks": [
+                    tid for _, tid in reversed(self._by_added[-STATS_TOP_N:])
+                ],
+                "last_updated": (self.updated_at or datetime.now()).isoformat(),
+            }
@@ -0,0 +1,169 @@
+"""
+Table Caches
+
+Versioned, TTL-bounded in-memory snapshots of rekordbox database tables.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Generic, Hashable, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class TableCache(Generic[T]):
+    """
+    Cached snapshot of a single database table.
+
+    ``version`` increases whenever the cached data may have changed: on a reload
+    (unless a ``fingerprint`` shows the reloaded data is identical) and on
+    ``patch()``. Structures derived from the data via ``derive()`` are rebuilt
+    only when the version moves.
+
+    Loads and each derived structure are built under a lock, so threads that
+    ask for the same thing at once (e.g. a tool call during start-up warm-up)
+    wait for the build in progress instead of repeating it.
+
+    While a builder runs, reads of this cache from the same thread (including
+    nested ``derive()`` calls) see the snapshot being built from, so a
+    structure derived from other derived structures never mixes versions.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        loader: Callable[[], T],
+        ttl: float = 30.0,
+        fingerprint: Optional[Callable[[T], Hashable]] = None,
+    ):
+        self.name = name
+        self.ttl = ttl
+        self.version = 0
+        self._loader = loader
+        self._fingerprint = fingerprint
+        self._data: Optional[T] = None
+        self._loaded_at: Optional[float] = None
+        self._last_fingerprint: Optional[Hashable] = None
+        self._derived: Dict[str, Tuple[int, Any]] = {}
+        self._lock = threading.RLock()
+        self._derive_locks: Dict[str, threading.Lock] = {}
+        self._pinned = threading.local()
+
+    @property
+    def data(self) -> Optional[T]:
+        """The cached data, or None if nothing is loaded."""
+        return self._data
+
+    def is_fresh(self) -> bool:
+        """Whether cached data exists and is within its TTL."""
+        return (
+            self._data is not None
+            and self._loaded_at is not None
+            and (time.monotonic() - self._loaded_at) < self.ttl
+        )
+
+    def get(self) -> T:
+        """Return cached data, reloading it if missing or expired."""
+        return self._snapshot()[0]
+
+    def _snapshot(self) -> Tuple[T, int]:
+        """Current data and the version it belongs to."""
+        pinned: Optional[Tuple[T, int]] = getattr(self._pinned, "snapshot", None)
+        if pinned is not None:
+            return pinned
+        with self._lock:
+            data = self._data
+            if data is None or not self.is_fresh():
+                data = self._loader()
+                fingerprint = self._fingerprint(data) if self._fingerprint else None
+                if fingerprint is None or fingerprint != self._last_fingerprint:
+                    self.version += 1
+                self._last_fingerprint = fingerprint
+                self._data = data
+                self._loaded_at = time.monotonic()
+            return data, self.version
+
+    def invalidate(self) -> None:
+        """Drop cached data, forcing a reload on next access."""
+        with self._lock:
+            self._data = None
+            self._loaded_at = None
+
+    def patch(self, fn: Callable[[T], T]) -> None:
+        """Apply an in-place update to loaded data instead of reloading it."""
+        with self._lock:
+            if self._data is None:
+                return
+            self._data = fn(self._data)
+            self._last_fingerprint = None
+            self.version += 1
+
+    def derive(self, name: str, builder: Callable[[T], Any]) -> Any:
+        """Return ``builder(data)``, memoised until the cache version changes."""
+        snapshot = self._snapshot()
+        data, version = snapshot
+        cached = self._derived.get(name)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        with self._lock:
+            lock = self._derive_locks.setdefault(name, threading.Lock())
+        with lock:
+            # Another thread may have finished the same build while we waited
+            cached = self._derived.get(name)
+            if cached is not None and cached[0] == version:
+                return cached[1]
+            previous = getattr(self._pinned, "snapshot", None)
+            self._pinned.snapshot = snapshot
+            try:
+                value = builder(data)
+            finally:
+                self._pinned.snapshot = previous
+            # Never replace a build from a newer snapshot with an older one
+            if cached is None or cached[0] < version:
+                self._derived[name] = (version, value)
+            return value
+
+
+class PayloadCache:
+    """
+    Bounded LRU of serialised payloads, one per key.
+
+    Each entry is tagged with the version of the row it was built from; a
+    lookup with any other version misses, so a changed row is re-serialised
+    without explicit invalidation.
+    """
+
+    def __init__(self, maxsize: int = 50_000):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, Tuple[Hashable, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, version: Hashable) -> Optional[Any]:
+        """Return the payload stored for ``key`` at ``version``, if any."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: Hashable, version: Hashable, payload: Any) -> None:
+        """Store ``payload`` for ``key``, replacing any other version."""
+        with self._lock:
+            self._entries[key] = (version, payload)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def discard(self, key: Hashable) -> None:
+        """Drop the entry for ``key`` if present."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
@@ -4,18 +4,78 @@ Rekordbox Database Connection Layer
 Handles connection to and interaction with the encrypted rekordbox SQLite database.
 """
 
+import copy
 import os
 import sys
 import time
 import asyncio
 import shutil
+import threading
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import (
+    Optional,
+    List,
+    Dict,
+    Any,
+    Tuple,
+    Callable,
+    Iterable,
+    Iterator,
+    Union,
+)
 from datetime import datetime
+from itertools import chain, islice
+from uuid import uuid4
 
 from pyrekordbox import Rekordbox6Database
 from loguru import logger
-
+import numpy as np
+from sqlalchemy import insert
+
+try:
+    from pyrekordbox.masterdb.models import DjmdSongPlaylist
+except ImportError:  # pyrekordbox < 0.5
+    from pyrekordbox.db6.tables import DjmdSongPlaylist
+
+from .analytics import (
+    DEFAULT_BINS,
+    DEFAULT_BPM_BUCKET,
+    DEFAULT_PERCENTILES,
+    LibraryAggregates,
+    LibraryColumns,
+    MAX_BINS,
+    check_dimensions,
+    check_numeric_column,
+    distribution,
+    group_stats,
+    top_groups,
+)
+from .cache import PayloadCache, TableCache
+from .duplicates import DEFAULT_LENGTH_TOLERANCE, DuplicateBlocks, choose_keeper
+from .encoding import check_format, encode_columnar
+from .fts import FullTextIndex, default_fulltext_path
+from .fuzzy import FuzzyIndex
+from .history import PlayFrequency, SessionIndex, TransitionGraph, date_range
+from .keys import key_distance
+from .rows import TRACK_FIELDS, TrackRow, related_name
+from .similarity import TrackVectors
+from .sketches import SKETCH_DIMENSIONS, LibrarySketches
+from .suggest import (
+    DEFAULT_BPM_RANGE,
+    DEFAULT_KEY_DISTANCE,
+    MAX_KEY_DISTANCE,
+    NextTrackIndex,
+)
+from .search import SearchIndex, SearchPlan, path_contains, predicates_from_options
+from .pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    CursorError,
+    ResultSetCache,
+    decode_cursor,
+    encode_cursor,
+    params_key,
+)
 from .models import (
     Track,
     Playlist,
@@ -26,6 +86,32 @@ from .models import (
     LibraryStats,
 )
 
+# Field names accepted for projection on history-track listings
+HISTORY_TRACK_FIELDS = tuple(HistoryTrack.model_fields)
+_HISTORY_ROW_FIELDS = tuple(f for f in HISTORY_TRACK_FIELDS if f in TRACK_FIELDS)
+# Fields describing the seed track of suggestion and similarity queries
+_SEED_FIELDS = ("id", "title", "artist", "bpm", "key")
+# Fields shown per track in duplicate clusters
+_DUPLICATE_FIELDS = (
+    "id",
+    "title",
+    "artist",
+    "length",
+    "bitrate",
+    "file_path",
+    "play_count",
+    "rating",
+    "date_added",
+)
+# Denormalised name columns of content rows, with the relation behind each
+_RELATED = (
+    ("ArtistName", "Artist"),
+    ("AlbumName", "Album"),
+    ("GenreName", "Genre"),
+    ("LabelName", "Label"),
+    ("KeyName", "Key"),
+)
+
 
 class RekordboxDatabase:
     """
@@ -39,10 +125,49 @@ class RekordboxDatabase:
         self.db: Optional[Rekordbox6Database] = None
         self.database_path: Optional[Path] = None
         self._connected = False
-        # Content cache
-        self._content_cache: Optional[list] = None
-        self._content_cache_time: Optional[float] = None
-        self._content_cache_ttl: float = 30.0  # seconds
+        # The SQLAlchemy session behind self.db is not thread-safe; every
+        # worker-thread body that may touch it holds this lock (see _run)
+        self._session_lock = threading.RLock()
+        # Per-table caches; each is invalidated only by mutations touching it
+        self._content_cache: TableCache[list] = TableCache(
+            "content", self._load_active_content, fingerprint=self._content_fingerprint
+        )
+        self._playlist_cache: TableCache[list] = TableCache(
+            "playlists", self._load_active_playlists, fingerprint=self._usn_fingerprint
+        )
+        self._playlist_song_cache: TableCache[Dict[str, list]] = TableCache(
+            "playlist_songs",
+            self._load_playlist_songs,
+            fingerprint=lambda songs: self._usn_fingerprint(
+                chain.from_iterable(songs.values())
+            ),
+        )
+        self._history_cache: TableCache[Tuple[list, Dict[str, list]]] = TableCache(
+            "history",
+            self._load_history,
+            fingerprint=lambda history: self._usn_fingerprint(
+                chain(history[0], *history[1].values())
+            ),
+        )
+        # Ordered listing keys for cursor pagination, keyed by query + versions
+        self._result_sets = ResultSetCache()
+        # Serialised track dicts, keyed by content ID and tagged with row version
+        # (USN plus related names, see _track_payload)
+        self._track_payloads = PayloadCache()
+        # Library totals; each new content version is diffed row by row and
+        # only changed rows are applied
+        self._library_aggregates = LibraryAggregates()
+        # Streaming sketches for approximate analytics, fed per content version
+        self._library_sketches = LibrarySketches()
+        # Live-play counts from history, patched per history version
+        self._play_frequency = PlayFrequency()
+        # Track-to-track transitions from history, patched per history version
+        self._transitions = TransitionGraph()
+        # Optional FTS5 sidecar, opened on first full-text search
+        self.fulltext_path: Optional[Path] = None
+        self._fulltext: Optional[FullTextIndex] = None
+        # Progress of warm_up(); read by the database-status resource
+        self.warmup_status: Dict[str, Any] = {"state": "pending"}
         # Backup dedup
         self._last_backup_time: Optional[float] = None
         self._backup_cooldown: float = 300.0  # 5 minutes
@@ -64,20 +189,45 @@ class RekordboxDatabase:
                 self.db = Rekordbox6Database(db_dir=str(self.database_path))
             else:
                 self.db = Rekordbox6Database()
+            # Cached ORM rows outlive commits; expiring them on each commit
+            # would turn the next read of every cached row into its own SELECT
+            session = getattr(self.db, "session", None)
+            if session is not None:
+                session.expire_on_commit = False
 
-            content = self.db.get_content()
-            content_count = len(list(content))
+            content_count = self._count_active(self.db.get_content())
             logger.info(
                 f"Successfully connected! Found {content_count} tracks in database."
             )
             self._connected = True
 
         try:
-            await asyncio.to_thread(_connect)
+            await self._run(_connect)
         except Exception as e:
             logger.error(f"Failed to connect to rekordbox database: {e}")
             raise RuntimeError(f"Database connection failed: {str(e)}")
 
+    async def _run(self, fn: Callable[[], Any], rollback: bool = False) -> Any:
+        """Run ``fn`` in a worker thread while holding the session lock.
+
+        With ``rollback``, a failing ``fn`` has its uncommitted changes rolled
+        back before the lock is released.
+
+        Cache and table locks are only ever taken inside the session lock,
+        so the lock order is the same on every thread.
+        """
+
+        def _locked():
+            with self._session_lock:
+                try:
+                    return fn()
+                except Exception:
+                    if rollback and self.db and hasattr(self.db, "rollback"):
+                        self.db.rollback()
+                    raise
+
+        return await asyncio.to_thread(_locked)
+
     def _detect_database_path(self) -> Path:
         """Auto-detect the rekordbox database location based on OS."""
         if os.name == "nt":  # Windows
@@ -100,14 +250,72 @@ class RekordboxDatabase:
         """Properly close the database connection."""
         if self.db:
             try:
-                await asyncio.to_thread(self.db.close)
+                await self._run(self.db.close)
                 logger.info("Database connection closed")
             except Exception as e:
                 logger.warning(f"Error closing database connection: {e}")
             finally:
                 self.db = None
                 self._connected = False
-                self._invalidate_content_cache()
+                self._invalidate_all_caches()
+                self._close_fulltext()
+
+    # Caches built by warm_up(), in order: what the common tools read first
+    WARMUP_STAGES = (
+        ("content", "_get_track_rows"),
+        ("search_index", "_get_search_index"),
+        ("library_columns", "_get_library_columns"),
+        ("playlists", "_warm_playlists"),
+        ("history", "_get_session_index"),
+        ("play_frequency", "_get_play_frequency"),
+    )
+
+    async def warm_up(self) -> Dict[str, Any]:
+        """Build the caches most tools need, ahead of the first request.
+
+        Progress and per-stage timings are kept in ``warmup_status``. Stages
+        share the per-table caches with the tools, so anything built here is
+        reused until the underlying table changes.
+        """
+        if not self.db:
+            raise RuntimeError("Database not connected")
+
+        status: Dict[str, Any] = {
+            "state": "running",
+            "stage": None,
+            "completed": [],
+            "total_stages": len(self.WARMUP_STAGES),
+            "timings_ms": {},
+        }
+        self.warmup_status = status
+
+        def _inner():
+            started = time.perf_counter()
+            for name, method in self.WARMUP_STAGES:
+                status["stage"] = name
+                stage_started = time.perf_counter()
+                with self._session_lock:
+                    getattr(self, method)()
+                status["timings_ms"][name] = round(
+                    (time.perf_counter() - stage_started) * 1000, 1
+                )
+                status["completed"].append(name)
+            status["stage"] = None
+            status["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+            status["state"] = "ready"
+            return status
+
+        try:
+            # Not _run(): the session lock is taken per stage, so tool calls
+            # interleave with the warm-up instead of waiting for all of it
+            return await asyncio.to_thread(_inner)
+        except Exception as e:
+            status.update(state="failed", error=str(e))
+            raise
+
+    def _warm_playlists(self) -> None:
+        self._playlist_cache.get()
+        self._playlist_song_cache.get()
 
     def __del__(self):
         """Cleanup when object is destroyed."""
@@ -119,27 +327,230 @@ class RekordboxDatabase:
 
     # --- Cache management ---
 
+    def _load_active_content(self) -> list:
+        """Load active (non-deleted) content rows."""
+        all_content = list(self.db.get_content())
+        return [c for c in all_content if getattr(c, "rb_local_deleted", 0) == 0]
+
+    @staticmethod
+    def _content_fingerprint(content: list) -> int:
+        """Cheap identity of a content snapshot: IDs, row USNs and related names.
+
+        Artists, albums, genres, labels and keys live in their own tables and
+        can be renamed without touching the content row or its USN.
+        """
+        return hash(
+            tuple(
+                (
+                    c.ID,
+                    getattr(c, "rb_local_usn", None),
+                    *(
+                        related_name(c, column, relation)
+                        for column, relation in _RELATED
+                    ),
+                )
+                for c in content
+            )
+        )
+
+    @staticmethod
+    def _usn_fingerprint(rows: Iterable[Any]) -> Optional[int]:
+        """Identity of a table snapshot from row IDs and USNs.
+
+        Returns None, so every reload counts as a change, if any row has no
+        USN to compare.
+        """
+        keys = []
+        for row in rows:
+            usn = getattr(row, "rb_local_usn", None)
+            if usn is None:
+                return None
+            keys.append((row.ID, usn))
+        return hash(tuple(keys))
+
+    def _load_active_playlists(self) -> list:
+        """Load active (non-deleted) playlists."""
+        return [
+            p
+            for p in list(self.db.get_playlist())
+            if getattr(p, "rb_local_deleted", 0) == 0
+        ]
+
+    def _load_playlist_songs(self) -> Dict[str, list]:
+        """Load all active playlist memberships in one query, grouped by playlist."""
+        songs_by_playlist: Dict[str, list] = {}
+        for song in self.db.get_playlist_songs():
+            if getattr(song, "rb_local_deleted", 0) == 0:
+                songs_by_playlist.setdefault(str(song.PlaylistID), []).append(song)
+        for songs in songs_by_playlist.values():
+            songs.sort(key=lambda x: getattr(x, "TrackNo", 0) or 0)
+        return songs_by_playlist
+
+    def _load_history(self) -> Tuple[list, Dict[str, list]]:
+        """Load active history sessions and their songs grouped by session."""
+        histories = [
+            h
+            for h in list(self.db.get_history())
+            if getattr(h, "rb_local_deleted", 0) == 0
+        ]
+        songs_by_history: Dict[str, list] = {}
+        for song in self.db.get_history_songs():
+            if getattr(song, "rb_local_deleted", 0) == 0:
+                songs_by_history.setdefault(str(song.HistoryID), []).append(song)
+        for songs in songs_by_history.values():
+            songs.sort(key=lambda x: getattr(x, "TrackNo", 0) or 0)
+        return histories, songs_by_history
+
     def _get_active_content(self) -> list:
         """Get active (non-deleted) content with caching."""
-        now = time.monotonic()
-        if (
-            self._content_cache is not None
-            and self._content_cache_time is not None
-            and (now - self._content_cache_time) < self._content_cache_ttl
-        ):
-            return self._content_cache
+        return self._content_cache.get()
 
-        all_content = list(self.db.get_content())
-        self._content_cache = [
-            c for c in all_content if getattr(c, "rb_local_deleted", 0) == 0
-        ]
-        self._content_cache_time = now
-        return self._content_cache
+    def _get_content_lookup(self) -> Dict[str, Any]:
+        """Map of content ID to active content row, rebuilt per content version."""
+        return self._content_cache.derive(
+            "by_id", lambda content: {str(c.ID): c for c in content}
+        )
+
+    def _get_track_rows(self) -> List[TrackRow]:
+        """Active content as TrackRows, rebuilt per content version."""
+        return self._content_cache.derive(
+            "rows", lambda content: [TrackRow.from_content(c) for c in content]
+        )
+
+    def _get_row_lookup(self) -> Dict[str, TrackRow]:
+        """Map of content ID to TrackRow, rebuilt per content version."""
+        return self._content_cache.derive(
+            "rows_by_id", lambda content: {r.id: r for r in self._get_track_rows()}
+        )
+
+    def _get_search_index(self) -> SearchIndex:
+        """Secondary indexes over the track rows, rebuilt per content version."""
+        return self._content_cache.derive(
+            "search_index", lambda content: SearchIndex(self._get_track_rows())
+        )
+
+    def _get_fuzzy_index(self) -> FuzzyIndex:
+        """Trigram index over track tokens, rebuilt per content version."""
+        return self._content_cache.derive(
+            "fuzzy_index", lambda content: FuzzyIndex(self._get_track_rows())
+        )
+
+    def _get_fulltext(self) -> FullTextIndex:
+        """The full-text sidecar, synced once per content version."""
+        return self._content_cache.derive("fulltext", self._sync_fulltext)
+
+    def _sync_fulltext(self, content: list) -> FullTextIndex:
+        if self._fulltext is None:
+            path = self.fulltext_path or default_fulltext_path()
+            self._fulltext = FullTextIndex(path)
+            logger.info(f"Opened full-text sidecar at: {path}")
+        changes = self._fulltext.sync(content)
+        if any(changes.values()):
+            logger.info(f"Synced full-text sidecar: {changes}")
+        return self._fulltext
+
+    def _close_fulltext(self) -> None:
+        if self._fulltext is not None:
+            self._fulltext.close()
+            self._fulltext = None
+
+    def _get_library_columns(self) -> LibraryColumns:
+        """Numpy columns of the track rows, rebuilt per content version."""
+        return self._content_cache.derive(
+            "columns", lambda content: LibraryColumns(self._get_track_rows())
+        )
+
+    def _get_library_aggregates(self) -> LibraryAggregates:
+        """Library totals, synced once per content version."""
+        return self._content_cache.derive("aggregates", self._sync_aggregates)
+
+    def _sync_aggregates(self, content: list) -> LibraryAggregates:
+        self._library_aggregates.sync(self._get_track_rows())
+        return self._library_aggregates
+
+    def _get_library_sketches(self) -> LibrarySketches:
+        """Library sketches, fed new rows once per content version."""
+        return self._content_cache.derive("sketches", self._sync_sketches)
+
+    def _sync_sketches(self, content: list) -> LibrarySketches:
+        self._library_sketches.sync(self._get_track_rows())
+        return self._library_sketches
+
+    def _get_next_track_index(self) -> NextTrackIndex:
+        """BPM x Camelot grid over the track rows, rebuilt per content version."""
+        return self._content_cache.derive(
+            "next_track_index",
+            lambda content: NextTrackIndex(self._get_library_columns()),
+        )
+
+    def _get_track_vectors(self) -> TrackVectors:
+        """Metadata feature matrix of the track rows, per content version."""
+        return self._content_cache.derive(
+            "track_vectors",
+            lambda content: TrackVectors(self._get_library_columns()),
+        )
+
+    def _get_duplicate_blocks(self) -> DuplicateBlocks:
+        """Tracks blocked by normalised title and artist, per content version."""
+        return self._content_cache.derive(
+            "duplicate_blocks", lambda content: DuplicateBlocks(self._get_track_rows())
+        )
+
+    def _get_session_index(self) -> SessionIndex:
+        """History sessions in date order, rebuilt per history version."""
+        return self._history_cache.derive(
+            "session_index", lambda history: SessionIndex(history[0])
+        )
+
+    def _get_play_frequency(self) -> PlayFrequency:
+        """History play counts, synced once per history version."""
+        return self._history_cache.derive("plays", self._sync_play_frequency)
+
+    def _sync_play_frequency(self, history: tuple) -> PlayFrequency:
+        self._play_frequency.sync(*history)
+        return self._play_frequency
+
+    def _get_transition_graph(self) -> TransitionGraph:
+        """History transitions, synced once per history version."""
+        return self._history_cache.derive("transitions", self._sync_transitions)
+
+    def _sync_transitions(self, history: tuple) -> TransitionGraph:
+        self._transitions.sync(*history)
+        return self._transitions
 
     def _invalidate_content_cache(self):
         """Clear content cache, forcing refresh on next access."""
-        self._content_cache = None
-        self._content_cache_time = None
+        self._content_cache.invalidate()
+
+    def _invalidate_playlist_caches(self, songs_only: bool = False):
+        """Clear playlist membership (and, unless ``songs_only``, playlist) caches."""
+        self._playlist_song_cache.invalidate()
+        if not songs_only:
+            self._playlist_cache.invalidate()
+
+    def _invalidate_all_caches(self):
+        """Clear every table cache."""
+        self._invalidate_content_cache()
+        self._invalidate_playlist_caches()
+        self._history_cache.invalidate()
+        self._track_payloads.clear()
+
+    def _track_payload(self, row: TrackRow) -> Dict[str, Any]:
+        """Serialised Track dict for ``row``, reused until the row changes.
+
+        Payloads are shared between responses and must not be mutated.
+        """
+        if row.usn is None:
+            # No per-row version available; fall back to the snapshot version
+            version: Any = ("content", self._content_cache.version)
+        else:
+            # Related names can be renamed without touching the row's USN
+            version = (row.usn, row.artist, row.album, row.genre, row.key)
+        payload = self._track_payloads.get(row.id, version)
+        if payload is None:
+            payload = row.to_track().model_dump()
+            self._track_payloads.put(row.id, version, payload)
+        return payload
 
     # --- Backup management ---
 
@@ -197,7 +608,25 @@ class RekordboxDatabase:
         def _inner():
             return len(self._get_active_content())
 
-        return await asyncio.to_thread(_inner)
+        return await self._run(_inner)
+
+    async def get_table_counts(self) -> Dict[str, int]:
+        """Active track and playlist counts, counted by SQLite without loading rows."""
+        if not self.db:
+            raise RuntimeError("Database not connected")
+
+        def _inner():
+            return {
+                "tracks": self._count_active(self.db.get_content()),
+                "playlists": self._count_active(self.db.get_playlist()),
+            }
+
+        return await self._run(_inner)
+
+    @staticmethod
+    def _count_active(query) -> int:
+        """``SELECT COUNT(*)`` over the non-deleted rows of a table query."""
+        return query.filter_by(rb_local_deleted=0).count()
 
     async def search_tracks(self, options: SearchOptions) -> List[Track]:
         """Search for tracks based on the provided options."""
@@ -205,49 +634,210 @@ class RekordboxDatabase:
             raise RuntimeError("Database not connected")
 
         def _inner():
-            active_content = self._get_active_content()
-            filtered_tracks = []
-
-            for content in active_content:
-                artist_name = getattr(content, "ArtistName", "") or ""
-                genre_name = getattr(content, "GenreName", "") or ""
-                key_name = getattr(content, "KeyName", "") or ""
-                bpm_value = (getattr(content, "BPM", 0) or 0) / 100.0
-                rating_value = getattr(content, "Rating", 0) or 0
-
-                if options.query and not any(
-                    [
-                        options.query.lower() in str(content.Title or "").lower(),
-                        options.query.lower() in artist_name.lower(),
-                        options.query.lower() in genre_name.lower(),
-                    ]
-                ):
-                    continue
+            matches = self._search_rows(options)
+            return [row.to_track() for row in islice(matches, options.limit)]
 
-                if options.artist and options.artist.lower() not in artist_name.lower():
-                    continue
-                if (
-                    options.title
-                    and options.title.lower() not in str(content.Title or "").lower()
-                ):
-                    continue
-                if options.genre and options.genre.lower() not in genre_name.lower():
-                    continue
-                if options.key and options.key != key_name:
-                    continue
-                if options.bpm_min and bpm_value < options.bpm_min:
-                    continue
-                if options.bpm_max and bpm_value > options.bpm_max:
+        return await self._run(_inner)
+
+    def _search_rows(self, options: SearchOptions) -> Iterator[TrackRow]:
+        """Lazily yield active track rows matching ``options``, ignoring limit."""
+        return self._plan_search(options).iter_rows()
+
+    def _plan_search(self, options: SearchOptions) -> SearchPlan:
+        return SearchPlan(self._get_search_index(), predicates_from_options(options))
+
+    async def explain_search(self, options: SearchOptions) -> Dict[str, Any]:
+        """Report how a search is evaluated: access path and counts per step."""
+        if not self.db:
+            raise RuntimeError("Database not connected")
+
+        def _inner():
+            return self._plan_search(options).explain()
+
+        return await self._run(_inner)
+
+    async def fuzzy_search(
+        self, options: SearchOptions, fields: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """Typo-tolerant search on ``options.query``, best matches first.
+
+        The remaining options filter the ranked matches. Each item is a track
+        dict (or its projection) with an added similarity ``score``.
+        """
+        if not self.db:
+            raise RuntimeError("Database not connected")
+        if not options.query.strip():
+            raise ValueError("Fuzzy search requires a query")
+
+        def _inner():
+            item_fields = self._check_fields("track", fields)
+            index = self._get_fuzzy_index()
+            filters = predicates_from_options(options.model_copy(update={"query": ""}))
+
+            items = []
+            for pos, score in index.search(options.query):
+                row = index.rows[pos]
+                if not all(predicate.test(row) for predicate in filters):
                     continue
-                if options.rating_min and rating_value < options.rating_min:
+                if item_fields:
+                    item = row.as_dict(item_fields)
+                else:
+                    item = dict(self._track_payload(row))
+                item["score"] = score
+                items.append(item)
+                if len(items) >= options.limit:
+                    break
+            return items
+
+        return await self._run(_inner)
+
+    async def fulltext_search(
+        self, options: SearchOptions, fields: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """Full-text search on ``options.query`` via the FTS5 sidecar.
+
+        The query uses FTS5 syntax: phrases ("deep house"), prefixes (tech*),
+        boolean operators (AND, OR, NOT) and column filters (artist:burial).
+        Matches are ranked by BM25 and filtered by the remaining options; each
+        item carries an added ``score`` (higher is better).
+        """
+        if not self.db:
+            raise RuntimeError("Database not connected")
+        if not options.query.strip():
+            raise ValueError("Full-text search requires a query")
+
+        def _inner():
+            item_fields = self._check_fields("track", fields)
+            rows_by_id = self._get_row_lookup()
+            filters = predicates_from_options(options.model_copy(update={"query": ""}))
+
+            items = []
+            for content_id, score in self._get_fulltext().search(options.query):
+                row = rows_by_id.get(content_id)
+                if row is None or not all(p.test(row) for p in filters):
                     continue
+                if item_fields:
+                    item = row.as_dict(item_fields)
+                else:
+                    item = dict(self._track_payload(row))
+                item["score"] = score
+                items.append(item)
+                if len(items) >= options.limit:
+                    break
+            return items
+
+        return await self._run(_inner)
+
+    async def suggest_next_tracks(
+        self,
+        track_id: str,
+        k: int = 10,
+        bpm_range: float = DEFAULT_BPM_RANGE,
+        max_key_distance: int = DEFAULT_KEY_DISTANCE,
+        genre: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Tracks that mix well out of a track: within ``bpm_range`` percent of
+        its tempo and ``max_key_distance`` steps on the Camelot wheel.
+
+        Candidates are ranked by a score (lower is better) combining tempo
+        and key distance with genre, year and rating similarity; each item
+        carries ``score``, ``bpm_delta`` and ``key_distance``.
+        """
+        if not self.db:
+            raise RuntimeError("Database not connected")
+        if k < 1:
+            raise ValueError("k must be at least 1")
+        if bpm_range < 0:
+            raise ValueError("bpm_range must not be negative")
+        if not 0 <= max_key_distance <= MAX_KEY_DISTANCE:
+            raise ValueError(
+                f"max_key_distance must be between 0 and {MAX_KEY_DISTANCE}"
+            )
+
+        def _inner():
+            item_fields = self._check_fields("track", fields)
+            # Positions index the rows the grid was built from
+            grid = self._get_next_track_index()
+            columns = grid.columns
+            rows = columns.rows
+            positions = columns.positions([str(track_id)])
+            if not len(positions):
+                raise ValueError(f"Track {track_id} not found")
+            position = int(positions[0])
+            mask = columns.contains_mask("genre", genre) if genre else None
+            suggestions = grid.suggest(position, k, bpm_range, max_key_distance, mask)
+
+            seed = rows[position]
+            items = []
+            for other, score, bpm_delta, steps in suggestions:
+                row = rows[other]
+                if item_fields:
+                    item = row.as_dict(item_fields)
+                else:
+                    item = dict(self._track_payload(row))
+                item.update(score=score, bpm_delta=bpm_delta, key_distance=steps)
+                items.append(item)
+            return {
+                "track": seed.as_dict(_SEED_FIELDS),
+                "suggestions": items,
+            }
+
+        return await self._run(_inner)
 
-                track = self._content_to_track(content)
-                filtered_tracks.append(track)
+    async def find_similar_tracks(
+        self,
+        track_id: str,
+        k: int = 10,
+        genre: Optional[str] = None,
+        exclude_session_id: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        The ``k`` tracks whose metadata is closest to a track's.
 
-            return filtered_tracks[: options.limit]
+        Similarity combines tempo, key, genre, year, label, length and
+        rating; each item carries its ``distance`` (lower is more similar).
+        Results can be limited to a genre and exclude a history session's
+        tracks.
+        """
+        if not self.db:
+            raise RuntimeError("Database not connected")
+        if k < 1:
+            raise ValueError("k must be at least 1")
 
-        return await asyncio.to_thread(_inner)
+        def _inner():
+            item_fields = self._check_fields("track", fields)
+            # Positions index the rows the vectors were built from
+            vectors = self._get_track_vectors()
+            columns = vectors.columns
+            rows = columns.rows
+            positions = columns.positions([str(track_id)])
+            if not len(positions):
+                raise ValueError(f"Track {track_id} not found")
+            position = int(positions[0])
+
+            mask = columns.contains_mask("genre", genre) if genre else None
+            if exclude_session_id:
+                songs = self._history_cache.get()[1].get(str(exclude_session_id), [])
+                played = columns.positions(str(song.ContentID) for song in songs)
+                if mask is None:
+                    mask = np.ones(columns.size, dtype=bool)
+                mask[played] = False
+
+            items = []
+            for other, distance in vectors.nearest(position, k, mask):
+                row = rows[other]
+                if item_fields:
+                    item = row.as_dict(item_fields)
+                else:
+                    item = dict(self._track_payload(row))
+                item["distance"] = distance
+                items.append(item)
+            return {"track": rows[position].as_dict(_SEED_FIELDS), "results": items}
+
+        return await self._run(_inner)
 
     async def get_track_by_id(self, track_id: str) -> Optional[Track]:
         """Get a specific track by its ID."""
@@ -263,7 +853,7 @@ class RekordboxDatabase:
             except (ValueError, Exception):
                 return None
 
-        return await asyncio.to_thread(_inner)
+        return await self._run(_inner)
 
     async def get_playlists(self) -> List[Playlist]:
         """Get all playlists from the database."""
@@ -271,56 +861,43 @@ class RekordboxDatabase:
             raise RuntimeError("Database not connected")
 
         def _inner():
-            all_playlists = list(self.db.get_playlist())
-            active_playlists = [
-                p for p in all_playlists if getattr(p, "rb_local_deleted", 0) == 0
-            ]
+            active_playlists = self._playlist_cache.get()
+            songs_by_playlist = self._playlist_song_cache.get()
 
-            playlists = []
-            for playlist in active_playlists:
-                try:
-                    playlist_songs = list(
-                        self.db.get_playlist_songs(PlaylistID=playlist.ID)
-                    )
-                    active_songs = [
-                        s
-                        for s in playlist_songs
-                        if getattr(s, "rb_local_deleted", 0) == 0
-                    ]
-                    track_count = len(active_songs)
-                except Exception:
-                    track_count = 0
-
-                is_smart = getattr(playlist, "is_smart_playlist", False) or False
-                smart_criteria = None
-                if is_smart and hasattr(playlist, "SmartList") and playlist.SmartList:
-                    smart_criteria = str(playlist.SmartList)
-
-                is_folder = getattr(playlist, "is_folder", False) or False
-                if not is_folder and hasattr(playlist, "Attribute"):
-                    is_folder = playlist.Attribute == 1
-
-                playlists.append(
-                    Playlist(
-                        id=str(playlist.ID),
-                        name=playlist.Name or "",
-                        track_count=track_count,
-                        created_date=getattr(playlist, "created_at", "") or "",
-                        modified_date=getattr(playlist, "updated_at", "") or "",
-                        is_folder=is_folder,
-                        is_smart_playlist=is_smart,
-                        smart_criteria=smart_criteria,
-                        parent_id=(
-                            str(playlist.ParentID)
-                            if playlist.ParentID and playlist.ParentID != "root"
-                            else None
-                        ),
-                    )
-                )
-
-            return playlists
+            return [
+                self._build_playlist(p, songs_by_playlist) for p in active_playlists
+            ]
 
-        return await asyncio.to_thread(_inner)
+        return await self._run(_inner)
+
+    def _build_playlist(self, playlist, songs_by_playlist: Dict[str, list]) -> Playlist:
+        """Convert a playlist row to our Playlist model."""
+        track_count = len(songs_by_playlist.get(str(playlist.ID), []))
+
+        is_smart = getattr(playlist, "is_smart_playlist", False) or False
+        smart_criteria = None
+        if is_smart and hasattr(playlist, "SmartList") and playlist.SmartList:
+            smart_criteria = str(playlist.SmartList)
+
+        is_folder = getattr(playlist, "is_folder", False) or False
+        if not is_folder and hasattr(playlist, "Attribute"):
+            is_folder = playlist.Attribute == 1
+
+        return Playlist(
+            id=str(playlist.ID),
+            name=playlist.Name or "",
+            track_count=track_count,
+            created_date=getattr(playlist, "created_at", "") or "",
+            modified_date=getattr(playlist, "updated_at", "") or "",
+            is_folder=is_folder,
+            is_smart_playlist=is_smart,
+            smart_criteria=smart_criteria,
+            parent_id=(
+                str(playlist.ParentID)
+                if playlist.ParentID and playlist.ParentID != "root"
+                else None
+            ),
+        )
 
     async def get_playlist_tracks(self, playlist_id: str) -> List[Track]:
         """Get all tracks in a specific playlist."""
@@ -328,27 +905,18 @@ class RekordboxDatabase:
             raise RuntimeError("Database not connected")
 
         def _inner():
-            playlist_songs = list(
-                self.db.get_playlist_songs(PlaylistID=int(playlist_id))
-            )
-            active_songs = [
-                s for s in playlist_songs if getattr(s, "rb_local_deleted", 0) == 0
-            ]
-
-            active_content = self._get_active_content()
-            content_lookup = {str(c.ID): c for c in active_content}
+            sorted_songs = self._playlist_song_cache.get().get(str(playlist_id), [])
+            row_lookup = self._get_row_lookup()
 
             tracks = []
-            sorted_songs = sorted(active_songs, key=lambda x: getattr(x, "TrackNo", 0))
             for song_playlist in sorted_songs:
                 content_id = str(song_playlist.ContentID)
-                if content_id in content_lookup:
-                    track = self._content_to_track(content_lookup[content_id])
-                    tracks.append(track)
+                if content_id in row_lookup:
+                    tracks.append(row_lookup[content_id].to_track())
 
             return tracks
 
-        return await asyncio.to_thread(_inner)
+        return await self._run(_inner)
 
     async def get_most_played_tracks(self, limit: int = 20) -> List[Track]:
         """Get the most played tracks."""
@@ -356,15 +924,23 @@ class RekordboxDatabase:
             raise RuntimeError("Database not connected")
 
         def _inner():
-            active_content = self._get_active_content()
-            sorted_content = sorted(
-                active_content,
-                key=lambda x: getattr(x, "DJPlayCount", 0) or 0,
-                reverse=True,
-            )
-            return [self._content_to_track(c) for c in sorted_content[:limit]]
+            ranked = self._most_played_rows()
+            return [row.to_track() for row in ranked[:limit]]
+
+        return await self._run(_inner)
 
-        return await asyncio.to_thread(_inner)
+    def _most_played_rows(self) -> List[TrackRow]:
+        """Active tracks ordered by play count, highest first.
+
+        Sorted once per content version; the list is shared between calls
+        and must not be mutated.
+        """
+        return self._content_cache.derive(
+            "most_played",
+            lambda content: sorted(
+                self._get_track_rows(), key=lambda row: row.play_count, reverse=True
+            ),
+        )
 
     async def get_top_rated_tracks(self, limit: int = 20) -> List[Track]:
         """Get the highest rated tracks."""
@@ -372,18 +948,24 @@ class RekordboxDatabase:
             raise RuntimeError("Database not connected")
 
         def _inner():
-            active_content = self._get_active_content()
-            sorted_content = sorted(
-                active_content,
-                key=lambda x: (
-                    getattr(x, "Rating", 0) or 0,
-                    getattr(x, "DJPlayCount", 0) or 0,
-                ),
-                reverse=True,
-            )
-            return [self._content_to_track(c) for c in sorted_content[:limit]]
+            ranked = self._top_rated_rows()
+            return [row.to_track() for row in ranked[:limit]]
 
-        return await asyncio.to_thread(_inner)
+        return await self._run(_inner)
+
+    def _top_rated_rows(self) -> List[TrackRow]:
+        """Active tracks ordered by rating, then play count, highest first.
+
+        Sorted once per content version, like ``_most_played_rows()``.
+        """
+        return self._content_cache.derive(
+            "top_rated",
+            lambda content: sorted(
+                self._get_track_rows(),
+                key=lambda row: (row.rating, row.play_count),
+                reverse=True,
+            ),
+        )
 
     async def get_unplayed_tracks(self, limit: int = 50) -> List[Track]:
         """Get tracks that have never been played."""
@@ -391,13 +973,14 @@ class RekordboxDatabase:
             raise RuntimeError("Database not connected")
 
         def _inner():
-            active_content = self._get_active_content()
-            unplayed = [
-                c for c in active_content if (getattr(c, "DJPlayCount", 0) or 0) == 0
-            ]
-            return [self._content_to_track(c) for c in unplayed[:limit]]
+            unplayed = self._unplayed_rows()
+            return [row.to_track() for row in islice(unplayed, limit)]
+
+        return await self._run(_inner)
 
-        return await asyncio.to_thread(_inner)
+    def _unplayed_rows(self) -> Iterator[TrackRow]:
+        """Lazily yield active tracks that have never been played."""
+        return self._search_rows(SearchOptions(play_count_max=0))
 
     async def search_tracks_by_filename(self, filename: str) -> List[Track]:
         """Search tracks by filename."""
@@ -405,58 +988,133 @@ class RekordboxDatabase:
             raise RuntimeError("Database not connected")
 
         def _inner():
-            active_content = self._get_active_content()
-            filename_lower = filename.lower()
-            return [
-                self._content_to_track(c)
-                for c in active_content
-                if filename_lower in (getattr(c, "FolderPath", "") or "").lower()
-            ]
+            return [row.to_track() for row in self._filename_rows(filename)]
 
-        return await asyncio.to_thread(_inner)
+        return await self._run(_inner)
+
+    def _filename_rows(self, filename: str) -> Iterator[TrackRow]:
+        """Lazily yield active tracks whose file path contains ``filename``."""
+        plan = SearchPlan(self._get_search_index(), [path_contains(filename)])
+        return plan.iter_rows()
 
     async def analyze_library(
-        self, group_by: str, aggregate_by: str, top_n: int
+        self,
+        group_by: Union[str, List[str]],
+        aggregate_by: str,
+        top_n: int,
+        bpm_bucket: float = DEFAULT_BPM_BUCKET,
+        approximate: bool = False,
     ) -> Dict[str, Any]:
-        """Analyze library with grouping and aggregation."""
+        """Analyze library with grouping and aggregation.
+
+        ``group_by`` is one dimension, a list of them, or a comma-separated
+        string (e.g. "genre,key"). With one dimension, results map each group
+        label to its aggregates; with several, results is a list of rows
+        holding the dimension labels followed by the aggregates.
+
+        ``approximate`` answers top groups by count for genre or artist from
+        streaming sketches, with error bounds, plus estimated distinct genre,
+        artist and label counts.
+        """
         if not self.db:
             raise RuntimeError("Database not connected")
 
+        if isinstance(group_by, str):
+            group_by = [d.strip() for d in group_by.split(",") if d.strip()]
+        dimensions = check_dimensions(group_by)
+        if bpm_bucket <= 0:
+            raise ValueError("bpm_bucket must be positive")
+        if approximate:
+            if len(dimensions) != 1 or dimensions[0] not in SKETCH_DIMENSIONS:
+                raise ValueError(
+                    "Approximate mode groups by one of: " + ", ".join(SKETCH_DIMENSIONS)
+                )
+            if aggregate_by != "count":
+                raise ValueError("Approximate mode only supports aggregate_by=count")
+
+            def _approximate():
+                sketches = self._get_library_sketches()
+                return {
+                    "group_by": dimensions[0],
+                    "aggregate_by": aggregate_by,
+                    "approximate": True,
+                    **sketches.top(dimensions[0], top_n),
+                }
+
+            return await self._run(_approximate)
+
         def _inner():
-            active_content = self._get_active_content()
-            groups: Dict[str, Dict[str, int]] = {}
-
-            field_map = {
-                "genre": "GenreName",
-                "key": "KeyName",
-                "year": "ReleaseYear",
-                "artist": "ArtistName",
-                "rating": "Rating",
+            labels, stats = group_stats(
+                self._get_library_columns(), dimensions, bpm_bucket
+            )
+            top = top_groups(labels, stats, aggregate_by, top_n)
+
+            if len(dimensions) == 1:
+                results: Any = {label[0]: values for label, values in top}
+            else:
+                results = [
+                    {**dict(zip(dimensions, label)), **values} for label, values in top
+                ]
+            return {
+                "group_by": dimensions[0] if len(dimensions) == 1 else dimensions,
+                "aggregate_by": aggregate_by,
+                "results": results,
+                "total_groups": len(labels),
             }
-            attr_name = field_map.get(group_by, "GenreName")
 
-            for content in active_content:
-                raw = getattr(content, attr_name, "") or ""
-                key = str(raw) if raw else "Unknown"
+        return await self._run(_inner)
 
-                if key not in groups:
-                    groups[key] = {"count": 0, "playCount": 0, "totalTime": 0}
+    async def get_distribution(
+        self,
+        column: str,
+        bins: int = DEFAULT_BINS,
+        bin_width: Optional[float] = None,
+        percentiles: Optional[List[float]] = None,
+        genre: Optional[str] = None,
+        playlist_id: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Histogram, percentiles and min/max/mean of a numeric track column.
+
+        ``genre`` (substring match) and ``playlist_id`` restrict the tracks
+        considered; both may be combined.
+        """
+        if not self.db:
+            raise RuntimeError("Database not connected")
 
-                groups[key]["count"] += 1
-                groups[key]["playCount"] += getattr(content, "DJPlayCount", 0) or 0
-                groups[key]["totalTime"] += getattr(content, "Length", 0) or 0
+        check_numeric_column(column)
+        if not 1 <= bins <= MAX_BINS:
+            raise ValueError(f"bins must be between 1 and {MAX_BINS}")
+        if bin_width is not None and bin_width <= 0:
+            raise ValueError("bin_width must be positive")
 
-            sorted_groups = sorted(
-                groups.items(), key=lambda x: x[1][aggregate_by], reverse=True
+        def _inner():
+            columns = self._get_library_columns()
+            keep = np.ones(columns.size, dtype=bool)
+            if genre:
+                keep &= columns.contains_mask("genre", genre)
+            if playlist_id is not None:
+                ids = self._keys_playlist_tracks({"playlist_id": playlist_id})
+                selected = columns.positions(ids)
+                selected = selected[keep[selected]]
+            else:
+                selected = np.flatnonzero(keep)
+            values = getattr(columns, column)[selected]
+
+            result = distribution(
+                values,
+                column,
+                bins=bins,
+                bin_width=bin_width,
+                percentiles=percentiles or DEFAULT_PERCENTILES,
             )
-            return {
-                "group_by": group_by,
-                "aggregate_by": aggregate_by,
-                "results": dict(sorted_groups[:top_n]),
-                "total_groups": len(groups),
+            result["filters"] = {
+                k: v
+                for k, v in (("genre", genre), ("playlist_id", playlist_id))
+                if v is not None
             }
+            return result
 
-        return await asyncio.to_thread(_inner)
+        return await self._run(_inner)
 
     async def validate_track_ids(self, track_ids: List[str]) -> Dict[str, Any]:
         """Validate track IDs."""
@@ -478,7 +1136,7 @@ class RekordboxDatabase:
                 "invalid_count": len(invalid),
             }
 
-        return await asyncio.to_thread(_inner)
+        return await self._run(_inner)
 
     async def get_library_stats(self) -> LibraryStats:
         """Get comprehensive library statistics."""
@@ -486,33 +1144,12 @@ class RekordboxDatabase:
             raise RuntimeError("Database not connected")
 
         def _inner():
-            active_content = self._get_active_content()
-            total_tracks = len(active_content)
-            total_playtime = sum(getattr(c, "Length", 0) or 0 for c in active_content)
-            avg_bpm = (
-                sum((getattr(c, "BPM", 0) or 0) / 100.0 for c in active_content)
-                / total_tracks
-                if total_tracks > 0
-                else 0
-            )
-
-            genres: Dict[str, int] = {}
-            for content in active_content:
-                genre = getattr(content, "GenreName", "") or "Unknown"
-                genres[genre] = genres.get(genre, 0) + 1
-
             return LibraryStats(
-                total_tracks=total_tracks,
-                total_playtime_seconds=total_playtime,
-                average_bpm=round(avg_bpm, 2),
-                genre_distribution=dict(
-                    sorted(genres.items(), key=lambda x: x[1], reverse=True)[:10]
-                ),
+                **self._get_library_aggregates().summary(),
                 database_path=str(self.database_path),
-                last_updated=datetime.now().isoformat(),
             )
 
-        return await asyncio.to_thread(_inner)
+        return await self._run(_inner)
 
     async def get_tracks_by_genre(self, genre: str) -> List[str]:
         """Get filepaths for all tracks matching a genre."""
@@ -520,16 +1157,363 @@ class RekordboxDatabase:
             raise RuntimeError("Database not connected")
 
         def _inner():
-            active_content = self._get_active_content()
-            genre_lower = genre.lower()
+            return self._genre_filepaths(genre)
+
+        return await self._run(_inner)
+
+    def _genre_filepaths(self, genre: str) -> List[str]:
+        """File paths of active content whose genre contains ``genre``."""
+        genre_lower = genre.lower()
+        return [
+            row.file_path
+            for row in self._get_track_rows()
+            if genre_lower in row.genre.lower() and row.file_path
+        ]
+
+    # --- Paginated listings ---
+
+    def _list_sources(self) -> Dict[str, Tuple[Callable, str, Tuple[TableCache, ...]]]:
+        """Listing name -> (key builder, item kind, caches the keys depend on)."""
+        content = self._content_cache
+        return {
+            "search": (
+                lambda p: (r.id for r in self._search_rows(SearchOptions(**p))),
+                "track",
+                (content,),
+            ),
+            "most_played": (
+                lambda p: [r.id for r in self._most_played_rows()],
+                "track",
+                (content,),
+            ),
+            "top_rated": (
+                lambda p: [r.id for r in self._top_rated_rows()],
+                "track",
+                (content,),
+            ),
+            "unplayed": (
+                lambda p: (r.id for r in self._unplayed_rows()),
+                "track",
+                (content,),
+            ),
+            "filename": (
+                lambda p: (r.id for r in self._filename_rows(p["filename"])),
+                "track",
+                (content,),
+            ),
+            "genre_filepaths": (
+                lambda p: self._genre_filepaths(p["genre"]),
+                "path",
+                (content,),
+            ),
+            "playlist_tracks": (
+                self._keys_playlist_tracks,
+                "track",
+                (content, self._playlist_song_cache),
+            ),
+            "playlists": (
+                lambda p: [str(pl.ID) for pl in self._playlist_cache.get()],
+                "playlist",
+                (self._playlist_cache, self._playlist_song_cache),
+            ),
+            "history_sessions": (
+                self._keys_history_sessions,
+                "session",
+                (content, self._history_cache),
+            ),
+            "session_tracks": (
+                self._keys_session_tracks,
+                "session_track",
+                (content, self._history_cache),
+            ),
+        }
+
+    def _keys_playlist_tracks(self, params: Dict[str, Any]) -> List[str]:
+        content_lookup = self._get_content_lookup()
+        songs = self._playlist_song_cache.get().get(str(params["playlist_id"]), [])
+        return [str(s.ContentID) for s in songs if str(s.ContentID) in content_lookup]
+
+    def _keys_session_tracks(self, params: Dict[str, Any]) -> List[int]:
+        content_lookup = self._get_content_lookup()
+        songs = self._history_cache.get()[1].get(str(params["session_id"]), [])
+        return [i for i, s in enumerate(songs) if str(s.ContentID) in content_lookup]
+
+    def _keys_history_sessions(self, params: Dict[str, Any]) -> Iterator[str]:
+        """Lazily yield session IDs matching the filters, most recent first.
+
+        Date filters are a range lookup on the session index; the remaining
+        filters are only evaluated for sessions inside that range.
+        """
+        _, songs_by_history = self._history_cache.get()
+        index = self._get_session_index()
+        include_folders = params.get("include_folders", False)
+        query = (params.get("query") or "").lower()
+        min_tracks = params.get("min_tracks")
+        start, end = date_range(
+            params.get("since"), params.get("year"), params.get("month")
+        )
+
+        if start is None and end is None:
+            candidates = index.all()
+        else:
+            candidates = index.between(start, end)
+        for history in candidates:
+            if history.Attribute == 1 and not include_folders:
+                continue
+            if query and query not in (history.Name or "").lower():
+                continue
+            if (
+                min_tracks
+                and len(songs_by_history.get(str(history.ID), [])) < min_tracks
+            ):
+                continue
+            yield str(history.ID)
+
+    def _listing_keys(
+        self, source: str, params: Dict[str, Any], limit: Optional[int] = None
+    ) -> Tuple[List[Any], List[int]]:
+        """Ordered keys of a listing plus the cache versions they were built from.
+
+        Key builders may be lazy; with ``limit`` and no cached result set, only
+        the first ``limit`` keys are produced and nothing is cached.
+        """
+        build_keys, _, caches = self._list_sources()[source]
+        for cache in caches:
+            cache.get()
+        version = [cache.version for cache in caches]
+
+        result_key = (params_key(source, params), tuple(version))
+        keys = self._result_sets.get(result_key)
+        if keys is None:
+            if limit is not None:
+                return list(islice(build_keys(params), limit)), version
+            keys = list(build_keys(params))
+            self._result_sets.put(result_key, keys)
+        if limit is not None:
+            keys = keys[:limit]
+        return keys, version
+
+    @staticmethod
+    def _check_fields(kind: str, fields: Optional[List[str]]) -> Optional[List[str]]:
+        """Validate requested projection fields for a listing kind."""
+        if not fields:
+            return None
+        allowed = {"track": TRACK_FIELDS, "session_track": HISTORY_TRACK_FIELDS}
+        if kind not in allowed:
+            raise ValueError("Field projection is only supported for track listings")
+        unknown = [f for f in fields if f not in allowed[kind]]
+        if unknown:
+            raise ValueError(
+                f"Unknown field(s): {', '.join(unknown)}. "
+                f"Available: {', '.join(allowed[kind])}"
+            )
+        return list(dict.fromkeys(fields))
+
+    def _materialize(
+        self,
+        kind: str,
+        params: Dict[str, Any],
+        keys: List[Any],
+        fields: Optional[List[str]] = None,
+    ) -> List[Any]:
+        """Build response items for one page of listing keys.
+
+        With ``fields``, track items are plain dicts assembled from the cached
+        track rows, skipping Track construction and validation.
+        """
+        if kind == "path":
+            return list(keys)
+
+        if kind == "track":
+            row_lookup = self._get_row_lookup()
+            rows = [row_lookup[k] for k in keys if k in row_lookup]
+            if fields:
+                return [row.as_dict(fields) for row in rows]
+            return [self._track_payload(row) for row in rows]
+
+        if kind == "playlist":
+            songs_by_playlist = self._playlist_song_cache.get()
+            by_id = {str(p.ID): p for p in self._playlist_cache.get()}
             return [
-                getattr(c, "FolderPath", "")
-                for c in active_content
-                if genre_lower in (getattr(c, "GenreName", "") or "").lower()
-                and getattr(c, "FolderPath", "")
+                self._build_playlist(by_id[k], songs_by_playlist).model_dump()
+                for k in keys
+                if k in by_id
             ]
 
-        return await asyncio.to_thread(_inner)
+        histories, songs_by_history = self._history_cache.get()
+        content_lookup = self._get_content_lookup()
+
+        if kind == "session":
+            by_id = {str(h.ID): h for h in histories}
+            return [
+                self._build_history_session(
+                    by_id[k], songs_by_history, content_lookup
+                ).model_dump()
+                for k in keys
+                if k in by_id
+            ]
+
+        # session_track
+        session_id = str(params["session_id"])
+        songs = songs_by_history.get(session_id, [])
+        row_lookup = self._get_row_lookup()
+        items = []
+        for i in keys:
+            values = self._history_track_values(
+                songs[i], session_id, row_lookup[str(songs[i].ContentID)]
+            )
+            if fields:
+                items.append({f: values[f] for f in fields})
+            else:
+                items.append(HistoryTrack(**values).model_dump())
+        return items
+
+    @staticmethod
+    def _encode_items(
+        kind: str, items: List[Any], format: str, fields: Optional[List[str]]
+    ) -> Any:
+        """Apply the response format to materialised listing items."""
+        if format == "rows":
+            return items
+        if kind not in ("track", "session_track"):
+            raise ValueError("Columnar format is only supported for track listings")
+        if fields is None:
+            fields = TRACK_FIELDS if kind == "track" else HISTORY_TRACK_FIELDS
+        return encode_columnar(items, fields)
+
+    async def get_page(
+        self,
+        source: str,
+        params: Optional[Dict[str, Any]] = None,
+        cursor: Optional[str] = None,
+        page_size: Optional[int] = None,
+        fields: Optional[List[str]] = None,
+        format: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Return one page of a listing plus an opaque cursor for the next page.
+
+        The ordered result keys are computed once per (listing, parameters,
+        cache versions) and kept in a small LRU, so each page only materialises
+        its own rows. A cursor carries its listing parameters, projection and
+        format, and is rejected once any table the listing depends on has
+        changed.
+        """
+        if not self.db:
+            raise RuntimeError("Database not connected")
+
+        sources = self._list_sources()
+        if source not in sources:
+            raise ValueError(f"Unknown listing {source!r}")
+        kind = sources[source][1]
+
+        def _inner():
+            page_fields, page_format = fields, format
+            if cursor:
+                state = decode_cursor(cursor)
+                if state["s"] != source:
+                    raise CursorError(
+                        f"Cursor belongs to {state['s']!r}, not {source!r}"
+                    )
+                list_params, offset, size = state["p"], state["o"], state["n"]
+                page_fields = page_fields or state.get("f")
+                page_format = page_format or state.get("fmt")
+            else:
+                list_params, offset, size = params or {}, 0, DEFAULT_PAGE_SIZE
+            if page_size:
+                size = page_size
+            size = max(1, min(int(size), MAX_PAGE_SIZE))
+            page_fields = self._check_fields(kind, page_fields)
+            page_format = check_format(page_format or "rows")
+
+            keys, version = self._listing_keys(source, list_params)
+            if cursor and state["v"] != version:
+                raise CursorError(
+                    "Cursor expired: the library changed since it was issued. "
+                    "Request the first page again."
+                )
+
+            page_keys = keys[offset : offset + size]
+            next_offset = offset + len(page_keys)
+            next_cursor = None
+            if next_offset < len(keys):
+                state = {
+                    "s": source,
+                    "p": list_params,
+                    "v": version,
+                    "o": next_offset,
+                    "n": size,
+                }
+                if page_fields:
+                    state["f"] = page_fields
+                if page_format != "rows":
+                    state["fmt"] = page_format
+                next_cursor = encode_cursor(state)
+
+            items = self._materialize(kind, list_params, page_keys, page_fields)
+            return {
+                "items": self._encode_items(kind, items, page_format, page_fields),
+                "total_count": len(keys),
+                "offset": offset,
+                "page_size": size,
+                "next_cursor": next_cursor,
+            }
+
+        return await self._run(_inner)
+
+    async def get_listing(
+        self,
+        source: str,
+        params: Optional[Dict[str, Any]] = None,
+        fields: Optional[List[str]] = None,
+        limit: Optional[int] = None,
+        format: str = "rows",
+    ) -> Any:
+        """Return the first ``limit`` items of a listing, optionally projected.
+
+        With ``format="columnar"`` the items are returned column-wise (see
+        ``encoding.encode_columnar``) instead of as a list of dicts.
+        """
+        if not self.db:
+            raise RuntimeError("Database not connected")
+
+        sources = self._list_sources()
+        if source not in sources:
+            raise ValueError(f"Unknown listing {source!r}")
+        kind = sources[source][1]
+        list_params = params or {}
+
+        def _inner():
+            item_fields = self._check_fields(kind, fields)
+            item_format = check_format(format)
+            keys, _ = self._listing_keys(source, list_params, limit)
+            items = self._materialize(kind, list_params, keys, item_fields)
+            return self._encode_items(kind, items, item_format, item_fields)
+
+        return await self._run(_inner)
+
+    async def count_listing(
+        self, source: str, params: Optional[Dict[str, Any]] = None
+    ) -> int:
+        """Exact number of items in a listing, without materialising them."""
+        if not self.db:
+            raise RuntimeError("Database not connected")
+
+        sources = self._list_sources()
+        if source not in sources:
+            raise ValueError(f"Unknown listing {source!r}")
+        build_keys, _, caches = sources[source]
+        list_params = params or {}
+
+        def _inner():
+            for cache in caches:
+                cache.get()
+            version = tuple(cache.version for cache in caches)
+            keys = self._result_sets.get((params_key(source, list_params), version))
+            if keys is not None:
+                return len(keys)
+            return sum(1 for _ in build_keys(list_params))
+
+        return await self._run(_inner)
 
     # --- History operations ---
 
@@ -541,70 +1525,57 @@ class RekordboxDatabase:
             raise RuntimeError("Database not connected")
 
         def _inner():
-            all_histories = list(self.db.get_history())
-            active_histories = [
-                h for h in all_histories if getattr(h, "rb_local_deleted", 0) == 0
-            ]
+            active_histories, songs_by_history = self._history_cache.get()
+            content_lookup = self._get_content_lookup()
 
-            # Build content lookup ONCE for duration calculation
-            active_content = self._get_active_content()
-            content_lookup = {str(c.ID): c for c in active_content}
+            return [
+                self._build_history_session(h, songs_by_history, content_lookup)
+                for h in active_histories
+                if include_folders or h.Attribute != 1
+            ]
 
-            sessions = []
-            for history in active_histories:
-                is_folder = history.Attribute == 1
+        return await self._run(_inner)
 
-                if not include_folders and is_folder:
-                    continue
-
-                track_count = 0
-                duration_minutes = None
-                if not is_folder:
-                    try:
-                        history_songs = list(
-                            self.db.get_history_songs(HistoryID=history.ID)
+    def _build_history_session(
+        self,
+        history,
+        songs_by_history: Dict[str, list],
+        content_lookup: Dict[str, Any],
+    ) -> HistorySession:
+        """Convert a history row to a HistorySession with track count and duration."""
+        is_folder = history.Attribute == 1
+
+        track_count = 0
+        duration_minutes = None
+        if not is_folder:
+            active_songs = songs_by_history.get(str(history.ID), [])
+            track_count = len(active_songs)
+
+            if active_songs:
+                total_seconds = 0
+                for song in active_songs:
+                    content_id = str(song.ContentID)
+                    if content_id in content_lookup:
+                        total_seconds += (
+                            getattr(content_lookup[content_id], "Length", 0) or 0
                         )
-                        active_songs = [
-                            s
-                            for s in history_songs
-                            if getattr(s, "rb_local_deleted", 0) == 0
-                        ]
-                        track_count = len(active_songs)
-
-                        if active_songs:
-                            total_seconds = 0
-                            for song in active_songs:
-                                content_id = str(song.ContentID)
-                                if content_id in content_lookup:
-                                    total_seconds += (
-                                        getattr(content_lookup[content_id], "Length", 0)
-                                        or 0
-                                    )
-                            duration_minutes = (
-                                round(total_seconds / 60) if total_seconds > 0 else None
-                            )
-                    except Exception:
-                        track_count = 0
-
-                sessions.append(
-                    HistorySession(
-                        id=str(history.ID),
-                        name=history.Name or "",
-                        parent_id=(
-                            str(history.ParentID)
-                            if history.ParentID and history.ParentID != "root"
-                            else None
-                        ),
-                        is_folder=is_folder,
-                        date_created=history.DateCreated,
-                        track_count=track_count,
-                        duration_minutes=duration_minutes,
-                    )
+                duration_minutes = (
+                    round(total_seconds / 60) if total_seconds > 0 else None
                 )
 
-            return sessions
-
-        return await asyncio.to_thread(_inner)
+        return HistorySession(
+            id=str(history.ID),
+            name=history.Name or "",
+            parent_id=(
+                str(history.ParentID)
+                if history.ParentID and history.ParentID != "root"
+                else None
+            ),
+            is_folder=is_folder,
+            date_created=history.DateCreated,
+            track_count=track_count,
+            duration_minutes=duration_minutes,
+        )
 
     async def get_session_tracks(self, session_id: str) -> List[HistoryTrack]:
         """Get all tracks from a specific DJ history session."""
@@ -612,76 +1583,102 @@ class RekordboxDatabase:
             raise RuntimeError("Database not connected")
 
         def _inner():
-            history_songs = list(self.db.get_history_songs(HistoryID=int(session_id)))
-            active_songs = [
-                s for s in history_songs if getattr(s, "rb_local_deleted", 0) == 0
+            _, songs_by_history = self._history_cache.get()
+            sorted_songs = songs_by_history.get(str(session_id), [])
+            row_lookup = self._get_row_lookup()
+
+            return [
+                self._build_history_track(
+                    song, session_id, row_lookup[str(song.ContentID)]
+                )
+                for song in sorted_songs
+                if str(song.ContentID) in row_lookup
             ]
 
-            active_content = self._get_active_content()
-            content_lookup = {str(c.ID): c for c in active_content}
+        return await self._run(_inner)
 
-            tracks = []
-            sorted_songs = sorted(active_songs, key=lambda x: x.TrackNo)
-            for song in sorted_songs:
-                content_id = str(song.ContentID)
-                if content_id in content_lookup:
-                    track = self._content_to_track(content_lookup[content_id])
-                    tracks.append(
-                        HistoryTrack(
-                            id=track.id,
-                            title=track.title,
-                            artist=track.artist,
-                            album=track.album,
-                            genre=track.genre,
-                            bpm=track.bpm,
-                            key=track.key,
-                            length=track.length,
-                            track_number=song.TrackNo,
-                            history_id=session_id,
-                            play_order=song.TrackNo,
-                        )
-                    )
-
-            return tracks
+    def _build_history_track(
+        self, song, session_id: str, row: TrackRow
+    ) -> HistoryTrack:
+        """Convert a history-song row and its track to a HistoryTrack."""
+        return HistoryTrack(**self._history_track_values(song, session_id, row))
 
-        return await asyncio.to_thread(_inner)
+    @staticmethod
+    def _history_track_values(song, session_id: str, row: TrackRow) -> Dict[str, Any]:
+        """HistoryTrack field values for a history-song row and its track."""
+        values = row.as_dict(_HISTORY_ROW_FIELDS)
+        values["track_number"] = song.TrackNo
+        values["history_id"] = str(session_id)
+        values["play_order"] = song.TrackNo
+        return values
 
     async def get_history_stats(self) -> HistoryStats:
         """Get comprehensive statistics about DJ history sessions."""
         if not self.db:
             raise RuntimeError("Database not connected")
 
-        # This method calls other async methods, so no to_thread wrapper
-        sessions = await self.get_history_sessions(include_folders=False)
+        def _inner():
+            plays = self._get_play_frequency()
+            rows_by_id = self._get_row_lookup()
+            return HistoryStats(
+                **plays.summary(rows_by_id, self._content_cache.version)
+            )
 
-        total_sessions = len(sessions)
-        total_tracks_played = sum(s.track_count for s in sessions)
-        total_minutes = sum(s.duration_minutes for s in sessions if s.duration_minutes)
-        total_hours_played = total_minutes / 60 if total_minutes > 0 else 0.0
-        avg_session_length = (
-            total_minutes / total_sessions if total_sessions > 0 else 0.0
-        )
+        return await self._run(_inner)
 
-        sessions_by_month: Dict[str, int] = {}
-        for session in sessions:
-            if session.date_created:
-                try:
-                    date_part = session.date_created[:7]
-                    sessions_by_month[date_part] = (
-                        sessions_by_month.get(date_part, 0) + 1
-                    )
-                except Exception:
-                    pass
-
-        return HistoryStats(
-            total_sessions=total_sessions,
-            total_tracks_played=total_tracks_played,
-            total_hours_played=round(total_hours_played, 1),
-            sessions_by_month=sessions_by_month,
-            avg_session_length=round(avg_session_length, 1),
-            favorite_genres=[],
-            most_played_track=None,
-        )
+    async def get_transitions(
+        self, track_id: str, direction: str = "next", limit: int = 20
+    ) -> Dict[str, Any]:
+        """
+        Tracks played directly after (or before) a track in DJ history.
+
+        Each neighbour carries how often the transition occurred and the BPM
+        and Camelot key distance from the given track.
+        """
+        if not self.db:
+            raise RuntimeError("Database not connected")
+        if direction not in ("next", "previous"):
+            raise ValueError("direction must be 'next' or 'previous'")
+
+        def _summary(row: Optional[TrackRow], track_id: str) -> Dict[str, Any]:
+            return {
+                "id": track_id,
+                "title": row.title if row else None,
+                "artist": row.artist if row else None,
+                "bpm": row.bpm if row else None,
+                "key": row.key if row else None,
+            }
+
+        def _inner():
+            graph = self._get_transition_graph()
+            rows_by_id = self._get_row_lookup()
+            track_id_ = str(track_id)
+            row = rows_by_id.get(track_id_)
+            neighbours = graph.neighbours(track_id_, direction)
+
+            transitions = []
+            for other_id, count in neighbours[:limit]:
+                other = rows_by_id.get(other_id)
+                entry = _summary(other, other_id)
+                entry["count"] = count
+                entry["bpm_delta"] = (
+                    round(other.bpm - row.bpm, 2)
+                    if row and other and row.bpm and other.bpm
+                    else None
+                )
+                entry["key_distance"] = (
+                    key_distance(row.key, other.key) if row and other else None
+                )
+                transitions.append(entry)
+
+            return {
+                "track": _summary(row, track_id_) if row else None,
+                "direction": direction,
+                "total": len(neighbours),
+                "transitions": transitions,
+            }
+
+        return await self._run(_inner)
 
     # --- Import operations ---
 
@@ -906,11 +1903,9 @@ class RekordboxDatabase:
                 return {"status": "error", "path": str(file_path), "reason": msg}
 
         try:
-            return await asyncio.to_thread(_inner)
+            return await self._run(_inner, rollback=True)
         except Exception as e:
             logger.error(f"Failed to import track {path}: {e}")
-            if self.db and hasattr(self.db, "rollback"):
-                self.db.rollback()
             return {"status": "error", "path": path, "reason": str(e)}
 
     async def import_tracks(
@@ -1022,24 +2017,27 @@ class RekordboxDatabase:
                 playlist_id = str(playlist)
 
             self.db.commit()
-            self._invalidate_content_cache()
+            self._playlist_cache.invalidate()
 
             item_type = "folder" if is_folder else "playlist"
             logger.info(f"Created {item_type} '{name}' with ID {playlist_id}")
             return playlist_id
 
         try:
-            return await asyncio.to_thread(_inner)
+            return await self._run(_inner, rollback=True)
         except Exception as e:
             logger.error(f"Failed to create playlist '{name}': {e}")
-            if self.db and hasattr(self.db, "rollback"):
-                self.db.rollback()
             raise RuntimeError(f"Failed to create playlist: {str(e)}")
 
     async def add_tracks_to_playlist(
         self, playlist_id: str, track_ids: List[str]
     ) -> Dict[str, Any]:
-        """Add multiple tracks to a playlist."""
+        """Add multiple tracks to a playlist.
+
+        Uses a bulk path: IDs, USNs and contiguous track numbers are allocated
+        up front and all song rows are inserted with a single executemany.
+        Tracks already in the playlist (or repeated in ``track_ids``) are skipped.
+        """
         if not self.db:
             raise RuntimeError("Database not connected")
 
@@ -1049,31 +2047,93 @@ class RekordboxDatabase:
             results: Dict[str, list] = {"added": [], "failed": [], "skipped": []}
             playlist_int_id = int(playlist_id)
 
+            playlist = self.db.get_playlist(ID=playlist_int_id)
+            if playlist is None:
+                raise ValueError(f"Playlist {playlist_id} not found")
+            if getattr(playlist, "Attribute", 0) != 0 or getattr(
+                playlist, "is_smart_playlist", False
+            ):
+                raise ValueError("Playlist must be a normal playlist")
+
+            # Read membership fresh: the bulk path must not trust a stale cache
+            active_songs = [
+                s
+                for s in self.db.get_playlist_songs(PlaylistID=playlist_int_id)
+                if getattr(s, "rb_local_deleted", 0) == 0
+            ]
+            present = {str(s.ContentID) for s in active_songs}
+            next_track_no = (
+                max((getattr(s, "TrackNo", 0) or 0 for s in active_songs), default=0)
+                + 1
+            )
+            content_lookup = self._get_content_lookup()
+
+            to_insert: List[str] = []
             for track_id in track_ids:
-                try:
-                    self.db.add_to_playlist(playlist_int_id, int(track_id))
-                    results["added"].append(track_id)
-                    logger.info(f"Added track {track_id} to playlist {playlist_id}")
-                except Exception as e:
-                    results["failed"].append({"track_id": track_id, "reason": str(e)})
-                    logger.warning(f"Failed to add track {track_id}: {e}")
+                content_id = str(track_id).strip()
+                if content_id in present:
+                    results["skipped"].append(
+                        {"track_id": track_id, "reason": "already in playlist"}
+                    )
+                elif content_id not in content_lookup:
+                    results["failed"].append(
+                        {"track_id": track_id, "reason": "track not found"}
+                    )
+                else:
+                    present.add(content_id)
+                    to_insert.append(content_id)
+
+            self._bulk_insert_playlist_songs(playlist_int_id, to_insert, next_track_no)
+            results["added"] = to_insert
 
             self.db.commit()
-            self._invalidate_content_cache()
+            self._invalidate_playlist_caches(songs_only=True)
 
             logger.info(
-                f"Batch add to playlist {playlist_id}: {len(results['added'])} added, {len(results['failed'])} failed"
+                f"Batch add to playlist {playlist_id}: {len(results['added'])} added, "
+                f"{len(results['skipped'])} skipped, {len(results['failed'])} failed"
             )
             return results
 
         try:
-            return await asyncio.to_thread(_inner)
+            return await self._run(_inner, rollback=True)
         except Exception as e:
             logger.error(f"Failed to add tracks to playlist {playlist_id}: {e}")
-            if self.db and hasattr(self.db, "rollback"):
-                self.db.rollback()
             raise RuntimeError(f"Failed to add tracks to playlist: {str(e)}")
 
+    def _bulk_insert_playlist_songs(
+        self, playlist_id: int, content_ids: List[str], first_track_no: int
+    ) -> None:
+        """Insert playlist-song rows for ``content_ids`` in one executemany.
+
+        Mirrors the row layout of pyrekordbox's ``add_to_playlist`` but reserves
+        the USN range for the whole batch at once instead of per row.
+        """
+        if not content_ids:
+            return
+
+        now = datetime.now()
+        base_usn = int(self.db.get_local_usn())
+        rows = [
+            {
+                "ID": str(uuid4()),
+                "UUID": str(uuid4()),
+                "PlaylistID": str(playlist_id),
+                "ContentID": content_id,
+                "TrackNo": first_track_no + offset,
+                "rb_data_status": 0,
+                "rb_local_data_status": 0,
+                "rb_local_deleted": 0,
+                "rb_local_synced": 0,
+                "rb_local_usn": base_usn + offset + 1,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for offset, content_id in enumerate(content_ids)
+        ]
+        self.db.session.execute(insert(DjmdSongPlaylist), rows)
+        self.db.set_local_usn(base_usn + len(rows))
+
     async def add_track_to_playlist(self, playlist_id: str, track_id: str) -> bool:
         """Add a track to an existing playlist."""
         if not self.db:
@@ -1083,18 +2143,16 @@ class RekordboxDatabase:
             self._create_backup()
             self.db.add_to_playlist(int(playlist_id), int(track_id))
             self.db.commit()
-            self._invalidate_content_cache()
+            self._invalidate_playlist_caches(songs_only=True)
             logger.info(f"Added track {track_id} to playlist {playlist_id}")
             return True
 
         try:
-            return await asyncio.to_thread(_inner)
+            return await self._run(_inner, rollback=True)
         except Exception as e:
             logger.error(
                 f"Failed to add track {track_id} to playlist {playlist_id}: {e}"
             )
-            if self.db and hasattr(self.db, "rollback"):
-                self.db.rollback()
             raise RuntimeError(f"Failed to add track to playlist: {str(e)}")
 
     async def remove_track_from_playlist(self, playlist_id: str, track_id: str) -> bool:
@@ -1106,18 +2164,16 @@ class RekordboxDatabase:
             self._create_backup()
             self.db.remove_from_playlist(int(playlist_id), int(track_id))
             self.db.commit()
-            self._invalidate_content_cache()
+            self._invalidate_playlist_caches(songs_only=True)
             logger.info(f"Removed track {track_id} from playlist {playlist_id}")
             return True
 
         try:
-            return await asyncio.to_thread(_inner)
+            return await self._run(_inner, rollback=True)
         except Exception as e:
             logger.error(
                 f"Failed to remove track {track_id} from playlist {playlist_id}: {e}"
             )
-            if self.db and hasattr(self.db, "rollback"):
-                self.db.rollback()
             raise RuntimeError(f"Failed to remove track from playlist: {str(e)}")
 
     async def delete_playlist(self, playlist_id: str) -> bool:
@@ -1129,18 +2185,228 @@ class RekordboxDatabase:
             self._create_backup()
             self.db.delete_playlist(int(playlist_id))
             self.db.commit()
-            self._invalidate_content_cache()
+            self._invalidate_playlist_caches()
             logger.info(f"Deleted playlist {playlist_id}")
             return True
 
         try:
-            return await asyncio.to_thread(_inner)
+            return await self._run(_inner, rollback=True)
         except Exception as e:
             logger.error(f"Failed to delete playlist {playlist_id}: {e}")
-            if self.db and hasattr(self.db, "rollback"):
-                self.db.rollback()
             raise RuntimeError(f"Failed to delete playlist: {str(e)}")
 
+    PLAYLIST_OPERATIONS = {"create", "add", "remove", "move", "delete"}
+
+    async def apply_playlist_operations(
+        self, operations: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Apply an ordered list of playlist operations in a single transaction.
+
+        Each operation is a dict with an ``op`` key (create, add, remove, move,
+        delete). A ``create`` may carry a ``ref`` name; later operations can
+        then target the new playlist with ``playlist_id="$<ref>"``.
+
+        One backup, one commit and one cache invalidation cover the whole batch.
+        If any operation fails, every change is rolled back.
+        """
+        if not self.db:
+            raise RuntimeError("Database not connected")
+
+        def _inner():
+            self._create_backup()
+            # create/delete edit pyrekordbox's in-memory masterPlaylists6.xml,
+            # which a session rollback does not undo
+            playlist_xml = self._snapshot_playlist_xml()
+
+            refs: Dict[str, str] = {}
+            results: List[Dict[str, Any]] = []
+
+            for index, operation in enumerate(operations):
+                op_name = str(operation.get("op", "")).lower()
+                try:
+                    if op_name not in self.PLAYLIST_OPERATIONS:
+                        raise ValueError(f"Unknown operation {op_name!r}")
+                    detail = self._apply_playlist_operation(op_name, operation, refs)
+                except Exception as e:
+                    logger.error(f"Playlist operation {index} ({op_name}) failed: {e}")
+                    self.db.rollback()
+                    self._restore_playlist_xml(playlist_xml)
+                    results.append(
+                        {
+                            "index": index,
+                            "op": op_name,
+                            "status": "error",
+                            "reason": str(e),
+                        }
+                    )
+                    return {
+                        "status": "rolled_back",
+                        "failed_index": index,
+                        "message": f"Operation {index} ({op_name}) failed: {e}",
+                        "results": results,
+                    }
+                results.append(
+                    {"index": index, "op": op_name, "status": "success", **detail}
+                )
+
+            try:
+                self.db.commit()
+            except Exception:
+                self.db.rollback()
+                self._restore_playlist_xml(playlist_xml)
+                raise
+            self._invalidate_playlist_caches()
+
+            logger.info(
+                f"Applied {len(results)} playlist operations in one transaction"
+            )
+            return {
+                "status": "success",
+                "applied_count": len(results),
+                "created": refs,
+                "results": results,
+            }
+
+        try:
+            return await self._run(_inner, rollback=True)
+        except Exception as e:
+            logger.error(f"Failed to apply playlist operations: {e}")
+            raise RuntimeError(f"Failed to apply playlist operations: {str(e)}")
+
+    def _apply_playlist_operation(
+        self, op_name: str, operation: Dict[str, Any], refs: Dict[str, str]
+    ) -> Dict[str, Any]:
+        """Stage one batch operation without committing. Returns result details."""
+
+        def resolve(key: str) -> Optional[str]:
+            value = operation.get(key)
+            if value is None or value == "root":
+                return None
+            value = str(value)
+            if value.startswith("$"):
+                if value[1:] not in refs:
+                    raise ValueError(f"Unknown playlist reference {value!r}")
+                return refs[value[1:]]
+            return value
+
+        if op_name == "create":
+            name = str(operation.get("name") or "").strip()
+            if not name:
+                raise ValueError("Playlist name cannot be empty")
+            parent_id = resolve("parent_id")
+            parent_int_id = int(parent_id) if parent_id else None
+            if operation.get("is_folder"):
+                playlist = self.db.create_playlist_folder(
+                    name=name, parent=parent_int_id
+                )
+            else:
+                playlist = self.db.create_playlist(name=name, parent=parent_int_id)
+            playlist_id = str(playlist.ID) if hasattr(playlist, "ID") else str(playlist)
+            if operation.get("ref"):
+                refs[str(operation["ref"])] = playlist_id
+            return {"playlist_id": playlist_id, "name": name}
+
+        playlist_id = resolve("playlist_id")
+        if not playlist_id:
+            raise ValueError("playlist_id is required")
+
+        if op_name == "add":
+            track_ids = operation.get("track_ids") or [operation.get("track_id")]
+            track_ids = [str(t).strip() for t in track_ids if t is not None]
+            if not track_ids:
+                raise ValueError("track_id or track_ids is required")
+            # Skip members like add_tracks_to_playlist; the query autoflushes,
+            # so tracks added earlier in the batch count as members too
+            present = {
+                str(s.ContentID)
+                for s in self.db.get_playlist_songs(PlaylistID=int(playlist_id))
+                if getattr(s, "rb_local_deleted", 0) == 0
+            }
+            added, skipped = [], []
+            for track_id in track_ids:
+                if track_id in present:
+                    skipped.append(track_id)
+                    continue
+                self.db.add_to_playlist(int(playlist_id), int(track_id))
+                present.add(track_id)
+                added.append(track_id)
+            return {"playlist_id": playlist_id, "track_ids": added, "skipped": skipped}
+
+        if op_name == "remove":
+            track_id = str(operation.get("track_id") or "")
+            song = self._find_playlist_song(playlist_id, track_id)
+            # pyrekordbox's remove_from_playlist commits internally, which would
+            # break atomicity, so mirror it here without the commit: delete the
+            # row, then renumber the rest as one tracked move.
+            removed_no = song.TrackNo
+            self.db.delete(song)
+            later = sorted(
+                (
+                    other
+                    for other in self.db.get_playlist_songs(PlaylistID=int(playlist_id))
+                    if other is not song
+                    and (getattr(other, "TrackNo", 0) or 0) > removed_no
+                ),
+                key=lambda other: other.TrackNo,
+            )
+            now = datetime.now()
+            with self.db.registry.disabled():
+                for other in later:
+                    other.TrackNo -= 1
+                    other.updated_at = now
+            if later:
+                self.db.registry.on_move(later)
+            return {"playlist_id": playlist_id, "track_id": track_id}
+
+        if op_name == "move":
+            position = operation.get("position")
+            if operation.get("track_id") is not None:
+                if position is None:
+                    raise ValueError("position is required to move a track")
+                track_id = str(operation["track_id"])
+                song = self._find_playlist_song(playlist_id, track_id)
+                self.db.move_song_in_playlist(int(playlist_id), song, int(position))
+                return {
+                    "playlist_id": playlist_id,
+                    "track_id": track_id,
+                    "position": int(position),
+                }
+            parent_id = resolve("parent_id")
+            self.db.move_playlist(
+                int(playlist_id),
+                parent=int(parent_id) if parent_id else None,
+                seq=int(position) if position is not None else None,
+            )
+            return {"playlist_id": playlist_id, "parent_id": parent_id}
+
+        # delete
+        playlist = self.db.get_playlist(ID=int(playlist_id))
+        if getattr(playlist, "is_smart_playlist", False):
+            raise ValueError(
+                "Cannot delete smart playlists - they are managed by rekordbox"
+            )
+        self.db.delete_playlist(int(playlist_id))
+        return {"playlist_id": playlist_id}
+
+    def _snapshot_playlist_xml(self):
+        """Copy of pyrekordbox's in-memory masterPlaylists6.xml, if it has one."""
+        playlist_xml = getattr(self.db, "playlist_xml", None)
+        return copy.deepcopy(playlist_xml) if playlist_xml is not None else None
+
+    def _restore_playlist_xml(self, snapshot) -> None:
+        """Put back a ``_snapshot_playlist_xml()`` copy after a rollback."""
+        if snapshot is not None:
+            self.db.playlist_xml = snapshot
+
+    def _find_playlist_song(self, playlist_id: str, track_id: str):
+        """Return the active playlist-song row linking a track to a playlist."""
+        for song in self.db.get_playlist_songs(PlaylistID=int(playlist_id)):
+            if not getattr(song, "rb_local_deleted", 0) and str(song.ContentID) == str(
+                track_id
+            ):
+                return song
+        raise ValueError(f"Track {track_id} is not in playlist {playlist_id}")
+
     # --- Cleanup operations ---
 
     async def find_broken_tracks(self) -> Dict[str, Any]:
@@ -1166,31 +2432,20 @@ class RekordboxDatabase:
                     missing_file.append({"id": str(c.ID), "title": title, "path": fp})
 
             # Find orphaned playlist refs
-            active_ids = {c.ID for c in active_content}
-            all_playlists = [
-                p
-                for p in list(self.db.get_playlist())
-                if not getattr(p, "rb_local_deleted", 0)
-            ]
+            content_lookup = self._get_content_lookup()
+            songs_by_playlist = self._playlist_song_cache.get()
             orphaned_refs: List[Dict[str, str]] = []
-            for p in all_playlists:
-                try:
-                    songs = list(self.db.get_playlist_songs(PlaylistID=p.ID))
-                    for s in songs:
-                        if (
-                            not getattr(s, "rb_local_deleted", 0)
-                            and s.ContentID not in active_ids
-                        ):
-                            orphaned_refs.append(
-                                {
-                                    "playlist_id": str(p.ID),
-                                    "playlist_name": p.Name or "",
-                                    "content_id": str(s.ContentID),
-                                    "song_id": str(s.ID),
-                                }
-                            )
-                except Exception as e:
-                    logger.debug(f"Error scanning playlist {p.Name}: {e}")
+            for p in self._playlist_cache.get():
+                for s in songs_by_playlist.get(str(p.ID), []):
+                    if str(s.ContentID) not in content_lookup:
+                        orphaned_refs.append(
+                            {
+                                "playlist_id": str(p.ID),
+                                "playlist_name": p.Name or "",
+                                "content_id": str(s.ContentID),
+                                "song_id": str(s.ID),
+                            }
+                        )
 
             return {
                 "empty_path": empty_path,
@@ -1205,7 +2460,44 @@ class RekordboxDatabase:
                 },
             }
 
-        return await asyncio.to_thread(_inner)
+        return await self._run(_inner)
+
+    async def find_duplicate_tracks(
+        self,
+        length_tolerance: int = DEFAULT_LENGTH_TOLERANCE,
+        match_file_size: bool = False,
+        limit: int = 100,
+    ) -> Dict[str, Any]:
+        """Find clusters of likely duplicate tracks, each with a suggested keeper."""
+        if not self.db:
+            raise RuntimeError("Database not connected")
+        if length_tolerance < 0:
+            raise ValueError("length_tolerance must not be negative")
+
+        def _inner():
+            clusters = self._get_duplicate_blocks().clusters(
+                length_tolerance, match_file_size
+            )
+            report = []
+            for cluster in clusters[:limit]:
+                keeper = choose_keeper(cluster)
+                report.append(
+                    {
+                        "keeper": keeper.id,
+                        "remove": [row.id for row in cluster if row is not keeper],
+                        "tracks": [row.as_dict(_DUPLICATE_FIELDS) for row in cluster],
+                    }
+                )
+            return {
+                "clusters": report,
+                "summary": {
+                    "cluster_count": len(clusters),
+                    "duplicate_track_count": sum(len(c) - 1 for c in clusters),
+                    "returned": len(report),
+                },
+            }
+
+        return await self._run(_inner)
 
     async def remove_orphaned_playlist_entries(self) -> Dict[str, Any]:
         """Remove PlaylistSong rows that reference soft-deleted content."""
@@ -1242,17 +2534,15 @@ class RekordboxDatabase:
                     logger.warning(f"Error cleaning playlist {p.Name}: {e}")
 
             self.db.commit()
-            self._invalidate_content_cache()
+            self._invalidate_playlist_caches(songs_only=True)
 
             logger.info(f"Removed {len(removed)} orphaned playlist entries")
             return {"removed_count": len(removed), "details": removed}
 
         try:
-            return await asyncio.to_thread(_inner)
+            return await self._run(_inner, rollback=True)
         except Exception as e:
             logger.error(f"Failed to remove orphaned entries: {e}")
-            if self.db and hasattr(self.db, "rollback"):
-                self.db.rollback()
             raise RuntimeError(f"Failed to remove orphaned entries: {str(e)}")
 
     async def remove_tracks_by_ids(self, track_ids: List[str]) -> Dict[str, Any]:
@@ -1300,77 +2590,25 @@ class RekordboxDatabase:
                 )
 
             self.db.commit()
-            self._invalidate_content_cache()
+            removed_ids = {r["id"] for r in removed}
+            self._content_cache.patch(
+                lambda content: [c for c in content if str(c.ID) not in removed_ids]
+            )
+            for track_id in removed_ids:
+                self._track_payloads.discard(track_id)
+            self._invalidate_playlist_caches(songs_only=True)
 
             logger.info(f"Removed {len(removed)} tracks, {len(not_found)} not found")
             return {"removed": removed, "not_found": not_found}
 
         try:
-            return await asyncio.to_thread(_inner)
+            return await self._run(_inner, rollback=True)
         except Exception as e:
             logger.error(f"Failed to remove tracks: {e}")
-            if self.db and hasattr(self.db, "rollback"):
-                self.db.rollback()
             raise RuntimeError(f"Failed to remove tracks: {str(e)}")
 
     # --- Field mapping ---
 
     def _content_to_track(self, content) -> Track:
         """Convert pyrekordbox content object to our Track model."""
-        bpm_value = getattr(content, "BPM", 0) or 0
-        bpm_float = float(bpm_value) / 100.0 if bpm_value else 0.0
-
-        artist_name = ""
-        if hasattr(content, "ArtistName"):
-            artist_name = content.ArtistName or ""
-        elif hasattr(content, "Artist"):
-            artist_obj = content.Artist
-            artist_name = (
-                artist_obj.Name
-                if hasattr(artist_obj, "Name")
-                else str(artist_obj or "")
-            )
-
-        key_name = ""
-        if hasattr(content, "KeyName"):
-            key_name = content.KeyName or ""
-        elif hasattr(content, "Key"):
-            key_obj = content.Key
-            key_name = key_obj.Name if hasattr(key_obj, "Name") else str(key_obj or "")
-
-        album_name = ""
-        if hasattr(content, "AlbumName"):
-            album_name = content.AlbumName or ""
-        elif hasattr(content, "Album"):
-            album_obj = content.Album
-            album_name = (
-                album_obj.Name if hasattr(album_obj, "Name") else str(album_obj or "")
-            )
-
-        genre_name = ""
-        if hasattr(content, "GenreName"):
-            genre_name = content.GenreName or ""
-        elif hasattr(content, "Genre"):
-            genre_obj = content.Genre
-            genre_name = (
-                genre_obj.Name if hasattr(genre_obj, "Name") else str(genre_obj or "")
-            )
-
-        return Track(
-            id=str(content.ID),
-            title=content.Title or "",
-            artist=artist_name,
-            album=album_name,
-            genre=genre_name,
-            bpm=bpm_float,
-            key=key_name,
-            rating=int(getattr(content, "Rating", 0) or 0),
-            play_count=int(getattr(content, "DJPlayCount", 0) or 0),
-            length=int(getattr(content, "Length", 0) or 0),
-            file_path=getattr(content, "FolderPath", "") or "",
-            date_added=getattr(content, "DateCreated", "") or "",
-            date_modified=getattr(content, "StockDate", "") or "",
-            bitrate=int(getattr(content, "BitRate", 0) or 0),
-            sample_rate=int(getattr(content, "SampleRate", 0) or 0),
-            comments=getattr(content, "Commnt", "") or "",
-        )
+        return TrackRow.from_content(content).to_track()
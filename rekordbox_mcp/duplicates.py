@@ -0,0 +1,130 @@
+"""
+Duplicate Detection
+
+Blocking instead of pairwise comparison: every track is keyed once by its
+normalised title and artist, and only tracks sharing a key are compared.
+Within a block, tracks sorted by length are split wherever the gap between
+neighbours exceeds the tolerance, so a scan is one hash pass plus a sort per
+block.
+"""
+
+from typing import Dict, List, Sequence, Tuple
+
+from .fuzzy import normalise
+from .rows import TrackRow
+
+DEFAULT_LENGTH_TOLERANCE = 2
+
+# Tokens introducing featured artists; they and what follows are dropped
+_FEATURING = {"feat", "ft", "featuring"}
+# Title suffixes that do not distinguish versions
+_NOISE_SUFFIXES = (("original", "mix"), ("original",), ("remastered",), ("remaster",))
+_SUFFIX_ENDS = {suffix[-1] for suffix in _NOISE_SUFFIXES}
+# Artist separators, so "A & B", "A and B" and "B, A" block together
+_ARTIST_NOISE = _FEATURING | {"and", "x", "vs"}
+
+
+def title_key(title: str) -> str:
+    """Title reduced to the words that identify a recording."""
+    tokens = normalise(title)
+    if not _FEATURING.isdisjoint(tokens):
+        tokens = tokens[: min(tokens.index(t) for t in _FEATURING if t in tokens)]
+    if tokens and tokens[-1] in _SUFFIX_ENDS:
+        for suffix in _NOISE_SUFFIXES:
+            if len(tokens) > len(suffix) and tuple(tokens[-len(suffix) :]) == suffix:
+                tokens = tokens[: -len(suffix)]
+                break
+    return " ".join(tokens)
+
+
+def artist_key(artist: str) -> str:
+    """Artist names as a sorted word set, ignoring separators."""
+    return " ".join(sorted(set(normalise(artist)) - _ARTIST_NOISE))
+
+
+class DuplicateBlocks:
+    """Row positions grouped by (title key, artist key), for one snapshot.
+
+    Only blocks holding two or more tracks are kept; tracks with an empty
+    title are never blocked.
+    """
+
+    def __init__(self, rows: List[TrackRow]):
+        self.rows = rows
+        blocks: Dict[Tuple[str, str], List[int]] = {}
+        # Artists repeat across a library; normalise each name once
+        artists: Dict[str, str] = {}
+        for position, row in enumerate(rows):
+            title = title_key(row.title)
+            if not title:
+                continue
+            artist = artists.get(row.artist)
+            if artist is None:
+                artist = artists[row.artist] = artist_key(row.artist)
+            blocks.setdefault((title, artist), []).append(position)
+        self.blocks = [block for block in blocks.values() if len(block) > 1]
+
+    def clusters(
+        self,
+        length_tolerance: int = DEFAULT_LENGTH_TOLERANCE,
+        match_file_size: bool = False,
+    ) -> List[List[TrackRow]]:
+        """Groups of likely duplicates, largest first.
+
+        Tracks in a cluster share a block and chain together with length
+        gaps of at most ``length_tolerance`` seconds; tracks of unknown
+        length only match each other. With ``match_file_size`` they must
+        also have the same, known, file size.
+        """
+        rows = self.rows
+        clusters: List[List[TrackRow]] = []
+        for block in self.blocks:
+            members = [rows[position] for position in block]
+            if match_file_size:
+                by_size: Dict[int, List[TrackRow]] = {}
+                for row in members:
+                    if row.file_size:
+                        by_size.setdefault(row.file_size, []).append(row)
+                groups = list(by_size.values())
+            else:
+                groups = [members]
+            for group in groups:
+                clusters.extend(_split_by_length(group, length_tolerance))
+        clusters.sort(key=lambda cluster: (-len(cluster), cluster[0].id))
+        return clusters
+
+
+def _split_by_length(rows: List[TrackRow], tolerance: int) -> List[List[TrackRow]]:
+    ordered = sorted(rows, key=lambda row: (row.length, row.id))
+    clusters: List[List[TrackRow]] = []
+    current: List[TrackRow] = []
+    for row in ordered:
+        if current and (
+            (row.length == 0) != (current[-1].length == 0)
+            or row.length - current[-1].length > tolerance
+        ):
+            if len(current) > 1:
+                clusters.append(current)
+            current = []
+        current.append(row)
+    if len(current) > 1:
+        clusters.append(current)
+    return clusters
+
+
+def choose_keeper(cluster: Sequence[TrackRow]) -> TrackRow:
+    """The copy to keep: a local file first, then the highest bitrate, most
+    plays and best rating, then the earliest added."""
+
+    def rank(row: TrackRow):
+        local = bool(row.file_path) and not row.file_path.startswith("apple-music:")
+        return (
+            not local,
+            -row.bitrate,
+            -row.play_count,
+            -row.rating,
+            row.date_added or "~",
+            row.id,
+        )
+
+    return min(cluster, key=rank)
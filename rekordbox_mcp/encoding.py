@@ -0,0 +1,64 @@
+"""
+Response Encoding
+
+Compact columnar encoding for large track lists: one array per field instead
+of one object per row, with low-cardinality strings dictionary-encoded.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence
+
+RESPONSE_FORMATS = ("rows", "columnar")
+
+# Repeated string fields stored as indexes into a per-response dictionary
+DICTIONARY_FIELDS = frozenset({"artist", "album", "genre", "key", "history_id"})
+
+
+def check_format(format: str) -> str:
+    """Validate a response format name."""
+    if format not in RESPONSE_FORMATS:
+        raise ValueError(
+            f"Unknown format {format!r}. Available: {', '.join(RESPONSE_FORMATS)}"
+        )
+    return format
+
+
+def encode_columnar(
+    items: Sequence[Dict[str, Any]], fields: Optional[Sequence[str]] = None
+) -> Dict[str, Any]:
+    """Encode a list of flat dicts as columns.
+
+    ``fields`` fixes the column order; by default the keys of the first item
+    are used. Columns named in ``DICTIONARY_FIELDS`` hold integer codes into
+    ``dictionaries[field]``.
+    """
+    if fields is None:
+        fields = list(items[0]) if items else []
+
+    columns: Dict[str, List[Any]] = {}
+    dictionaries: Dict[str, List[Any]] = {}
+    for field in fields:
+        values = [item[field] for item in items]
+        if field in DICTIONARY_FIELDS:
+            codes: Dict[Any, int] = {}
+            values = [codes.setdefault(v, len(codes)) for v in values]
+            dictionaries[field] = list(codes)
+        columns[field] = values
+
+    return {
+        "format": "columnar",
+        "count": len(items),
+        "columns": columns,
+        "dictionaries": dictionaries,
+    }
+
+
+def decode_columnar(encoded: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Inverse of ``encode_columnar``."""
+    columns = {}
+    for field, values in encoded["columns"].items():
+        lookup = encoded["dictionaries"].get(field)
+        columns[field] = [lookup[v] for v in values] if lookup is not None else values
+    return [
+        {field: values[i] for field, values in columns.items()}
+        for i in range(encoded["count"])
+    ]
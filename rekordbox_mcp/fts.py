@@ -0,0 +1,145 @@
+"""
+Full-Text Sidecar
+
+An optional, unencrypted local SQLite database with an FTS5 table mirroring
+the searchable text of DjmdContent. It is synced incrementally from the
+content cache (only added, changed or removed rows are written) and answers
+phrase, prefix and boolean queries ranked by BM25.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .rows import related_name
+
+FTS_COLUMNS = ("title", "artist", "album", "genre", "label", "comments", "path")
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS docs (
+    docid INTEGER PRIMARY KEY,
+    content_id TEXT UNIQUE NOT NULL,
+    fingerprint TEXT NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS tracks USING fts5(
+    {", ".join(FTS_COLUMNS)}, tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+
+
+def default_fulltext_path() -> Path:
+    """Sidecar location: $REKORDBOX_MCP_FTS_PATH or the user cache directory."""
+    env_path = os.environ.get("REKORDBOX_MCP_FTS_PATH")
+    if env_path:
+        return Path(env_path)
+    return Path.home() / ".cache" / "rekordbox-mcp" / "fulltext.db"
+
+
+def content_document(content) -> Tuple[str, ...]:
+    """Searchable text of a content row, in ``FTS_COLUMNS`` order."""
+    return (
+        content.Title or "",
+        related_name(content, "ArtistName", "Artist"),
+        related_name(content, "AlbumName", "Album"),
+        related_name(content, "GenreName", "Genre"),
+        related_name(content, "LabelName", "Label"),
+        getattr(content, "Commnt", "") or "",
+        getattr(content, "FolderPath", "") or "",
+    )
+
+
+def _fingerprint(document: Tuple[str, ...]) -> str:
+    # Hash the text itself rather than the content USN: renaming an artist,
+    # album, genre or label changes the document without touching the row
+    return hashlib.sha1("\x1f".join(document).encode()).hexdigest()
+
+
+class FullTextIndex:
+    """FTS5 sidecar database; safe to share between worker threads."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.executescript(_SCHEMA)
+
+    def sync(self, content: Iterable) -> Dict[str, int]:
+        """Bring the index in line with ``content``, writing only differences."""
+        with self._lock, self._conn:
+            indexed = {
+                content_id: (docid, fingerprint)
+                for docid, content_id, fingerprint in self._conn.execute(
+                    "SELECT docid, content_id, fingerprint FROM docs"
+                )
+            }
+            added = updated = 0
+            seen = set()
+            for row in content:
+                content_id = str(row.ID)
+                seen.add(content_id)
+                document = content_document(row)
+                fingerprint = _fingerprint(document)
+                existing = indexed.get(content_id)
+                if existing is None:
+                    cursor = self._conn.execute(
+                        "INSERT INTO docs (content_id, fingerprint) VALUES (?, ?)",
+                        (content_id, fingerprint),
+                    )
+                    self._insert(cursor.lastrowid, document)
+                    added += 1
+                elif existing[1] != fingerprint:
+                    docid = existing[0]
+                    self._conn.execute("DELETE FROM tracks WHERE rowid = ?", (docid,))
+                    self._insert(docid, document)
+                    self._conn.execute(
+                        "UPDATE docs SET fingerprint = ? WHERE docid = ?",
+                        (fingerprint, docid),
+                    )
+                    updated += 1
+
+            removed = [v[0] for k, v in indexed.items() if k not in seen]
+            for docid in removed:
+                self._conn.execute("DELETE FROM tracks WHERE rowid = ?", (docid,))
+                self._conn.execute("DELETE FROM docs WHERE docid = ?", (docid,))
+
+        return {"added": added, "updated": updated, "removed": len(removed)}
+
+    def _insert(self, docid: int, document: Tuple[str, ...]) -> None:
+        placeholders = ", ".join("?" for _ in FTS_COLUMNS)
+        self._conn.execute(
+            f"INSERT INTO tracks (rowid, {', '.join(FTS_COLUMNS)}) "
+            f"VALUES (?, {placeholders})",
+            (docid, *document),
+        )
+
+    def search(
+        self, query: str, limit: Optional[int] = None
+    ) -> List[Tuple[str, float]]:
+        """Content IDs matching an FTS5 query with BM25 scores, best first.
+
+        Scores are negated BM25 values, so higher is better.
+        """
+        sql = (
+            "SELECT d.content_id, bm25(tracks) FROM tracks "
+            "JOIN docs d ON d.docid = tracks.rowid "
+            "WHERE tracks MATCH ? ORDER BY bm25(tracks)"
+        )
+        params: tuple = (query,)
+        if limit is not None:
+            sql += " LIMIT ?"
+            params += (limit,)
+        try:
+            with self._lock:
+                rows = self._conn.execute(sql, params).fetchall()
+        except sqlite3.OperationalError as e:
+            raise ValueError(f"Invalid full-text query {query!r}: {e}")
+        return [(content_id, round(-score, 4)) for content_id, score in rows]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
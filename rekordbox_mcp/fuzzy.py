@@ -0,0 +1,113 @@
+"""
+Fuzzy Track Search
+
+Typo-tolerant matching over title, artist and album tokens using a trigram
+index: each distinct normalised token is indexed once, so a lookup only
+touches the vocabulary entries sharing trigrams with the query.
+"""
+
+import re
+import unicodedata
+from collections import Counter
+from typing import Dict, Iterable, List, Set, Tuple
+
+from .rows import TrackRow
+
+FUZZY_COLUMNS = ("title", "artist", "album")
+
+# Minimum trigram Jaccard similarity for a token, and score for a row
+DEFAULT_THRESHOLD = 0.3
+
+_TOKEN_RE = re.compile(r"[^\W_]+")
+
+
+def normalise(text: str) -> List[str]:
+    """Lowercase, accent-stripped word tokens of ``text``."""
+    if text.isascii():
+        return _TOKEN_RE.findall(text.lower())
+    decomposed = unicodedata.normalize("NFKD", text)
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return _TOKEN_RE.findall(stripped.lower())
+
+
+def trigrams(token: str) -> Set[str]:
+    """Padded character trigrams; padding weights the start of the word."""
+    padded = f"$${token}$"
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class FuzzyIndex:
+    """Trigram index from vocabulary tokens to the rows containing them."""
+
+    def __init__(self, rows: List[TrackRow], columns: Iterable[str] = FUZZY_COLUMNS):
+        self.rows = rows
+        token_ids: Dict[str, int] = {}
+        self._gram_counts: List[int] = []
+        self._token_rows: List[List[int]] = []
+        self._postings: Dict[str, List[int]] = {}
+
+        for pos, row in enumerate(rows):
+            seen: Set[int] = set()
+            for column in columns:
+                for token in normalise(getattr(row, column) or ""):
+                    tid = token_ids.get(token)
+                    if tid is None:
+                        tid = token_ids[token] = len(self._token_rows)
+                        grams = trigrams(token)
+                        self._gram_counts.append(len(grams))
+                        self._token_rows.append([])
+                        for gram in grams:
+                            self._postings.setdefault(gram, []).append(tid)
+                    if tid not in seen:
+                        seen.add(tid)
+                        self._token_rows[tid].append(pos)
+
+    @property
+    def vocabulary_size(self) -> int:
+        return len(self._token_rows)
+
+    def similar_tokens(
+        self, token: str, threshold: float = DEFAULT_THRESHOLD
+    ) -> Dict[int, float]:
+        """Vocabulary token IDs whose trigram Jaccard similarity >= threshold."""
+        grams = trigrams(token)
+        shared: Counter = Counter()
+        for gram in grams:
+            shared.update(self._postings.get(gram, ()))
+
+        similar = {}
+        for tid, common in shared.items():
+            score = common / (len(grams) + self._gram_counts[tid] - common)
+            if score >= threshold:
+                similar[tid] = score
+        return similar
+
+    def search(
+        self, query: str, threshold: float = DEFAULT_THRESHOLD
+    ) -> List[Tuple[int, float]]:
+        """Row positions and scores, best first.
+
+        A row's score is the mean, over query tokens, of the best similarity
+        of any of its tokens; rows scoring below ``threshold`` are dropped.
+        """
+        tokens = normalise(query)
+        if not tokens:
+            return []
+
+        totals: Dict[int, float] = {}
+        for token in tokens:
+            best: Dict[int, float] = {}
+            for tid, score in self.similar_tokens(token, threshold).items():
+                for pos in self._token_rows[tid]:
+                    if score > best.get(pos, 0.0):
+                        best[pos] = score
+            for pos, score in best.items():
+                totals[pos] = totals.get(pos, 0.0) + score
+
+        ranked = [
+            (pos, round(total / len(tokens), 4))
+            for pos, total in totals.items()
+            if total / len(tokens) >= threshold
+        ]
+        ranked.sort(key=lambda item: (-item[1], item[0]))
+        return ranked
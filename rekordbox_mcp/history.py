@@ -0,0 +1,295 @@
+"""
+History Analytics
+
+Play-frequency engine over the DJ history tables. One pass over each
+session's songs yields per-track live-play counts and per-month play and
+session counts; later syncs apply only sessions that were added, changed or
+removed. Genre play counts and durations join the counts with the current
+track rows and are cached until either side changes.
+
+The same incremental sync maintains a sparse transition graph: how often
+each track was played directly after another.
+
+A date-ordered session index turns date filters into binary searches over
+parsed timestamps.
+"""
+
+import threading
+from bisect import bisect_right
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from .rows import TrackRow
+
+TOP_GENRES = 10
+
+
+def session_month(history) -> Optional[str]:
+    """``YYYY-MM`` of a session's creation date, if known."""
+    created = history.DateCreated
+    if not created:
+        return None
+    if hasattr(created, "strftime"):
+        return created.strftime("%Y-%m")
+    return str(created)[:7]
+
+
+def session_datetime(history) -> Optional[datetime]:
+    """Parsed creation time of a session, or None if missing or unparseable."""
+    created = history.DateCreated
+    if not created or isinstance(created, datetime):
+        return created or None
+    try:
+        return datetime.fromisoformat(str(created))
+    except ValueError:
+        return None
+
+
+class SessionIndex:
+    """History sessions ordered by creation time, most recent first.
+
+    Sessions are kept in descending timestamp order (ties in table order), so
+    a date range is two bisections and a slice. Sessions without a parseable
+    date are kept apart and only appear in unfiltered listings, last.
+    """
+
+    def __init__(self, histories: list):
+        dated = []
+        self.undated: List[Any] = []
+        for history in histories:
+            created = session_datetime(history)
+            if created is None:
+                self.undated.append(history)
+            else:
+                dated.append((-created.timestamp(), history))
+        dated.sort(key=lambda entry: entry[0])
+        self._keys = [key for key, _ in dated]
+        self._sessions = [history for _, history in dated]
+
+    def __len__(self) -> int:
+        return len(self._sessions) + len(self.undated)
+
+    def between(
+        self, start: Optional[datetime] = None, end: Optional[datetime] = None
+    ) -> List[Any]:
+        """Sessions created in ``[start, end)``, most recent first."""
+        low = 0 if end is None else bisect_right(self._keys, -end.timestamp())
+        high = (
+            len(self._keys)
+            if start is None
+            else bisect_right(self._keys, -start.timestamp())
+        )
+        return self._sessions[low:high]
+
+    def all(self) -> List[Any]:
+        """Every session, most recent first, undated sessions last."""
+        return self._sessions + self.undated
+
+
+def date_range(
+    since: Optional[str] = None,
+    year: Optional[str] = None,
+    month: Optional[str] = None,
+) -> Tuple[Optional[datetime], Optional[datetime]]:
+    """``[start, end)`` for the session date filters.
+
+    ``since`` is an ISO date; ``month`` only applies together with ``year``.
+    """
+    start: Optional[datetime] = None
+    end: Optional[datetime] = None
+    if since:
+        try:
+            start = datetime.fromisoformat(since)
+        except ValueError:
+            raise ValueError(f"Invalid date {since!r}; expected YYYY-MM-DD")
+    if year:
+        if not (year.isdigit() and len(year) == 4):
+            raise ValueError(f"Invalid year {year!r}; expected YYYY")
+        y = int(year)
+        period_start, period_end = datetime(y, 1, 1), datetime(y + 1, 1, 1)
+        if month:
+            if not (month.isdigit() and 1 <= int(month) <= 12):
+                raise ValueError(f"Invalid month {month!r}; expected 1-12")
+            m = int(month)
+            period_start = datetime(y, m, 1)
+            period_end = datetime(y + m // 12, m % 12 + 1, 1)
+        start = max(start, period_start) if start else period_start
+        end = period_end
+    return start, end
+
+
+class SessionAggregate:
+    """Base for structures folded over history sessions.
+
+    Subclasses turn a session into an entry (``_entry``) and add or subtract
+    an entry's contribution (``_apply``); ``sync`` applies only sessions that
+    were added, changed or removed since the previous sync.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sessions: Dict[str, Any] = {}
+        self.version = 0
+
+    def _entry(self, history, songs: list) -> Any:
+        raise NotImplementedError
+
+    def _apply(self, entry: Any, sign: int) -> None:
+        raise NotImplementedError
+
+    def sync(
+        self, histories: list, songs_by_history: Dict[str, list]
+    ) -> Dict[str, int]:
+        """Apply sessions added, changed or removed since the last sync."""
+        with self._lock:
+            added = updated = 0
+            seen = set()
+            for history in histories:
+                if history.Attribute == 1:
+                    continue
+                session_id = str(history.ID)
+                seen.add(session_id)
+                entry = self._entry(history, songs_by_history.get(session_id, []))
+                old = self._sessions.get(session_id)
+                if old == entry:
+                    continue
+                if old is None:
+                    added += 1
+                else:
+                    self._apply(old, -1)
+                    updated += 1
+                self._apply(entry, 1)
+                self._sessions[session_id] = entry
+
+            removed = [sid for sid in self._sessions if sid not in seen]
+            for session_id in removed:
+                self._apply(self._sessions.pop(session_id), -1)
+
+            if added or updated or removed:
+                self.version += 1
+        return {"added": added, "updated": updated, "removed": len(removed)}
+
+
+def _bump(counter: Counter, key: Hashable, amount: int) -> None:
+    """Add to a counter, dropping keys that fall to zero."""
+    counter[key] += amount
+    if counter[key] <= 0:
+        del counter[key]
+
+
+class PlayFrequency(SessionAggregate):
+    """Incrementally maintained play counts over history sessions.
+
+    A session's entry is its month and the content IDs played.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.track_plays: Counter = Counter()
+        self.month_plays: Counter = Counter()
+        self.month_sessions: Counter = Counter()
+        self._summary: Optional[Tuple[Hashable, Dict[str, Any]]] = None
+
+    def _entry(self, history, songs: list) -> Tuple[Optional[str], Tuple[str, ...]]:
+        return session_month(history), tuple(str(song.ContentID) for song in songs)
+
+    def _apply(self, entry: Tuple[Optional[str], Tuple[str, ...]], sign: int) -> None:
+        month, content_ids = entry
+        for content_id in content_ids:
+            _bump(self.track_plays, content_id, sign)
+        if month:
+            _bump(self.month_plays, month, sign * len(content_ids))
+            _bump(self.month_sessions, month, sign)
+
+    def summary(
+        self, rows_by_id: Dict[str, TrackRow], rows_version: Hashable
+    ) -> Dict[str, Any]:
+        """``HistoryStats`` fields, cached per (plays, rows) version pair."""
+        with self._lock:
+            key = (self.version, rows_version)
+            if self._summary is not None and self._summary[0] == key:
+                return self._summary[1]
+
+            genre_plays: Counter = Counter()
+            total_seconds = 0
+            for content_id, plays in self.track_plays.items():
+                row = rows_by_id.get(content_id)
+                if row is None:
+                    continue
+                genre_plays[row.genre or "Unknown"] += plays
+                total_seconds += plays * row.length
+
+            most_played_track = None
+            for content_id, plays in self.track_plays.most_common():
+                row = rows_by_id.get(content_id)
+                if row is not None:
+                    most_played_track = {
+                        "id": content_id,
+                        "title": row.title,
+                        "artist": row.artist,
+                        "genre": row.genre,
+                        "play_count": plays,
+                    }
+                    break
+
+            total_sessions = len(self._sessions)
+            total_minutes = total_seconds / 60
+            summary = {
+                "total_sessions": total_sessions,
+                "total_tracks_played": sum(self.track_plays.values()),
+                "total_hours_played": round(total_minutes / 60, 1),
+                "avg_session_length": (
+                    round(total_minutes / total_sessions, 1) if total_sessions else 0.0
+                ),
+                "most_played_track": most_played_track,
+                "favorite_genres": [
+                    {"genre": genre, "play_count": plays}
+                    for genre, plays in genre_plays.most_common(TOP_GENRES)
+                ],
+                "sessions_by_month": dict(sorted(self.month_sessions.items())),
+                "plays_by_month": dict(sorted(self.month_plays.items())),
+            }
+            self._summary = (key, summary)
+            return summary
+
+
+class TransitionGraph(SessionAggregate):
+    """Sparse track -> next-track transition counts mined from history.
+
+    A session's entry is its content IDs in play order; each consecutive
+    pair of different tracks is one transition. Both directions are indexed
+    so either neighbourhood is read in O(degree).
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.outgoing: Dict[str, Counter] = {}
+        self.incoming: Dict[str, Counter] = {}
+        self.total_transitions = 0
+
+    def _entry(self, history, songs: list) -> Tuple[str, ...]:
+        return tuple(str(song.ContentID) for song in songs)
+
+    def _apply(self, entry: Tuple[str, ...], sign: int) -> None:
+        for source, target in zip(entry, entry[1:]):
+            if source == target:
+                continue
+            self.total_transitions += sign
+            for edges, a, b in (
+                (self.outgoing, source, target),
+                (self.incoming, target, source),
+            ):
+                neighbours = edges.setdefault(a, Counter())
+                _bump(neighbours, b, sign)
+                if not neighbours:
+                    del edges[a]
+
+    def neighbours(
+        self, track_id: str, direction: str = "next"
+    ) -> List[Tuple[str, int]]:
+        """``(track_id, count)`` mixed after (``next``) or before
+        (``previous``) a track, most frequent first."""
+        edges = self.outgoing if direction == "next" else self.incoming
+        with self._lock:
+            return edges.get(track_id, Counter()).most_common()
@@ -0,0 +1,81 @@
+"""
+Musical Keys
+
+Parsing of rekordbox key names into Camelot wheel positions, for harmonic
+comparisons between tracks. Both Camelot ("8A") and classical ("Am", "F#",
+"Dbm") names are understood.
+"""
+
+import re
+from typing import Optional, Tuple
+
+# Camelot position -> classical names (minor keys are "A", major keys "B")
+_CAMELOT_NAMES = {
+    (1, "A"): ("Abm", "G#m"),
+    (2, "A"): ("Ebm", "D#m"),
+    (3, "A"): ("Bbm", "A#m"),
+    (4, "A"): ("Fm",),
+    (5, "A"): ("Cm",),
+    (6, "A"): ("Gm",),
+    (7, "A"): ("Dm",),
+    (8, "A"): ("Am",),
+    (9, "A"): ("Em",),
+    (10, "A"): ("Bm",),
+    (11, "A"): ("F#m", "Gbm"),
+    (12, "A"): ("C#m", "Dbm"),
+    (1, "B"): ("B", "Cb"),
+    (2, "B"): ("F#", "Gb"),
+    (3, "B"): ("Db", "C#"),
+    (4, "B"): ("Ab", "G#"),
+    (5, "B"): ("Eb", "D#"),
+    (6, "B"): ("Bb", "A#"),
+    (7, "B"): ("F",),
+    (8, "B"): ("C",),
+    (9, "B"): ("G",),
+    (10, "B"): ("D",),
+    (11, "B"): ("A",),
+    (12, "B"): ("E",),
+}
+_CLASSICAL = {
+    name.lower(): position
+    for position, names in _CAMELOT_NAMES.items()
+    for name in names
+}
+_CAMELOT_RE = re.compile(r"^(1[0-2]|0?[1-9])\s*([ab])$")
+_SUFFIXES = (("minor", "m"), ("min", "m"), ("major", ""), ("maj", ""))
+
+
+def camelot(key: str) -> Optional[Tuple[int, str]]:
+    """Camelot ``(number, letter)`` of a key name, or None if unrecognised."""
+    name = (key or "").strip().lower().replace("♯", "#").replace("♭", "b")
+    if not name:
+        return None
+    match = _CAMELOT_RE.match(name)
+    if match:
+        return int(match.group(1)), match.group(2).upper()
+    name = name.replace(" ", "")
+    for suffix, replacement in _SUFFIXES:
+        if name.endswith(suffix):
+            name = name[: -len(suffix)] + replacement
+            break
+    return _CLASSICAL.get(name)
+
+
+def camelot_name(key: str) -> Optional[str]:
+    """Camelot notation ("8A") of a key name, or None if unrecognised."""
+    position = camelot(key)
+    return f"{position[0]}{position[1]}" if position else None
+
+
+def key_distance(a: str, b: str) -> Optional[int]:
+    """Steps between two keys on the Camelot wheel.
+
+    Moving one position around the wheel or switching between the relative
+    major and minor (A <-> B) is one step; 0 and 1 are the classic harmonic
+    mixes. None if either key is unrecognised.
+    """
+    pa, pb = camelot(a), camelot(b)
+    if pa is None or pb is None:
+        return None
+    around = abs(pa[0] - pb[0]) % 12
+    return min(around, 12 - around) + (pa[1] != pb[1])
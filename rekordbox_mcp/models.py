@@ -143,6 +143,9 @@ class HistoryStats(BaseModel):
     sessions_by_month: Dict[str, int] = Field(
         default_factory=dict, description="Sessions grouped by month"
     )
+    plays_by_month: Dict[str, int] = Field(
+        default_factory=dict, description="Tracks played grouped by month"
+    )
     avg_session_length: float = Field(
         0.0, ge=0, description="Average session length in minutes"
     )
@@ -165,6 +168,26 @@ class SearchOptions(BaseModel):
     rating_max: Optional[int] = Field(None, ge=0, le=5, description="Maximum rating")
     play_count_min: Optional[int] = Field(None, ge=0, description="Minimum play count")
     play_count_max: Optional[int] = Field(None, ge=0, description="Maximum play count")
+    year_min: Optional[int] = Field(None, ge=0, description="Minimum release year")
+    year_max: Optional[int] = Field(None, ge=0, description="Maximum release year")
+    length_min: Optional[int] = Field(
+        None, ge=0, description="Minimum track length in seconds"
+    )
+    length_max: Optional[int] = Field(
+        None, ge=0, description="Maximum track length in seconds"
+    )
+    bitrate_min: Optional[int] = Field(
+        None, ge=0, description="Minimum bitrate in kbps"
+    )
+    bitrate_max: Optional[int] = Field(
+        None, ge=0, description="Maximum bitrate in kbps"
+    )
+    date_added_from: Optional[str] = Field(
+        None, description="Earliest date added (YYYY-MM-DD, inclusive)"
+    )
+    date_added_to: Optional[str] = Field(
+        None, description="Latest date added (YYYY-MM-DD, inclusive)"
+    )
     limit: int = Field(50, ge=1, le=1000, description="Maximum number of results")
 
     @field_validator("bpm_max")
@@ -183,6 +206,20 @@ class SearchOptions(BaseModel):
             raise ValueError("rating_max must be greater than rating_min")
         return v
 
+    @field_validator(
+        "play_count_max", "year_max", "length_max", "bitrate_max", "date_added_to"
+    )
+    @classmethod
+    def validate_ranges(cls, v, info):
+        """Ensure range maxima are not below their minima."""
+        prefix = info.field_name.rsplit("_", 1)[0]
+        low = info.data.get(
+            f"{prefix}_from" if prefix == "date_added" else f"{prefix}_min"
+        )
+        if v is not None and low is not None and v < low:
+            raise ValueError(f"{info.field_name} must not be below its minimum")
+        return v
+
 
 class LibraryStats(BaseModel):
     """
@@ -0,0 +1,71 @@
+"""
+Cursor Pagination
+
+Opaque, cache-version-bound cursors and a small LRU of computed result sets,
+so clients can page through large listings at constant per-page cost.
+"""
+
+import base64
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+class CursorError(ValueError):
+    """Raised for malformed cursors or cursors from an outdated snapshot."""
+
+
+def encode_cursor(state: Dict[str, Any]) -> str:
+    """Encode cursor state as an opaque URL-safe token."""
+    raw = json.dumps(state, separators=(",", ":"), sort_keys=True).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """Decode a token produced by ``encode_cursor``."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        state = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except Exception:
+        raise CursorError("Invalid cursor")
+    if not isinstance(state, dict) or not {"s", "p", "v", "o", "n"} <= state.keys():
+        raise CursorError("Invalid cursor")
+    return state
+
+
+def params_key(source: str, params: Dict[str, Any]) -> str:
+    """Stable digest identifying a listing and its parameters."""
+    raw = json.dumps([source, params], sort_keys=True, default=str)
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+class ResultSetCache:
+    """Bounded LRU of ordered result keys, one entry per (query, version)."""
+
+    def __init__(self, maxsize: int = 32):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, List[Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[List[Any]]:
+        with self._lock:
+            keys = self._entries.get(key)
+            if keys is not None:
+                self._entries.move_to_end(key)
+            return keys
+
+    def put(self, key: Hashable, keys: List[Any]) -> None:
+        with self._lock:
+            self._entries[key] = keys
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
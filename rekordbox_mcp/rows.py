@@ -0,0 +1,119 @@
+"""
+Track Rows
+
+Compact, unvalidated track records used on internal hot paths. Rows are built
+once per cached content row; pydantic ``Track`` models are only created for
+the rows a tool actually returns.
+"""
+
+from typing import Any, Dict, Iterable, Optional
+
+from .models import Track
+
+TRACK_FIELDS = tuple(Track.model_fields)
+
+
+def related_name(content: Any, column: str, relation: str) -> str:
+    """Read a denormalised name column, falling back to the related row's Name."""
+    if hasattr(content, column):
+        return getattr(content, column) or ""
+    if hasattr(content, relation):
+        obj = getattr(content, relation)
+        return obj.Name if hasattr(obj, "Name") else str(obj or "")
+    return ""
+
+
+class TrackRow:
+    """Slotted track record with the same fields as ``Track``.
+
+    Internal columns are kept alongside: ``year`` (release year, 0 when
+    unknown) for searching, ``file_size`` in bytes (0 when unknown) and
+    ``label`` for library analytics, and ``usn``, the content row's update
+    sequence number, used to tell whether anything derived from the row is
+    current.
+    """
+
+    __slots__ = (
+        "id",
+        "title",
+        "artist",
+        "album",
+        "genre",
+        "bpm",
+        "key",
+        "rating",
+        "play_count",
+        "length",
+        "file_path",
+        "date_added",
+        "date_modified",
+        "bitrate",
+        "sample_rate",
+        "color",
+        "comments",
+        "year",
+        "file_size",
+        "label",
+        "usn",
+    )
+
+    id: str
+    title: str
+    artist: str
+    album: str
+    genre: str
+    bpm: float
+    key: str
+    rating: int
+    play_count: int
+    length: int
+    file_path: str
+    date_added: str
+    date_modified: str
+    bitrate: int
+    sample_rate: int
+    color: Optional[str]
+    comments: str
+    year: int
+    file_size: int
+    label: str
+    usn: Optional[int]
+
+    @classmethod
+    def from_content(cls, content: Any) -> "TrackRow":
+        """Extract a row from a pyrekordbox content object."""
+        row = cls.__new__(cls)
+        bpm_value = getattr(content, "BPM", 0) or 0
+        row.id = str(content.ID)
+        row.title = content.Title or ""
+        row.artist = related_name(content, "ArtistName", "Artist")
+        row.album = related_name(content, "AlbumName", "Album")
+        row.genre = related_name(content, "GenreName", "Genre")
+        row.bpm = float(bpm_value) / 100.0 if bpm_value else 0.0
+        row.key = related_name(content, "KeyName", "Key")
+        row.rating = int(getattr(content, "Rating", 0) or 0)
+        row.play_count = int(getattr(content, "DJPlayCount", 0) or 0)
+        row.length = int(getattr(content, "Length", 0) or 0)
+        row.file_path = getattr(content, "FolderPath", "") or ""
+        row.date_added = getattr(content, "DateCreated", "") or ""
+        row.date_modified = getattr(content, "StockDate", "") or ""
+        row.bitrate = int(getattr(content, "BitRate", 0) or 0)
+        row.sample_rate = int(getattr(content, "SampleRate", 0) or 0)
+        row.color = None
+        row.comments = getattr(content, "Commnt", "") or ""
+        row.year = int(getattr(content, "ReleaseYear", 0) or 0)
+        row.file_size = int(getattr(content, "FileSize", 0) or 0)
+        row.label = related_name(content, "LabelName", "Label")
+        row.usn = getattr(content, "rb_local_usn", None)
+        return row
+
+    def as_dict(self, fields: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """Plain dict of the given fields (all fields by default)."""
+        return {f: getattr(self, f) for f in (fields or TRACK_FIELDS)}
+
+    def to_track(self) -> Track:
+        """Validate this row into a ``Track`` model."""
+        return Track(**self.as_dict())
+
+    def __repr__(self) -> str:
+        return f"TrackRow(id={self.id!r}, title={self.title!r})"
@@ -0,0 +1,329 @@
+"""
+Track Search Planner
+
+Secondary indexes over a snapshot of TrackRows and a small planner that
+evaluates ``SearchOptions`` predicates most-selective-first: it starts from
+the smallest indexed candidate set, intersects further indexed predicates
+while that is cheaper than testing rows, and scans only for predicates
+without an index.
+"""
+
+from bisect import bisect_left, bisect_right
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from .models import SearchOptions
+from .rows import TrackRow
+
+# Intersect another index only while its candidate set is at most this many
+# times larger than the current one; beyond that, testing rows is cheaper.
+INTERSECT_RATIO = 4
+
+
+class SearchIndex:
+    """Secondary indexes for one snapshot of track rows.
+
+    Bucket sizes and sorted-column spans double as exact selectivity
+    statistics for the planner.
+    """
+
+    def __init__(self, rows: List[TrackRow]):
+        self.rows = rows
+        self._buckets: Dict[str, Dict[Any, List[int]]] = {}
+        self._sorted: Dict[str, tuple] = {}
+
+    def buckets(self, column: str) -> Dict[Any, List[int]]:
+        """Row positions grouped by exact ``column`` value (built on demand)."""
+        buckets = self._buckets.get(column)
+        if buckets is None:
+            buckets = {}
+            for pos, row in enumerate(self.rows):
+                buckets.setdefault(getattr(row, column), []).append(pos)
+            self._buckets[column] = buckets
+        return buckets
+
+    def sorted_column(self, column: str) -> tuple:
+        """``(values, positions)`` of ``column`` in ascending value order."""
+        entry = self._sorted.get(column)
+        if entry is None:
+            order = sorted(
+                range(len(self.rows)), key=lambda pos: getattr(self.rows[pos], column)
+            )
+            values = [getattr(self.rows[pos], column) for pos in order]
+            entry = (values, order)
+            self._sorted[column] = entry
+        return entry
+
+
+class Predicate:
+    """One search condition; indexed predicates can produce candidate sets."""
+
+    indexed = False
+
+    def __init__(self, label: str):
+        self.label = label
+
+    def estimate(self, index: SearchIndex) -> int:
+        """Upper bound on matching rows."""
+        return len(index.rows)
+
+    def candidates(self, index: SearchIndex) -> Set[int]:
+        raise NotImplementedError
+
+    def test(self, row: TrackRow) -> bool:
+        raise NotImplementedError
+
+
+class Scan(Predicate):
+    """Predicate without an index, evaluated row by row."""
+
+    def __init__(self, label: str, test: Callable[[TrackRow], bool]):
+        super().__init__(label)
+        self.test = test
+
+
+class Equals(Predicate):
+    """Exact match on a bucketed column."""
+
+    indexed = True
+
+    def __init__(self, column: str, value: Any):
+        super().__init__(f"{column} = {value!r}")
+        self.column = column
+        self.value = value
+
+    def estimate(self, index: SearchIndex) -> int:
+        return len(index.buckets(self.column).get(self.value, ()))
+
+    def candidates(self, index: SearchIndex) -> Set[int]:
+        return set(index.buckets(self.column).get(self.value, ()))
+
+    def test(self, row: TrackRow) -> bool:
+        return getattr(row, self.column) == self.value
+
+
+class Contains(Predicate):
+    """Case-insensitive substring match on a low-cardinality column.
+
+    Candidates are the union of the buckets of every distinct value that
+    contains the needle, so only distinct values are scanned.
+    """
+
+    indexed = True
+
+    def __init__(self, column: str, needle: str):
+        super().__init__(f"{column} contains {needle!r}")
+        self.column = column
+        self.needle = needle.lower()
+        self._matching: Optional[List[List[int]]] = None
+
+    def _buckets(self, index: SearchIndex) -> List[List[int]]:
+        if self._matching is None:
+            self._matching = [
+                positions
+                for value, positions in index.buckets(self.column).items()
+                if self.needle in value.lower()
+            ]
+        return self._matching
+
+    def estimate(self, index: SearchIndex) -> int:
+        return sum(len(positions) for positions in self._buckets(index))
+
+    def candidates(self, index: SearchIndex) -> Set[int]:
+        return {pos for positions in self._buckets(index) for pos in positions}
+
+    def test(self, row: TrackRow) -> bool:
+        return self.needle in getattr(row, self.column).lower()
+
+
+class Range(Predicate):
+    """Inclusive range on a sorted column; either bound may be None."""
+
+    indexed = True
+
+    def __init__(self, column: str, low: Any = None, high: Any = None):
+        if low is not None and high is not None:
+            label = f"{column} in [{low}, {high}]"
+        elif low is not None:
+            label = f"{column} >= {low}"
+        else:
+            label = f"{column} <= {high}"
+        super().__init__(label)
+        self.column = column
+        self.low = low
+        self.high = high
+
+    def _span(self, index: SearchIndex) -> tuple:
+        values, _ = index.sorted_column(self.column)
+        start = 0 if self.low is None else bisect_left(values, self.low)
+        end = len(values) if self.high is None else bisect_right(values, self.high)
+        return start, max(start, end)
+
+    def estimate(self, index: SearchIndex) -> int:
+        start, end = self._span(index)
+        return end - start
+
+    def candidates(self, index: SearchIndex) -> Set[int]:
+        start, end = self._span(index)
+        return set(index.sorted_column(self.column)[1][start:end])
+
+    def test(self, row: TrackRow) -> bool:
+        value = getattr(row, self.column)
+        if self.low is not None and value < self.low:
+            return False
+        if self.high is not None and value > self.high:
+            return False
+        return True
+
+
+def path_contains(filename: str) -> Predicate:
+    """Case-insensitive substring match on the file path (not indexed)."""
+    needle = filename.lower()
+    return Scan(
+        f"file_path contains {needle!r}", lambda row: needle in row.file_path.lower()
+    )
+
+
+def predicates_from_options(options: SearchOptions) -> List[Predicate]:
+    """Translate search options into predicates (limit is not a predicate)."""
+    predicates: List[Predicate] = []
+
+    if options.query:
+        query = options.query.lower()
+        predicates.append(
+            Scan(
+                f"title/artist/genre contains {query!r}",
+                lambda row: query in row.title.lower()
+                or query in row.artist.lower()
+                or query in row.genre.lower(),
+            )
+        )
+    if options.artist:
+        predicates.append(Contains("artist", options.artist))
+    if options.title:
+        title = options.title.lower()
+        predicates.append(
+            Scan(f"title contains {title!r}", lambda row: title in row.title.lower())
+        )
+    if options.genre:
+        predicates.append(Contains("genre", options.genre))
+    if options.key:
+        predicates.append(Equals("key", options.key))
+    if options.bpm_min or options.bpm_max:
+        predicates.append(
+            Range("bpm", options.bpm_min or None, options.bpm_max or None)
+        )
+    if options.album:
+        predicates.append(Contains("album", options.album))
+    if options.rating_min or options.rating_max is not None:
+        predicates.append(
+            Range("rating", options.rating_min or None, options.rating_max)
+        )
+
+    for column in ("play_count", "length", "bitrate"):
+        low = getattr(options, f"{column}_min")
+        high = getattr(options, f"{column}_max")
+        if low is not None or high is not None:
+            predicates.append(Range(column, low, high))
+
+    # Unknown years (0) and dates ("") sort first; a lower bound excludes them
+    if options.year_min is not None or options.year_max is not None:
+        predicates.append(Range("year", options.year_min or 1, options.year_max))
+    if options.date_added_from or options.date_added_to:
+        predicates.append(
+            Range(
+                "date_added",
+                options.date_added_from or "0",
+                # Inclusive of any time-of-day suffix on the upper date
+                options.date_added_to + "\uffff" if options.date_added_to else None,
+            )
+        )
+
+    return predicates
+
+
+class SearchPlan:
+    """Execution order for a set of predicates against one index."""
+
+    def __init__(self, index: SearchIndex, predicates: List[Predicate]):
+        self.index = index
+        estimates = {id(p): p.estimate(index) for p in predicates if p.indexed}
+        self.indexed = sorted(
+            (p for p in predicates if p.indexed), key=lambda p: estimates[id(p)]
+        )
+        self.estimates = estimates
+        self.scans = [p for p in predicates if not p.indexed]
+        self.steps: List[Dict[str, Any]] = []
+
+    def _access_path(self) -> Tuple[Iterable[int], List[Predicate]]:
+        """Candidate positions in library order, plus predicates left to test.
+
+        Resets and records the index steps of the plan.
+        """
+        self.steps = []
+        filters: List[Predicate] = []
+
+        if self.indexed:
+            first = self.indexed[0]
+            candidates = first.candidates(self.index)
+            self._record(first, "index", len(candidates))
+            for predicate in self.indexed[1:]:
+                estimate = self.estimates[id(predicate)]
+                if estimate <= len(candidates) * INTERSECT_RATIO:
+                    candidates &= predicate.candidates(self.index)
+                    self._record(predicate, "intersect", len(candidates))
+                else:
+                    filters.append(predicate)
+            positions: Iterable[int] = sorted(candidates)
+        else:
+            positions = range(len(self.index.rows))
+
+        filters.extend(self.scans)
+        return positions, filters
+
+    def iter_rows(self) -> Iterator[TrackRow]:
+        """Lazily yield matching rows in library order.
+
+        Rows are only tested as they are consumed, so callers that stop after
+        ``limit`` matches never touch the rest of the candidates.
+        """
+        positions, filters = self._access_path()
+        rows = self.index.rows
+        for pos in positions:
+            row = rows[pos]
+            for predicate in filters:
+                if not predicate.test(row):
+                    break
+            else:
+                yield row
+
+    def execute(self) -> List[TrackRow]:
+        """Evaluate the plan, returning every matching row in library order."""
+        return list(self.iter_rows())
+
+    def count(self) -> int:
+        """Exact number of matches, without collecting them."""
+        return sum(1 for _ in self.iter_rows())
+
+    def _record(self, predicate: Predicate, access: str, remaining: int) -> None:
+        self.steps.append(
+            {
+                "predicate": predicate.label,
+                "access": access,
+                "estimated": self.estimates.get(id(predicate)),
+                "remaining": remaining,
+            }
+        )
+
+    def explain(self) -> Dict[str, Any]:
+        """Executed steps with their estimated and remaining candidate counts."""
+        positions, filters = self._access_path()
+        matched = [self.index.rows[pos] for pos in positions]
+        for predicate in filters:
+            matched = [row for row in matched if predicate.test(row)]
+            self._record(predicate, "filter", len(matched))
+        return {
+            "total_rows": len(self.index.rows),
+            "full_scan": not self.indexed,
+            "steps": self.steps,
+            "matched": len(matched),
+        }
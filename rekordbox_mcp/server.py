@@ -5,8 +5,10 @@ A FastMCP-based server for rekordbox database management with real-time database
 """
 
 import asyncio
+import time
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Union
 
 from fastmcp import FastMCP
 from loguru import logger
@@ -23,13 +25,30 @@ from .models import (
 )
 
 
+@asynccontextmanager
+async def _lifespan(server):
+    """Start connecting and warming caches as soon as the server starts."""
+    start_background_initialization()
+    try:
+        yield {}
+    finally:
+        for task in (_startup_task, _warmup_task):
+            if task is not None:
+                task.cancel()
+
+
 # Initialize FastMCP server
-mcp = FastMCP("Rekordbox Database MCP Server")
+mcp = FastMCP("Rekordbox Database MCP Server", lifespan=_lifespan)
 
 # Global database instance
 db: Optional[RekordboxDatabase] = None
 _db_initialized = False
 
+# Background connection and cache warm-up started with the server
+_startup_task: Optional[asyncio.Task] = None
+_warmup_task: Optional[asyncio.Task] = None
+_startup_status: Dict[str, Any] = {"state": "pending"}
+
 
 class ServerConfig(BaseModel):
     """Server configuration model."""
@@ -50,13 +69,33 @@ async def search_tracks(
     query: str = "",
     artist: Optional[str] = None,
     title: Optional[str] = None,
+    album: Optional[str] = None,
     genre: Optional[str] = None,
     key: Optional[str] = None,
     bpm_min: Optional[float] = None,
     bpm_max: Optional[float] = None,
     rating_min: Optional[int] = None,
+    rating_max: Optional[int] = None,
+    play_count_min: Optional[int] = None,
+    play_count_max: Optional[int] = None,
+    year_min: Optional[int] = None,
+    year_max: Optional[int] = None,
+    length_min: Optional[int] = None,
+    length_max: Optional[int] = None,
+    bitrate_min: Optional[int] = None,
+    bitrate_max: Optional[int] = None,
+    date_added_from: Optional[str] = None,
+    date_added_to: Optional[str] = None,
     limit: int = 50,
-) -> List[Dict[str, Any]]:
+    cursor: Optional[str] = None,
+    page_size: Optional[int] = None,
+    fields: Optional[List[str]] = None,
+    format: Optional[str] = None,
+    explain: bool = False,
+    include_total: bool = False,
+    fuzzy: bool = False,
+    fulltext: bool = False,
+) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
     """
     Search tracks in the rekordbox database.
 
@@ -64,15 +103,42 @@ async def search_tracks(
         query: General search query (searches across multiple fields)
         artist: Filter by artist name
         title: Filter by track title
+        album: Filter by album name
         genre: Filter by genre
         key: Filter by musical key (e.g., "5A", "12B")
         bpm_min: Minimum BPM
         bpm_max: Maximum BPM
         rating_min: Minimum rating (0-5)
-        limit: Maximum number of results to return
+        rating_max: Maximum rating (0-5)
+        play_count_min: Minimum play count
+        play_count_max: Maximum play count (0 for unplayed tracks)
+        year_min: Minimum release year
+        year_max: Maximum release year
+        length_min: Minimum track length in seconds
+        length_max: Maximum track length in seconds
+        bitrate_min: Minimum bitrate in kbps
+        bitrate_max: Maximum bitrate in kbps
+        date_added_from: Earliest date added (YYYY-MM-DD, inclusive)
+        date_added_to: Latest date added (YYYY-MM-DD, inclusive)
+        limit: Maximum number of results to return (ignored when paginating)
+        cursor: Opaque next_cursor from a previous page; its filters take precedence
+        page_size: Page through results with this many items per page (max 1000)
+        fields: Only return these fields per track (e.g. ["id", "title", "bpm"])
+        format: "rows" (default) or "columnar" for one array per field
+        explain: Also report the query plan (index/filter steps and counts)
+        include_total: Also report the exact number of matches beyond limit
+        fuzzy: Typo-tolerant matching of query, ranked by similarity score
+            (other filters still apply; pagination and format are ignored)
+        fulltext: Treat query as a full-text query over title, artist, album,
+            genre, label, comments and path, ranked by relevance. Supports
+            phrases ("deep house"), prefixes (tech*), AND/OR/NOT and column
+            filters (artist:burial). Uses a local index file kept in sync with
+            the library; other filters apply as with fuzzy
 
     Returns:
-        List of matching tracks with metadata
+        List of matching tracks with metadata, or when paginating a page dict
+        with items, next_cursor and total_count. With explain or include_total,
+        a dict with "results" plus "plan" and/or "total_count"
     """
     await ensure_database_connected()
 
@@ -80,16 +146,57 @@ async def search_tracks(
         query=query,
         artist=artist,
         title=title,
+        album=album,
         genre=genre,
         key=key,
         bpm_min=bpm_min,
         bpm_max=bpm_max,
         rating_min=rating_min,
+        rating_max=rating_max,
+        play_count_min=play_count_min,
+        play_count_max=play_count_max,
+        year_min=year_min,
+        year_max=year_max,
+        length_min=length_min,
+        length_max=length_max,
+        bitrate_min=bitrate_min,
+        bitrate_max=bitrate_max,
+        date_added_from=date_added_from,
+        date_added_to=date_added_to,
         limit=limit,
     )
+    if fuzzy and fulltext:
+        raise ValueError("Choose either fuzzy or fulltext search, not both")
+    if fuzzy:
+        return await db.fuzzy_search(search_options, fields=fields)
+    if fulltext:
+        return await db.fulltext_search(search_options, fields=fields)
+
+    params = search_options.model_dump(exclude={"limit"}, exclude_none=True)
+
+    if cursor or page_size:
+        results = await db.get_page(
+            "search",
+            params,
+            cursor=cursor,
+            page_size=page_size,
+            fields=fields,
+            format=format,
+        )
+    else:
+        results = await db.get_listing(
+            "search", params, fields=fields, format=format or "rows", limit=limit
+        )
 
-    tracks = await db.search_tracks(search_options)
-    return [track.model_dump() for track in tracks]
+    if not (explain or include_total):
+        return results
+
+    response: Dict[str, Any] = {"results": results}
+    if include_total:
+        response["total_count"] = await db.count_listing("search", params)
+    if explain:
+        response["plan"] = await db.explain_search(search_options)
+    return response
 
 
 @mcp.tool()
@@ -113,46 +220,159 @@ async def get_track_details(track_id: str) -> Dict[str, Any]:
 
 
 @mcp.tool()
-async def get_tracks_by_key(key: str) -> List[Dict[str, Any]]:
+async def get_tracks_by_key(
+    key: str,
+    cursor: Optional[str] = None,
+    page_size: Optional[int] = None,
+    fields: Optional[List[str]] = None,
+    format: Optional[str] = None,
+) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
     """
     Get all tracks in a specific musical key.
 
     Args:
         key: Musical key (e.g., "5A", "12B")
+        cursor: Opaque next_cursor from a previous page; its filters take precedence
+        page_size: Page through results with this many items per page (max 1000)
+        fields: Only return these fields per track (e.g. ["id", "title", "bpm"])
+        format: "rows" (default) or "columnar" for one array per field
 
     Returns:
-        List of tracks in the specified key
+        List of tracks in the specified key (first 1000 unless paginating), or
+        a page dict with items, next_cursor and total_count
     """
     await ensure_database_connected()
 
-    search_options = SearchOptions(key=key, limit=1000)
-    tracks = await db.search_tracks(search_options)
-    return [track.model_dump() for track in tracks]
+    if cursor or page_size:
+        return await db.get_page(
+            "search",
+            {"key": key},
+            cursor=cursor,
+            page_size=page_size,
+            fields=fields,
+            format=format,
+        )
+
+    return await db.get_listing(
+        "search", {"key": key}, fields=fields, format=format or "rows", limit=1000
+    )
 
 
 @mcp.tool()
 async def get_tracks_by_bpm_range(
-    bpm_min: float, bpm_max: float
-) -> List[Dict[str, Any]]:
+    bpm_min: float,
+    bpm_max: float,
+    cursor: Optional[str] = None,
+    page_size: Optional[int] = None,
+    fields: Optional[List[str]] = None,
+    format: Optional[str] = None,
+) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
     """
     Get tracks within a specific BPM range.
 
     Args:
         bpm_min: Minimum BPM
         bpm_max: Maximum BPM
+        cursor: Opaque next_cursor from a previous page; its filters take precedence
+        page_size: Page through results with this many items per page (max 1000)
+        fields: Only return these fields per track (e.g. ["id", "title", "bpm"])
+        format: "rows" (default) or "columnar" for one array per field
+
+    Returns:
+        List of tracks within the BPM range (first 1000 unless paginating), or
+        a page dict with items, next_cursor and total_count
+    """
+    await ensure_database_connected()
+
+    if cursor or page_size:
+        return await db.get_page(
+            "search",
+            {"bpm_min": bpm_min, "bpm_max": bpm_max},
+            cursor=cursor,
+            page_size=page_size,
+            fields=fields,
+            format=format,
+        )
+
+    return await db.get_listing(
+        "search",
+        {"bpm_min": bpm_min, "bpm_max": bpm_max},
+        fields=fields,
+        format=format or "rows",
+        limit=1000,
+    )
+
+
+@mcp.tool()
+async def suggest_next_tracks(
+    track_id: str,
+    k: int = 10,
+    bpm_range: float = 6.0,
+    max_key_distance: int = 1,
+    genre: Optional[str] = None,
+    fields: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """
+    Suggest tracks to mix into after a given track.
+
+    Candidates are within a tempo window and harmonically compatible on the
+    Camelot wheel, ranked by tempo and key distance with genre, year and
+    rating similarity as tie-breakers.
+
+    Args:
+        track_id: The track currently playing
+        k: Number of suggestions to return
+        bpm_range: Tempo window in percent of the track's BPM (default 6%)
+        max_key_distance: Camelot steps allowed; 0 = same key, 1 = adjacent or
+            relative major/minor (default), 2 = energy boosts and beyond
+        genre: Only suggest tracks whose genre contains this (case-insensitive)
+        fields: Only return these fields per track (e.g. ["id", "title", "bpm"])
 
     Returns:
-        List of tracks within the BPM range
+        The seed track and its suggestions, best first, each with a score
+        (lower is better), bpm_delta and key_distance
     """
     await ensure_database_connected()
 
-    search_options = SearchOptions(bpm_min=bpm_min, bpm_max=bpm_max, limit=1000)
-    tracks = await db.search_tracks(search_options)
-    return [track.model_dump() for track in tracks]
+    return await db.suggest_next_tracks(
+        track_id, k, bpm_range, max_key_distance, genre, fields
+    )
 
 
 @mcp.tool()
-async def get_genre_filepaths(genre: str) -> List[str]:
+async def find_similar_tracks(
+    track_id: str,
+    k: int = 10,
+    genre: Optional[str] = None,
+    exclude_session_id: Optional[str] = None,
+    fields: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """
+    Find the tracks most similar to a track by their metadata.
+
+    Tracks are compared on tempo, key (position on the Camelot wheel), genre,
+    year, label, length and rating.
+
+    Args:
+        track_id: The track to compare against
+        k: Number of similar tracks to return
+        genre: Only return tracks whose genre contains this (case-insensitive)
+        exclude_session_id: Leave out tracks played in this history session
+        fields: Only return these fields per track (e.g. ["id", "title", "bpm"])
+
+    Returns:
+        The track and its nearest neighbours, most similar first, each with a
+        distance (lower is more similar)
+    """
+    await ensure_database_connected()
+
+    return await db.find_similar_tracks(track_id, k, genre, exclude_session_id, fields)
+
+
+@mcp.tool()
+async def get_genre_filepaths(
+    genre: str, cursor: Optional[str] = None, page_size: Optional[int] = None
+) -> Union[List[str], Dict[str, Any]]:
     """
     Get filepaths for all tracks matching a genre.
 
@@ -161,65 +381,132 @@ async def get_genre_filepaths(genre: str) -> List[str]:
 
     Args:
         genre: Genre term to search for (case-insensitive substring match)
+        cursor: Opaque next_cursor from a previous page; its filters take precedence
+        page_size: Page through results with this many items per page (max 1000)
 
     Returns:
-        List of absolute filepaths for matching tracks
+        List of absolute filepaths for matching tracks, or a page dict with
+        items, next_cursor and total_count when paginating
     """
     await ensure_database_connected()
 
+    if cursor or page_size:
+        return await db.get_page(
+            "genre_filepaths", {"genre": genre}, cursor=cursor, page_size=page_size
+        )
+
     filepaths = await db.get_tracks_by_genre(genre)
     return filepaths
 
 
 @mcp.tool()
-async def get_most_played_tracks(limit: int = 20) -> List[Dict[str, Any]]:
+async def get_most_played_tracks(
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    page_size: Optional[int] = None,
+    fields: Optional[List[str]] = None,
+    format: Optional[str] = None,
+) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
     """
     Get the most played tracks in the library.
 
     Args:
-        limit: Maximum number of tracks to return
+        limit: Maximum number of tracks to return (ignored when paginating)
+        cursor: Opaque next_cursor from a previous page; its filters take precedence
+        page_size: Page through results with this many items per page (max 1000)
+        fields: Only return these fields per track (e.g. ["id", "title", "bpm"])
+        format: "rows" (default) or "columnar" for one array per field
 
     Returns:
-        List of most played tracks
+        List of most played tracks, or a page dict with items, next_cursor and
+        total_count when paginating
     """
     await ensure_database_connected()
 
-    tracks = await db.get_most_played_tracks(limit)
-    return [track.model_dump() for track in tracks]
+    if cursor or page_size:
+        return await db.get_page(
+            "most_played",
+            cursor=cursor,
+            page_size=page_size,
+            fields=fields,
+            format=format,
+        )
+
+    return await db.get_listing(
+        "most_played", None, fields=fields, format=format or "rows", limit=limit
+    )
 
 
 @mcp.tool()
-async def get_top_rated_tracks(limit: int = 20) -> List[Dict[str, Any]]:
+async def get_top_rated_tracks(
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    page_size: Optional[int] = None,
+    fields: Optional[List[str]] = None,
+    format: Optional[str] = None,
+) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
     """
     Get the highest rated tracks in the library.
 
     Args:
-        limit: Maximum number of tracks to return
+        limit: Maximum number of tracks to return (ignored when paginating)
+        cursor: Opaque next_cursor from a previous page; its filters take precedence
+        page_size: Page through results with this many items per page (max 1000)
+        fields: Only return these fields per track (e.g. ["id", "title", "bpm"])
+        format: "rows" (default) or "columnar" for one array per field
 
     Returns:
-        List of top rated tracks
+        List of top rated tracks, or a page dict with items, next_cursor and
+        total_count when paginating
     """
     await ensure_database_connected()
 
-    tracks = await db.get_top_rated_tracks(limit)
-    return [track.model_dump() for track in tracks]
+    if cursor or page_size:
+        return await db.get_page(
+            "top_rated",
+            cursor=cursor,
+            page_size=page_size,
+            fields=fields,
+            format=format,
+        )
+
+    return await db.get_listing(
+        "top_rated", None, fields=fields, format=format or "rows", limit=limit
+    )
 
 
 @mcp.tool()
-async def get_unplayed_tracks(limit: int = 50) -> List[Dict[str, Any]]:
+async def get_unplayed_tracks(
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    page_size: Optional[int] = None,
+    fields: Optional[List[str]] = None,
+    format: Optional[str] = None,
+) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
     """
     Get tracks that have never been played.
 
     Args:
-        limit: Maximum number of tracks to return
+        limit: Maximum number of tracks to return (ignored when paginating)
+        cursor: Opaque next_cursor from a previous page; its filters take precedence
+        page_size: Page through results with this many items per page (max 1000)
+        fields: Only return these fields per track (e.g. ["id", "title", "bpm"])
+        format: "rows" (default) or "columnar" for one array per field
 
     Returns:
-        List of unplayed tracks
+        List of unplayed tracks, or a page dict with items, next_cursor and
+        total_count when paginating
     """
     await ensure_database_connected()
 
-    tracks = await db.get_unplayed_tracks(limit)
-    return [track.model_dump() for track in tracks]
+    if cursor or page_size:
+        return await db.get_page(
+            "unplayed", cursor=cursor, page_size=page_size, fields=fields, format=format
+        )
+
+    return await db.get_listing(
+        "unplayed", None, fields=fields, format=format or "rows", limit=limit
+    )
 
 
 @mcp.tool()
@@ -247,43 +534,115 @@ async def get_track_file_path(track_id: str) -> Dict[str, str]:
 
 
 @mcp.tool()
-async def search_tracks_by_filename(filename: str) -> List[Dict[str, Any]]:
+async def search_tracks_by_filename(
+    filename: str,
+    cursor: Optional[str] = None,
+    page_size: Optional[int] = None,
+    fields: Optional[List[str]] = None,
+    format: Optional[str] = None,
+) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
     """
     Search for tracks by filename.
 
     Args:
         filename: Filename to search for (partial match)
+        cursor: Opaque next_cursor from a previous page; its filters take precedence
+        page_size: Page through results with this many items per page (max 1000)
+        fields: Only return these fields per track (e.g. ["id", "title", "bpm"])
+        format: "rows" (default) or "columnar" for one array per field
 
     Returns:
-        List of tracks matching the filename
+        List of tracks matching the filename, or a page dict with items,
+        next_cursor and total_count when paginating
     """
     await ensure_database_connected()
 
-    tracks = await db.search_tracks_by_filename(filename)
-    return [track.model_dump() for track in tracks]
+    if cursor or page_size:
+        return await db.get_page(
+            "filename",
+            {"filename": filename},
+            cursor=cursor,
+            page_size=page_size,
+            fields=fields,
+            format=format,
+        )
+
+    return await db.get_listing(
+        "filename", {"filename": filename}, fields=fields, format=format or "rows"
+    )
 
 
 @mcp.tool()
 async def analyze_library(
-    group_by: str = "genre", aggregate_by: str = "count", top_n: int = 10
+    group_by: Union[str, List[str]] = "genre",
+    aggregate_by: str = "count",
+    top_n: int = 10,
+    bpm_bucket: float = 5.0,
+    approximate: bool = False,
 ) -> Dict[str, Any]:
     """
     Analyze library with grouping and aggregation.
 
     Args:
-        group_by: Field to group by (genre, key, year, artist, rating)
-        aggregate_by: Aggregation method (count, playCount, totalTime)
+        group_by: Field(s) to group by (genre, key, year, artist, rating,
+            bpm_bucket). Pass a list or "genre,key" for a multi-dimensional pivot
+        aggregate_by: Aggregate to rank groups by (count, playCount, totalTime,
+            meanBpm, medianBpm, distinctArtists); every aggregate is returned
         top_n: Number of top results to return
+        bpm_bucket: Bucket width in BPM for the bpm_bucket dimension
+        approximate: For very large libraries: top genres or artists by count
+            from fixed-memory sketches, with error bounds and estimated
+            distinct genre/artist/label counts
 
     Returns:
-        Analysis results
+        Analysis results. With one group_by field, results maps each group to
+        its aggregates; with several, results is a list of rows with one value
+        per field plus the aggregates
     """
     await ensure_database_connected()
 
-    analysis = await db.analyze_library(group_by, aggregate_by, top_n)
+    analysis = await db.analyze_library(
+        group_by, aggregate_by, top_n, bpm_bucket, approximate=approximate
+    )
     return analysis
 
 
+@mcp.tool()
+async def get_distribution(
+    column: str = "bpm",
+    bins: int = 20,
+    bin_width: Optional[float] = None,
+    percentiles: Optional[List[float]] = None,
+    genre: Optional[str] = None,
+    playlist_id: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Get the distribution of a numeric track column.
+
+    Args:
+        column: Column to summarise (bpm, length, year, play_count, rating, bitrate)
+        bins: Number of equal-width histogram bins
+        bin_width: Histogram bin width instead of a bin count (e.g. 5 for BPM)
+        percentiles: Percentiles to report (default 5, 25, 50, 75, 95)
+        genre: Only include tracks whose genre contains this text
+        playlist_id: Only include tracks in this playlist
+
+    Returns:
+        count, unknown (tracks with no value), min, max, mean, percentiles and
+        histogram (edges and counts)
+    """
+    await ensure_database_connected()
+
+    return await db.get_distribution(
+        column,
+        bins=bins,
+        bin_width=bin_width,
+        percentiles=percentiles,
+        genre=genre,
+        playlist_id=playlist_id,
+    )
+
+
 @mcp.tool()
 async def validate_track_ids(track_ids: List[str]) -> Dict[str, Any]:
     """
@@ -302,34 +661,69 @@ async def validate_track_ids(track_ids: List[str]) -> Dict[str, Any]:
 
 
 @mcp.tool()
-async def get_playlists() -> List[Dict[str, Any]]:
+async def get_playlists(
+    cursor: Optional[str] = None, page_size: Optional[int] = None
+) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
     """
     Get all playlists from the rekordbox database.
 
+    Args:
+        cursor: Opaque next_cursor from a previous page; its filters take precedence
+        page_size: Page through results with this many items per page (max 1000)
+
     Returns:
-        List of playlists with metadata
+        List of playlists with metadata, or a page dict with items,
+        next_cursor and total_count when paginating
     """
     await ensure_database_connected()
 
+    if cursor or page_size:
+        return await db.get_page("playlists", cursor=cursor, page_size=page_size)
+
     playlists = await db.get_playlists()
     return [playlist.model_dump() for playlist in playlists]
 
 
 @mcp.tool()
-async def get_playlist_tracks(playlist_id: str) -> List[Dict[str, Any]]:
+async def get_playlist_tracks(
+    playlist_id: str,
+    cursor: Optional[str] = None,
+    page_size: Optional[int] = None,
+    fields: Optional[List[str]] = None,
+    format: Optional[str] = None,
+) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
     """
     Get all tracks in a specific playlist.
 
     Args:
         playlist_id: The unique playlist identifier
+        cursor: Opaque next_cursor from a previous page; its filters take precedence
+        page_size: Page through results with this many items per page (max 1000)
+        fields: Only return these fields per track (e.g. ["id", "title", "bpm"])
+        format: "rows" (default) or "columnar" for one array per field
 
     Returns:
-        List of tracks in the playlist
+        List of tracks in the playlist, or a page dict with items,
+        next_cursor and total_count when paginating
     """
     await ensure_database_connected()
 
-    tracks = await db.get_playlist_tracks(playlist_id)
-    return [track.model_dump() for track in tracks]
+    if cursor or page_size:
+        return await db.get_page(
+            "playlist_tracks",
+            {"playlist_id": playlist_id},
+            cursor=cursor,
+            page_size=page_size,
+            fields=fields,
+            format=format,
+        )
+
+    return await db.get_listing(
+        "playlist_tracks",
+        {"playlist_id": playlist_id},
+        fields=fields,
+        format=format or "rows",
+    )
 
 
 @mcp.tool()
@@ -376,20 +770,34 @@ async def connect_database(database_path: Optional[str] = None) -> Dict[str, str
 
 @mcp.tool()
 async def get_history_sessions(
-    include_folders: bool = False, limit: int = 100
-) -> List[Dict[str, Any]]:
+    include_folders: bool = False,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    page_size: Optional[int] = None,
+) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
     """
     Get DJ history sessions from rekordbox.
 
     Args:
         include_folders: Whether to include folder entries (years/months)
-        limit: Maximum number of sessions to return
+        limit: Maximum number of sessions to return (ignored when paginating)
+        cursor: Opaque next_cursor from a previous page; its filters take precedence
+        page_size: Page through results with this many items per page (max 1000)
 
     Returns:
-        List of history sessions with metadata
+        List of history sessions with metadata, or a page dict with items,
+        next_cursor and total_count when paginating
     """
     await ensure_database_connected()
 
+    if cursor or page_size:
+        return await db.get_page(
+            "history_sessions",
+            {"include_folders": include_folders},
+            cursor=cursor,
+            page_size=page_size,
+        )
+
     sessions = await db.get_history_sessions(include_folders=include_folders)
     # Sort by date created, most recent first
     sessions.sort(key=lambda x: x.date_created or "", reverse=True)
@@ -397,32 +805,62 @@ async def get_history_sessions(
 
 
 @mcp.tool()
-async def get_session_tracks(session_id: str) -> List[Dict[str, Any]]:
+async def get_session_tracks(
+    session_id: str,
+    cursor: Optional[str] = None,
+    page_size: Optional[int] = None,
+    fields: Optional[List[str]] = None,
+    format: Optional[str] = None,
+) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
     """
     Get all tracks from a specific DJ history session.
 
     Args:
         session_id: The session's unique identifier
+        cursor: Opaque next_cursor from a previous page; its filters take precedence
+        page_size: Page through results with this many items per page (max 1000)
+        fields: Only return these fields per track (e.g. ["id", "title", "bpm"])
+        format: "rows" (default) or "columnar" for one array per field
 
     Returns:
-        List of tracks in the session with performance context
+        List of tracks in the session with performance context, or a page
+        dict with items, next_cursor and total_count when paginating
     """
     await ensure_database_connected()
 
-    tracks = await db.get_session_tracks(session_id)
-    return [track.model_dump() for track in tracks]
+    if cursor or page_size:
+        return await db.get_page(
+            "session_tracks",
+            {"session_id": session_id},
+            cursor=cursor,
+            page_size=page_size,
+            fields=fields,
+            format=format,
+        )
+
+    return await db.get_listing(
+        "session_tracks",
+        {"session_id": session_id},
+        fields=fields,
+        format=format or "rows",
+    )
 
 
 @mcp.tool()
-async def get_recent_sessions(days: int = 30) -> List[Dict[str, Any]]:
+async def get_recent_sessions(
+    days: int = 30, cursor: Optional[str] = None, page_size: Optional[int] = None
+) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
     """
     Get recent DJ history sessions within the specified number of days.
 
     Args:
         days: Number of days to look back (default: 30)
+        cursor: Opaque next_cursor from a previous page; its filters take precedence
+        page_size: Page through results with this many items per page (max 1000)
 
     Returns:
-        List of recent history sessions
+        List of recent history sessions, or a page dict with items,
+        next_cursor and total_count when paginating
     """
     await ensure_database_connected()
 
@@ -431,16 +869,15 @@ async def get_recent_sessions(days: int = 30) -> List[Dict[str, Any]]:
     cutoff_date = datetime.now() - timedelta(days=days)
     cutoff_str = cutoff_date.strftime("%Y-%m-%d")
 
-    sessions = await db.get_history_sessions(include_folders=False)
-
-    # Filter by date
-    recent_sessions = [
-        s for s in sessions if s.date_created and s.date_created >= cutoff_str
-    ]
+    if cursor or page_size:
+        return await db.get_page(
+            "history_sessions",
+            {"since": cutoff_str},
+            cursor=cursor,
+            page_size=page_size,
+        )
 
-    # Sort by date, most recent first
-    recent_sessions.sort(key=lambda x: x.date_created or "", reverse=True)
-    return [session.model_dump() for session in recent_sessions]
+    return await db.get_listing("history_sessions", {"since": cutoff_str})
 
 
 @mcp.tool()
@@ -449,7 +886,9 @@ async def get_history_stats() -> Dict[str, Any]:
     Get comprehensive statistics about DJ history sessions.
 
     Returns:
-        Statistics about all history sessions including totals and trends
+        Statistics about all history sessions including totals, the most
+        played track, favorite genres by play count, and sessions and plays
+        per month
     """
     await ensure_database_connected()
 
@@ -464,7 +903,9 @@ async def search_history_sessions(
     month: Optional[str] = None,
     min_tracks: Optional[int] = None,
     limit: int = 50,
-) -> List[Dict[str, Any]]:
+    cursor: Optional[str] = None,
+    page_size: Optional[int] = None,
+) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
     """
     Search DJ history sessions with various filters.
 
@@ -473,43 +914,56 @@ async def search_history_sessions(
         year: Filter by year (e.g., "2025")
         month: Filter by month (e.g., "08" for August)
         min_tracks: Minimum number of tracks in session
-        limit: Maximum number of results
+        limit: Maximum number of results (ignored when paginating)
+        cursor: Opaque next_cursor from a previous page; its filters take precedence
+        page_size: Page through results with this many items per page (max 1000)
 
     Returns:
-        List of matching history sessions
+        List of matching history sessions, or a page dict with items,
+        next_cursor and total_count when paginating
     """
     await ensure_database_connected()
 
-    sessions = await db.get_history_sessions(include_folders=False)
+    filters = {
+        "query": query,
+        "year": year,
+        "month": month,
+        "min_tracks": min_tracks,
+    }
+    params = {k: v for k, v in filters.items() if v}
+
+    if cursor or page_size:
+        return await db.get_page(
+            "history_sessions",
+            params,
+            cursor=cursor,
+            page_size=page_size,
+        )
+
+    return await db.get_listing("history_sessions", params, limit=limit)
 
-    # Apply filters
-    filtered_sessions = []
-    for session in sessions:
-        # Text search
-        if query and query.lower() not in session.name.lower():
-            continue
 
-        # Date filters
-        if session.date_created:
-            if year and not session.date_created.startswith(year):
-                continue
-            if month and year:
-                month_str = f"{year}-{month.zfill(2)}"
-                if not session.date_created.startswith(month_str):
-                    continue
-        elif year or month:
-            # Skip if date filters specified but no date available
-            continue
+@mcp.tool()
+async def get_transitions(
+    track_id: str, direction: str = "next", limit: int = 20
+) -> Dict[str, Any]:
+    """
+    Get the tracks you have mixed into or out of a track in your DJ history.
 
-        # Track count filter
-        if min_tracks and session.track_count < min_tracks:
-            continue
+    Args:
+        track_id: The track to look up
+        direction: "next" for tracks played right after it, "previous" for
+            tracks played right before it
+        limit: Maximum number of transitions to return
 
-        filtered_sessions.append(session)
+    Returns:
+        The track, the number of distinct neighbouring tracks, and the most
+        frequent transitions with their counts, BPM delta and Camelot key
+        distance
+    """
+    await ensure_database_connected()
 
-    # Sort by date, most recent first
-    filtered_sessions.sort(key=lambda x: x.date_created or "", reverse=True)
-    return [session.model_dump() for session in filtered_sessions[:limit]]
+    return await db.get_transitions(track_id, direction, limit)
 
 
 # Playlist Mutation Tools (with safety annotations)
@@ -736,6 +1190,54 @@ async def delete_playlist(playlist_id: str) -> Dict[str, Any]:
         return {"status": "error", "message": f"Failed to delete playlist: {str(e)}"}
 
 
+@mcp.tool(
+    annotations={
+        "readOnlyHint": False,
+        "destructiveHint": True,
+        "idempotentHint": False,
+    }
+)
+async def apply_playlist_operations(operations: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Apply an ordered batch of playlist operations in a single transaction.
+
+    ⚠️ DANGER: This modifies your rekordbox database and may delete playlists!
+
+    One backup and one commit cover the whole batch. If any operation fails,
+    all changes are rolled back and nothing is written.
+
+    Supported operations (executed in order):
+    - {"op": "create", "name": "...", "parent_id": "...", "is_folder": false, "ref": "new"}
+    - {"op": "add", "playlist_id": "...", "track_id": "..."} (or "track_ids": [...])
+      (tracks already in the playlist are reported as "skipped", not re-added)
+    - {"op": "remove", "playlist_id": "...", "track_id": "..."}
+    - {"op": "move", "playlist_id": "...", "parent_id": "...", "position": 1}
+      (with "track_id", moves that track to "position" within the playlist)
+    - {"op": "delete", "playlist_id": "..."}
+
+    A playlist created with "ref": "new" can be targeted by later operations
+    as "$new" in playlist_id or parent_id.
+
+    Args:
+        operations: Ordered list of operation dicts
+
+    Returns:
+        Overall status, per-operation results and the IDs of created playlists
+    """
+    await ensure_database_connected()
+
+    if not operations:
+        raise ValueError("No operations given")
+
+    try:
+        return await db.apply_playlist_operations(operations)
+    except Exception as e:
+        return {
+            "status": "error",
+            "message": f"Failed to apply playlist operations: {str(e)}",
+        }
+
+
 # Import Tools
 
 
@@ -865,6 +1367,34 @@ async def find_broken_tracks() -> Dict[str, Any]:
     return await db.find_broken_tracks()
 
 
+@mcp.tool()
+async def find_duplicate_tracks(
+    length_tolerance: int = 2,
+    match_file_size: bool = False,
+    limit: int = 100,
+) -> Dict[str, Any]:
+    """
+    Find likely duplicate tracks, e.g. the same song in different formats or folders.
+
+    Tracks match when their normalised title and artist agree (case, accents,
+    "feat." credits and "Original Mix" suffixes are ignored) and their
+    lengths are within the tolerance.
+
+    Args:
+        length_tolerance: Maximum length difference in seconds (default 2)
+        match_file_size: Also require identical file sizes (exact copies only)
+        limit: Maximum number of clusters to return, largest first
+
+    Returns:
+        Clusters of duplicates, each with a suggested keeper (local file,
+        highest bitrate, most plays) and the IDs that could be removed, plus
+        a summary with counts
+    """
+    await ensure_database_connected()
+
+    return await db.find_duplicate_tracks(length_tolerance, match_file_size, limit)
+
+
 @mcp.tool(
     annotations={
         "readOnlyHint": False,
@@ -915,51 +1445,153 @@ async def remove_broken_tracks(track_ids: List[str]) -> Dict[str, Any]:
 
 @mcp.resource("file://database-status")
 async def database_status() -> str:
-    """Get the current database connection status."""
+    """Get the current database connection status and warm-up progress."""
+    if _startup_status["state"] == "connecting":
+        return "Starting up: connecting to rekordbox database..."
+
+    connected = bool(db) and await db.is_connected()
+    if not connected and _startup_status["state"] == "failed":
+        return (
+            f"Database connection failed at startup: {_startup_status['error']}. "
+            "Use connect_database tool to retry."
+        )
+
     if not db:
         return (
             "Database not connected. Use connect_database tool to establish connection."
         )
 
-    if await db.is_connected():
-        track_count = await db.get_track_count()
-        return f"Connected to rekordbox database at {db.database_path}. Total tracks: {track_count}"
+    if connected:
+        # COUNT(*) rather than the content cache, which may still be warming
+        track_count = (await db.get_table_counts())["tracks"]
+        lines = [
+            f"Connected to rekordbox database at {db.database_path}. Total tracks: {track_count}"
+        ]
+        if "connect_ms" in _startup_status:
+            lines.append(
+                f"Connected at startup in {_startup_status['connect_ms']:g} ms"
+            )
+        warmup = _describe_warmup(db.warmup_status)
+        if warmup:
+            lines.append(warmup)
+        return "\n".join(lines)
     else:
         return "Database connection lost. Please reconnect."
 
 
-async def ensure_database_connected():
-    """Ensure database is connected, initialize if not."""
+def _describe_warmup(status: Dict[str, Any]) -> str:
+    """One-line summary of ``RekordboxDatabase.warmup_status``."""
+    if status["state"] == "running":
+        step = len(status["completed"]) + 1
+        return f"Warming caches: {status['stage']} ({step}/{status['total_stages']})"
+    if status["state"] == "ready":
+        stages = ", ".join(
+            f"{name} {ms:g} ms" for name, ms in status["timings_ms"].items()
+        )
+        return f"Caches ready in {status['elapsed_ms']:g} ms ({stages})"
+    if status["state"] == "failed":
+        return f"Cache warm-up failed ({status['error']}); caches build on first use"
+    return ""
+
+
+async def _initialize_database():
+    """Create the global database, connect, and log what it contains."""
     global db, _db_initialized
 
-    if _db_initialized and db and await db.is_connected():
-        return
+    logger.info("Initializing database connection...")
 
-    if not _db_initialized:
-        logger.info("Initializing database connection...")
+    try:
+        db = RekordboxDatabase()
+        await db.connect()
+
+        # COUNT(*) queries: nothing is loaded just to log these
+        counts = await db.get_table_counts()
+
+        logger.success(f"✅ Connected to rekordbox database!")
+        logger.info(
+            f"📊 Database contains {counts['tracks']} tracks and {counts['playlists']} playlists"
+        )
+        _db_initialized = True
+
+    except Exception as e:
+        logger.error(f"❌ Failed to connect to rekordbox database: {e}")
+        logger.error("🔧 Please ensure:")
+        logger.error("   - Rekordbox is closed")
+        logger.error(
+            "   - Database key is available (run: uv run python -m pyrekordbox download-key)"
+        )
+        logger.error("   - Database path is accessible")
+        raise RuntimeError(f"Database initialization failed: {str(e)}")
 
+
+async def _start_up():
+    """Connect in the background, then start warming caches."""
+    global _warmup_task
+
+    _startup_status.clear()
+    _startup_status["state"] = "connecting"
+    started = time.perf_counter()
+    try:
+        await _initialize_database()
+    except Exception as e:
+        _startup_status.update(state="failed", error=str(e))
+        raise
+    _startup_status.update(
+        state="warming", connect_ms=round((time.perf_counter() - started) * 1000, 1)
+    )
+    _warmup_task = asyncio.create_task(_warm_up())
+
+
+async def _warm_up():
+    """Build the common caches; errors are not fatal."""
+    try:
+        status = await db.warm_up()
+        logger.info(f"🔥 Caches warmed in {status['elapsed_ms']:g} ms")
+    except Exception as e:
+        # Tools still work; each cache is built on first use instead
+        logger.warning(f"Cache warm-up failed: {e}")
+    _startup_status["state"] = "ready"
+
+
+def start_background_initialization() -> asyncio.Task:
+    """Start connecting and warming caches in the background (once)."""
+    global _startup_task
+    if _startup_task is None:
+        _startup_task = asyncio.create_task(_start_up())
+        # Failures are logged and retried by the next tool call; mark the
+        # exception as retrieved so asyncio does not report it again
+        _startup_task.add_done_callback(lambda t: t.cancelled() or t.exception())
+    return _startup_task
+
+
+async def ensure_database_connected():
+    """Ensure database is connected, initialize if not.
+
+    If a background start is still connecting, wait for it rather than
+    connecting a second time. Cache warm-up is not awaited: it holds the
+    database session one stage at a time, so a tool waits for at most the
+    stage in progress, and a tool needing a cache that is being built waits
+    for that build alone.
+    """
+    global _startup_task
+
+    task = _startup_task
+    if task is not None:
         try:
-            db = RekordboxDatabase()
-            await db.connect()
+            # Shielded so a cancelled tool call does not cancel the start-up
+            await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if not task.done():
+                raise
+        except Exception:
+            pass  # Logged by the background start; retried below
+        _startup_task = None
 
-            track_count = await db.get_track_count()
-            playlist_count = len(await db.get_playlists())
+    if _db_initialized and db and await db.is_connected():
+        return
 
-            logger.success(f"✅ Connected to rekordbox database!")
-            logger.info(
-                f"📊 Database contains {track_count} tracks and {playlist_count} playlists"
-            )
-            _db_initialized = True
-
-        except Exception as e:
-            logger.error(f"❌ Failed to connect to rekordbox database: {e}")
-            logger.error("🔧 Please ensure:")
-            logger.error("   - Rekordbox is closed")
-            logger.error(
-                "   - Database key is available (run: uv run python -m pyrekordbox download-key)"
-            )
-            logger.error("   - Database path is accessible")
-            raise RuntimeError(f"Database initialization failed: {str(e)}")
+    if not _db_initialized:
+        await _initialize_database()
 
     elif db and not await db.is_connected():
         # Reconnect if connection was lost
@@ -1008,7 +1640,8 @@ def main():
     signal.signal(signal.SIGTERM, signal_handler)
 
     try:
-        # Run the FastMCP server (database will be initialized on first tool call)
+        # Run the FastMCP server; its lifespan connects and warms caches in
+        # the background, and tools wait only for the connection
         mcp.run()
     except KeyboardInterrupt:
         logger.info("Interrupted by user")
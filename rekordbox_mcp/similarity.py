@@ -0,0 +1,137 @@
+"""
+Track Similarity
+
+Each track is a weighted numeric vector: standardised BPM, year, length and
+rating, its key as a point on the Camelot circle, and hashed genre words and
+label. The vectors form one float32 matrix per content version, so a
+k-nearest-neighbour query is a single matrix-vector product and a partial
+sort.
+"""
+
+import zlib
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from .analytics import LibraryColumns
+from .keys import camelot
+
+# Hash buckets for genre words and labels
+GENRE_BUCKETS = 32
+LABEL_BUCKETS = 32
+
+# Relative weight of each feature group in the distance
+FEATURE_WEIGHTS = {
+    "bpm": 1.0,
+    "key": 1.0,
+    "genre": 1.0,
+    "year": 0.5,
+    "label": 0.5,
+    "length": 0.25,
+    "rating": 0.25,
+}
+
+
+def _bucket(token: str, buckets: int) -> int:
+    """Stable hash bucket (Python's str hash is salted per process)."""
+    return zlib.crc32(token.encode()) % buckets
+
+
+def _standardise(values: np.ndarray, known: np.ndarray) -> np.ndarray:
+    """Z-scores of the known values; unknown values sit at the mean (0)."""
+    result = np.zeros(len(values), dtype=np.float32)
+    if known.any():
+        sample = values[known].astype(np.float64)
+        spread = sample.std() or 1.0
+        result[known] = (sample - sample.mean()) / spread
+    return result
+
+
+def _key_point(label: str) -> Tuple[float, float, float]:
+    """Camelot position on the unit circle, plus +-0.5 for major/minor."""
+    position = camelot(label)
+    if position is None:
+        return 0.0, 0.0, 0.0
+    angle = 2 * np.pi * (position[0] - 1) / 12
+    return np.cos(angle), np.sin(angle), 0.5 if position[1] == "B" else -0.5
+
+
+def _genre_vector(label: str) -> np.ndarray:
+    """Unit vector over hashed genre words, so "Deep House" is near "House"."""
+    vector = np.zeros(GENRE_BUCKETS, dtype=np.float32)
+    if label != "Unknown":
+        for word in label.lower().split():
+            vector[_bucket(word, GENRE_BUCKETS)] += 1
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+def _label_vector(label: str) -> np.ndarray:
+    vector = np.zeros(LABEL_BUCKETS, dtype=np.float32)
+    if label != "Unknown":
+        vector[_bucket(label.lower(), LABEL_BUCKETS)] = 1
+    return vector
+
+
+class TrackVectors:
+    """Feature matrix of a row snapshot for nearest-neighbour queries."""
+
+    def __init__(self, columns: LibraryColumns):
+        self.columns = columns
+        weights = {name: np.sqrt(w) for name, w in FEATURE_WEIGHTS.items()}
+
+        key_codes, key_labels = columns.factor("key")
+        key_points = np.array(
+            [_key_point(label) for label in key_labels] or [(0.0, 0.0, 0.0)],
+            dtype=np.float32,
+        )
+        genre_codes, genre_labels = columns.factor("genre")
+        genre_vectors = np.array(
+            [_genre_vector(label) for label in genre_labels]
+            or [np.zeros(GENRE_BUCKETS)],
+            dtype=np.float32,
+        )
+        label_codes, label_labels = columns.factor("label")
+        label_vectors = np.array(
+            [_label_vector(label) for label in label_labels]
+            or [np.zeros(LABEL_BUCKETS)],
+            dtype=np.float32,
+        )
+
+        # BPM on a log scale, so a 6% change costs the same at any tempo
+        bpm = np.log2(np.where(columns.bpm > 0, columns.bpm, 1.0))
+        parts = [
+            weights["bpm"] * _standardise(bpm, columns.bpm > 0)[:, None],
+            weights["key"] * key_points[key_codes],
+            weights["genre"] * genre_vectors[genre_codes],
+            weights["year"] * _standardise(columns.year, columns.year > 0)[:, None],
+            weights["label"] * label_vectors[label_codes],
+            weights["length"]
+            * _standardise(columns.length, columns.length > 0)[:, None],
+            weights["rating"]
+            * _standardise(columns.rating, columns.rating > 0)[:, None],
+        ]
+        self.matrix = np.hstack(parts).astype(np.float32)
+        self._norms = np.einsum("ij,ij->i", self.matrix, self.matrix)
+
+    def nearest(
+        self, position: int, k: int, mask: Optional[np.ndarray] = None
+    ) -> List[Tuple[int, float]]:
+        """``(position, distance)`` of the ``k`` tracks nearest the track at
+        row ``position``, excluding itself and rows where ``mask`` is False."""
+        vector = self.matrix[position]
+        # |x - v|^2 = |x|^2 - 2 x.v + |v|^2, one product over the whole matrix
+        distances = self._norms - 2 * (self.matrix @ vector) + self._norms[position]
+        np.maximum(distances, 0, out=distances)
+        allowed = np.ones(len(distances), dtype=bool) if mask is None else mask.copy()
+        allowed[position] = False
+        candidates = np.flatnonzero(allowed)
+        if not len(candidates):
+            return []
+        scores = distances[candidates]
+        if k < len(candidates):
+            top = np.argpartition(scores, k)[:k]
+        else:
+            top = np.arange(len(candidates))
+        top = top[np.lexsort((candidates[top], scores[top]))]
+        return [(int(candidates[i]), round(float(np.sqrt(scores[i])), 4)) for i in top]
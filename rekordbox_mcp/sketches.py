@@ -0,0 +1,221 @@
+"""
+Streaming Sketches
+
+Fixed-memory summaries for very large libraries: HyperLogLog for distinct
+counts and Space-Saving for heavy hitters. Both report their error bounds.
+Neither supports deletion, so ``LibrarySketches`` counts rows removed or
+changed since the last rebuild and rebuilds once they pass a threshold.
+"""
+
+import hashlib
+import heapq
+import math
+import threading
+from typing import Any, Dict, Hashable, Iterable, List, Tuple
+
+import numpy as np
+
+from .rows import TrackRow
+
+DEFAULT_PRECISION = 14
+DEFAULT_CAPACITY = 1000
+
+# Rebuild once removed/changed rows exceed this fraction of the library
+REBUILD_RATIO = 0.1
+
+
+def _hash64(value: str) -> int:
+    """Stable 64-bit hash (Python's str hash is salted per process)."""
+    return int.from_bytes(
+        hashlib.blake2b(value.encode(), digest_size=8).digest(), "big"
+    )
+
+
+class HyperLogLog:
+    """Distinct-count estimator with 2**precision registers."""
+
+    def __init__(self, precision: int = DEFAULT_PRECISION):
+        if not 4 <= precision <= 18:
+            raise ValueError("precision must be between 4 and 18")
+        self.precision = precision
+        self.m = 1 << precision
+        self._registers = np.zeros(self.m, dtype=np.uint8)
+
+    @property
+    def relative_error(self) -> float:
+        """Standard error of the estimate, relative to the true count."""
+        return 1.04 / math.sqrt(self.m)
+
+    def add(self, value: str) -> None:
+        h = _hash64(value)
+        index = h >> (64 - self.precision)
+        rest = h & ((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - rest.bit_length() + 1
+        if rank > self._registers[index]:
+            self._registers[index] = rank
+
+    def count(self) -> int:
+        m = self.m
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.ldexp(1.0, -self._registers.astype(int)))
+        zeros = int(np.count_nonzero(self._registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            # Small-range correction: linear counting over empty registers
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+
+class SpaceSaving:
+    """Top-k heavy hitters in ``capacity`` counters.
+
+    Each monitored item has a count that overestimates its true frequency by
+    at most its ``error``; any item not monitored occurs at most
+    ``min_count`` times. Counters sit in a lazily-updated min-heap so an
+    eviction is O(log capacity).
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self.total = 0
+        self._counts: Dict[Hashable, List[int]] = {}
+        self._heap: List[Tuple[int, int, Hashable]] = []
+        self._tick = 0
+
+    def _push(self, item: Hashable, count: int) -> None:
+        self._tick += 1
+        heapq.heappush(self._heap, (count, self._tick, item))
+        if len(self._heap) > 4 * self.capacity:
+            self._heap = [
+                (entry[0], tick, key)
+                for tick, (key, entry) in enumerate(self._counts.items())
+            ]
+            heapq.heapify(self._heap)
+
+    def _pop_min(self) -> Tuple[Hashable, int]:
+        while True:
+            count, _, item = heapq.heappop(self._heap)
+            entry = self._counts.get(item)
+            if entry is not None and entry[0] == count:
+                return item, count
+
+    def add(self, item: Hashable) -> None:
+        self.total += 1
+        entry = self._counts.get(item)
+        if entry is not None:
+            entry[0] += 1
+        elif len(self._counts) < self.capacity:
+            entry = self._counts[item] = [1, 0]
+        else:
+            evicted, floor = self._pop_min()
+            del self._counts[evicted]
+            entry = self._counts[item] = [floor + 1, floor]
+        self._push(item, entry[0])
+
+    @property
+    def min_count(self) -> int:
+        """Upper bound on the frequency of any unmonitored item."""
+        if len(self._counts) < self.capacity:
+            return 0
+        return min(entry[0] for entry in self._counts.values())
+
+    def top(self, n: int) -> List[Tuple[Hashable, int, int]]:
+        """``(item, count, error)`` for the ``n`` largest counts."""
+        ranked = heapq.nlargest(
+            n, self._counts.items(), key=lambda kv: (kv[1][0], -kv[1][1])
+        )
+        return [(item, count, error) for item, (count, error) in ranked]
+
+
+SKETCH_DIMENSIONS = ("genre", "artist")
+DISTINCT_COLUMNS = ("genre", "artist", "label")
+
+
+class LibrarySketches:
+    """Heavy hitters and distinct counts of a track snapshot.
+
+    ``sync()`` feeds only rows not seen before. Rows that changed or
+    disappeared cannot be subtracted; they are tracked as ``stale`` (each
+    can inflate a count by one) until a rebuild.
+    """
+
+    def __init__(
+        self, precision: int = DEFAULT_PRECISION, capacity: int = DEFAULT_CAPACITY
+    ):
+        self.precision = precision
+        self.capacity = capacity
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self.heavy = {d: SpaceSaving(self.capacity) for d in SKETCH_DIMENSIONS}
+        self.distinct = {c: HyperLogLog(self.precision) for c in DISTINCT_COLUMNS}
+        self._seen: Dict[str, Tuple[str, ...]] = {}
+        self.stale = 0
+        self.rebuilds = 0
+
+    @staticmethod
+    def _values(row: TrackRow) -> Tuple[str, ...]:
+        return tuple(getattr(row, c) or "Unknown" for c in DISTINCT_COLUMNS)
+
+    def _add(self, values: Tuple[str, ...]) -> None:
+        by_column = dict(zip(DISTINCT_COLUMNS, values))
+        for dimension, sketch in self.heavy.items():
+            sketch.add(by_column[dimension])
+        for column, sketch in self.distinct.items():
+            if by_column[column] != "Unknown":
+                sketch.add(by_column[column])
+
+    def sync(self, rows: Iterable[TrackRow]) -> Dict[str, int]:
+        """Feed new rows; rebuild when too many rows went stale."""
+        with self._lock:
+            current = {row.id: self._values(row) for row in rows}
+            changed = sum(
+                1
+                for tid, values in self._seen.items()
+                if current.get(tid, values) != values
+            )
+            removed = sum(1 for tid in self._seen if tid not in current)
+            self.stale += changed + removed
+
+            if self.stale > REBUILD_RATIO * max(len(current), 1):
+                rebuilds = self.rebuilds + 1
+                self._reset()
+                self.rebuilds = rebuilds
+                added = len(current)
+                for values in current.values():
+                    self._add(values)
+            else:
+                added = 0
+                for tid, values in current.items():
+                    if self._seen.get(tid) != values:
+                        self._add(values)
+                        added += 1
+            self._seen = current
+        return {"added": added, "stale": self.stale, "rebuilds": self.rebuilds}
+
+    def top(self, dimension: str, n: int) -> Dict[str, Any]:
+        """Approximate top-``n`` groups of ``dimension`` with error bounds."""
+        with self._lock:
+            sketch = self.heavy[dimension]
+            results = {
+                item: {"count": count, "error": error + self.stale}
+                for item, count, error in sketch.top(n)
+            }
+            distinct = self.distinct[dimension]
+            return {
+                "results": results,
+                "total_groups": distinct.count(),
+                "distinct": {
+                    f"{c}s": sketch_.count() for c, sketch_ in self.distinct.items()
+                },
+                "error_bounds": {
+                    # True count lies in [count - error, count]
+                    "max_overcount": max(
+                        (v["error"] for v in results.values()), default=0
+                    ),
+                    # No group missing from results has a larger count
+                    "unlisted_max_count": sketch.min_count + self.stale,
+                    "distinct_relative_error": round(distinct.relative_error, 4),
+                    "stale_rows": self.stale,
+                },
+            }
@@ -0,0 +1,165 @@
+"""
+Next-Track Suggestions
+
+Grid index over tempo and the Camelot wheel for harmonic mixing. Tracks with
+a known BPM and key are bucketed by whole BPM and wheel position once per
+content version; a query visits only the cells inside its tempo window and
+key distance, then scores those candidates in one vectorised pass.
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .analytics import LibraryColumns
+from .keys import camelot
+
+# Tempo window in percent of the seed BPM, a typical pitch-fader range
+DEFAULT_BPM_RANGE = 6.0
+DEFAULT_KEY_DISTANCE = 1
+# Farthest apart two keys can be on the wheel
+MAX_KEY_DISTANCE = 7
+
+WHEEL_SIZE = 24
+
+# Relative weight of each term in the mix score (lower scores mix better)
+SCORE_WEIGHTS = {"bpm": 1.0, "key": 1.0, "genre": 0.5, "year": 0.2, "rating": 0.1}
+# Year gap at which the year term saturates
+YEAR_SPAN = 10
+
+
+def wheel_position(key: str) -> int:
+    """0-23 position of a key on the Camelot wheel, or -1 if unrecognised."""
+    position = camelot(key)
+    if position is None:
+        return -1
+    number, letter = position
+    return (number - 1) * 2 + (letter == "B")
+
+
+def _wheel_distances() -> np.ndarray:
+    positions = np.arange(WHEEL_SIZE)
+    number, letter = positions // 2, positions % 2
+    around = np.abs(number[:, None] - number[None, :])
+    around = np.minimum(around, 12 - around)
+    return around + (letter[:, None] != letter[None, :])
+
+
+# Camelot distance between every pair of wheel positions
+KEY_DISTANCES = _wheel_distances()
+
+
+class NextTrackIndex:
+    """Tracks bucketed by (whole BPM, Camelot position) for mix lookups."""
+
+    def __init__(self, columns: LibraryColumns):
+        self.columns = columns
+        key_codes, key_labels = columns.factor("key")
+        label_positions = np.array(
+            [wheel_position(label) for label in key_labels] or [-1], dtype=np.int64
+        )
+        self.wheel = label_positions[key_codes]
+        self.genre_codes, genre_labels = columns.factor("genre")
+        self._genre_tokens = [
+            frozenset(label.lower().split()) if label != "Unknown" else frozenset()
+            for label in genre_labels
+        ]
+
+        indexed = np.flatnonzero((columns.bpm > 0) & (self.wheel >= 0))
+        cells = (
+            np.floor(columns.bpm[indexed]).astype(np.int64) * WHEEL_SIZE
+            + self.wheel[indexed]
+        )
+        order = np.argsort(cells, kind="stable")
+        cells, indexed = cells[order], indexed[order]
+        uniques, starts = np.unique(cells, return_index=True)
+        self._cells: Dict[int, np.ndarray] = dict(
+            zip(uniques.tolist(), np.split(indexed, starts[1:]))
+        )
+
+    def __len__(self) -> int:
+        return sum(len(cell) for cell in self._cells.values())
+
+    def _genre_similarity(self, code: int) -> np.ndarray:
+        """Word overlap (Jaccard) of every genre with genre ``code``."""
+        seed = self._genre_tokens[code]
+        return np.array(
+            [
+                len(seed & tokens) / len(seed | tokens) if seed and tokens else 0.0
+                for tokens in self._genre_tokens
+            ]
+        )
+
+    def suggest(
+        self,
+        position: int,
+        k: int,
+        bpm_range: float = DEFAULT_BPM_RANGE,
+        max_key_distance: int = DEFAULT_KEY_DISTANCE,
+        mask: Optional[np.ndarray] = None,
+    ) -> List[Tuple[int, float, float, int]]:
+        """Best ``k`` mixes out of the track at row ``position``.
+
+        Candidates lie within ``bpm_range`` percent of its BPM and
+        ``max_key_distance`` steps on the Camelot wheel, and pass ``mask``
+        (a boolean row array) if given. Returns ``(position, score,
+        bpm_delta, key_distance)`` with the lowest scores first.
+        """
+        columns = self.columns
+        bpm = float(columns.bpm[position])
+        wheel = int(self.wheel[position])
+        if bpm <= 0 or wheel < 0:
+            raise ValueError("Track needs a BPM and a recognised key to match on")
+
+        window = bpm * bpm_range / 100
+        low, high = bpm - window, bpm + window
+        keys = np.flatnonzero(KEY_DISTANCES[wheel] <= max_key_distance).tolist()
+        parts = [
+            cell
+            for b in range(int(np.floor(low)), int(np.floor(high)) + 1)
+            for w in keys
+            if (cell := self._cells.get(b * WHEEL_SIZE + w)) is not None
+        ]
+        if not parts:
+            return []
+        candidates = np.concatenate(parts)
+        bpms = columns.bpm[candidates]
+        keep = (candidates != position) & (bpms >= low) & (bpms <= high)
+        if mask is not None:
+            keep &= mask[candidates]
+        candidates, bpms = candidates[keep], bpms[keep]
+        if not len(candidates):
+            return []
+
+        key_steps = KEY_DISTANCES[wheel, self.wheel[candidates]]
+        genre = self._genre_similarity(int(self.genre_codes[position]))
+        year, years = columns.year[position], columns.year[candidates]
+        terms = {
+            "bpm": np.abs(bpms - bpm) / window if window else np.zeros(len(bpms)),
+            "key": key_steps / max(max_key_distance, 1),
+            "genre": 1.0 - genre[self.genre_codes[candidates]],
+            # Unknown years count as half a mismatch
+            "year": np.where(
+                (years > 0) & (year > 0),
+                np.minimum(np.abs(years - year) / YEAR_SPAN, 1.0),
+                0.5,
+            ),
+            "rating": np.abs(columns.rating[candidates] - columns.rating[position]) / 5,
+        }
+        scores = sum(SCORE_WEIGHTS[name] * term for name, term in terms.items())
+        scores = scores / sum(SCORE_WEIGHTS.values())
+
+        if k < len(candidates):
+            top = np.argpartition(scores, k)[:k]
+        else:
+            top = np.arange(len(candidates))
+        top = top[np.lexsort((candidates[top], scores[top]))]
+        return [
+            (
+                int(candidates[i]),
+                round(float(scores[i]), 4),
+                round(float(bpms[i] - bpm), 2),
+                int(key_steps[i]),
+            )
+            for i in top
+        ]
@@ -1,12 +1,14 @@
 """Shared test fixtures for rekordbox-mcp tests."""
 
 from dataclasses import dataclass, field
+from types import SimpleNamespace
 from typing import Optional, List
 from unittest.mock import MagicMock
 
 import pytest
 
 from rekordbox_mcp.database import RekordboxDatabase
+from rekordbox_mcp.rows import TrackRow
 
 
 # --- Mock dataclasses mimicking pyrekordbox ORM objects ---
@@ -197,10 +199,17 @@ def mock_db(mock_content_list, mock_playlists, mock_playlist_songs, mock_histori
 
     db.get_content = MagicMock(side_effect=get_content_side_effect)
 
-    db.get_playlist = MagicMock(return_value=mock_playlists)
+    def get_playlist_side_effect(**kwargs):
+        if "ID" in kwargs:
+            return next((p for p in mock_playlists if p.ID == kwargs["ID"]), None)
+        return mock_playlists
+
+    db.get_playlist = MagicMock(side_effect=get_playlist_side_effect)
 
     def get_playlist_songs_side_effect(**kwargs):
-        pid = kwargs.get("PlaylistID")
+        if "PlaylistID" not in kwargs:
+            return list(mock_playlist_songs)
+        pid = kwargs["PlaylistID"]
         return [s for s in mock_playlist_songs if s.PlaylistID == pid]
 
     db.get_playlist_songs = MagicMock(side_effect=get_playlist_songs_side_effect)
@@ -208,7 +217,9 @@ def mock_db(mock_content_list, mock_playlists, mock_playlist_songs, mock_histori
     db.get_history = MagicMock(return_value=mock_histories)
 
     def get_history_songs_side_effect(**kwargs):
-        hid = kwargs.get("HistoryID")
+        if "HistoryID" not in kwargs:
+            return list(mock_history_songs)
+        hid = kwargs["HistoryID"]
         return [s for s in mock_history_songs if s.HistoryID == hid]
 
     db.get_history_songs = MagicMock(side_effect=get_history_songs_side_effect)
@@ -218,12 +229,41 @@ def mock_db(mock_content_list, mock_playlists, mock_playlist_songs, mock_histori
     db.create_playlist = MagicMock(return_value=MockPlaylist(ID=500, Name="New Playlist"))
     db.create_playlist_folder = MagicMock(return_value=MockPlaylist(ID=501, Name="New Folder"))
     db.delete_playlist = MagicMock()
+    db.playlist_xml = None  # no masterPlaylists6.xml
     db.commit = MagicMock()
     db.close = MagicMock()
+    db.get_local_usn = MagicMock(return_value=1000)
+    db.set_local_usn = MagicMock()
 
     return db
 
 
+@pytest.fixture
+def versioned_rows(
+    mock_playlists, mock_playlist_songs, mock_histories, mock_history_songs
+):
+    """Give every playlist and history row the ID and USN rekordbox stores."""
+    for i, row in enumerate(mock_history_songs):
+        row.ID = 3000 + i
+    for row in (
+        *mock_playlists,
+        *mock_playlist_songs,
+        *mock_histories,
+        *mock_history_songs,
+    ):
+        row.rb_local_usn = 1
+
+
+@pytest.fixture
+def make_row():
+    """Factory for TrackRows built from keyword content columns (BPM * 100)."""
+
+    def make(id, Title="", **columns):
+        return TrackRow.from_content(SimpleNamespace(ID=id, Title=Title, **columns))
+
+    return make
+
+
 @pytest.fixture
 def database(mock_db, tmp_path):
     """A RekordboxDatabase instance wired with mock db, ready to use."""
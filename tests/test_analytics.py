@@ -0,0 +1,232 @@
+"""Tests for vectorised library analytics."""
+
+from unittest.mock import patch
+
+import numpy as np
+
+import pytest
+
+from rekordbox_mcp.analytics import (
+    LibraryAggregates,
+    LibraryColumns,
+    check_dimensions,
+    distribution,
+    group_stats,
+)
+
+
+@pytest.fixture
+def make_columns(make_row):
+    def make(*specs):
+        return LibraryColumns(
+            [
+                make_row(i, GenreName=genre, ArtistName=artist, BPM=bpm)
+                for i, (genre, artist, bpm) in enumerate(specs)
+            ]
+        )
+
+    return make
+
+
+class TestGroupStats:
+    def test_mean_median_ignore_unknown_bpm(self, make_columns):
+        columns = make_columns(
+            ("House", "A", 12000),
+            ("House", "B", 12400),
+            ("House", "A", 13000),
+            ("House", "C", 0),
+            ("Techno", "D", 13000),
+            ("Techno", "D", 13400),
+        )
+        labels, stats = group_stats(columns, ["genre"])
+        by_label = {label[0]: i for i, label in enumerate(labels)}
+        house, techno = by_label["House"], by_label["Techno"]
+        assert stats["count"][house] == 4
+        assert stats["meanBpm"][house] == pytest.approx(124.6667, abs=1e-4)
+        assert stats["medianBpm"][house] == 124.0
+        assert stats["medianBpm"][techno] == 132.0
+        assert stats["distinctArtists"][house] == 3
+        assert stats["distinctArtists"][techno] == 1
+
+    def test_two_dimensions(self, make_columns):
+        columns = make_columns(("House", "A", 0), ("House", "A", 0), ("House", "B", 0))
+        labels, stats = group_stats(columns, ["genre", "artist"])
+        counts = dict(zip(labels, stats["count"].tolist()))
+        assert counts == {("House", "A"): 2, ("House", "B"): 1}
+
+    def test_empty_library(self, make_columns):
+        labels, stats = group_stats(make_columns(), ["genre", "bpm_bucket"])
+        assert labels == []
+        assert len(stats["count"]) == 0
+
+    def test_unknown_dimension(self):
+        with pytest.raises(ValueError, match="Unknown group_by colour"):
+            check_dimensions(["genre", "colour"])
+
+
+class TestAnalyzeLibrary:
+    async def test_single_dimension_keeps_mapping(self, database):
+        result = await database.analyze_library("genre", "count", 3)
+        assert result["group_by"] == "genre"
+        techno = result["results"]["Techno"]
+        assert techno["count"] == 2
+        assert techno["playCount"] == 48
+        assert techno["totalTime"] == 810
+        assert techno["meanBpm"] == techno["medianBpm"] == 140.0
+        assert techno["distinctArtists"] == 1
+
+    async def test_pivot_returns_rows(self, database):
+        result = await database.analyze_library("artist,genre", "count", 1)
+        assert result["group_by"] == ["artist", "genre"]
+        assert result["total_groups"] == 10
+        top = result["results"][0]
+        assert (top["artist"], top["genre"], top["count"]) == ("DJ Beta", "Techno", 2)
+
+    async def test_bpm_buckets(self, database):
+        result = await database.analyze_library(["bpm_bucket"], "count", 1)
+        assert result["results"] == {
+            "125-130": {
+                "count": 4,
+                "playCount": 75,
+                "totalTime": 1370,
+                "meanBpm": 127.0,
+                "medianBpm": 127.0,
+                "distinctArtists": 3,
+            }
+        }
+
+    async def test_invalid_arguments(self, database):
+        with pytest.raises(ValueError, match="Unknown aggregate_by"):
+            await database.analyze_library("genre", "loudness", 5)
+        with pytest.raises(ValueError, match="bpm_bucket"):
+            await database.analyze_library("bpm_bucket", "count", 5, bpm_bucket=0)
+
+
+@pytest.fixture
+def make_track(make_row):
+    def make(id, plays=0, added="", size=0, genre="House"):
+        return make_row(
+            id,
+            GenreName=genre,
+            DJPlayCount=plays,
+            DateCreated=added,
+            FileSize=size,
+            BPM=12000,
+        )
+
+    return make
+
+
+class TestLibraryAggregates:
+    def test_sync_patches_only_changes(self, make_track):
+        aggregates = LibraryAggregates()
+        rows = [make_track(1, 5, "2024-01-01", 100), make_track(2, 9, "2024-02-01", 50)]
+        assert aggregates.sync(rows) == {"added": 2, "updated": 0, "removed": 0}
+        assert aggregates.sync(rows) == {"added": 0, "updated": 0, "removed": 0}
+
+        changed = [make_track(1, 20, "2024-01-01", 100, genre="Techno"), make_track(3)]
+        assert aggregates.sync(changed) == {"added": 1, "updated": 1, "removed": 1}
+        summary = aggregates.summary()
+        assert summary["total_tracks"] == 2
+        assert summary["total_size_bytes"] == 100
+        assert summary["genre_distribution"] == {"Techno": 1, "House": 1}
+        assert summary["most_played_tracks"] == ["1"]
+        assert summary["recently_added_tracks"] == ["1"]
+        assert summary["average_bpm"] == 120.0
+
+    def test_cold_sync_orders_like_incremental(self, make_track):
+        rows = [
+            make_track(i, plays=i % 4, added=f"2024-0{i % 9 + 1}-01") for i in range(30)
+        ]
+        cold = LibraryAggregates()
+        cold.sync(rows)
+        incremental = LibraryAggregates()
+        incremental.sync(rows[:1])
+        incremental.sync(rows)
+        assert cold._by_plays == incremental._by_plays
+        assert cold._by_added == incremental._by_added
+
+        # Later syncs patch the sorted lists in place
+        cold.sync(rows[1:] + [make_track(0, plays=99, added="2025-01-01")])
+        assert cold.summary()["most_played_tracks"][0] == "0"
+        assert cold.summary()["recently_added_tracks"][0] == "0"
+
+    def test_empty(self):
+        summary = LibraryAggregates().summary()
+        assert summary["total_tracks"] == 0
+        assert summary["total_size_bytes"] is None
+        assert summary["average_bpm"] == 0
+
+
+class TestLibraryStats:
+    async def test_fills_every_field(self, database):
+        stats = await database.get_library_stats()
+        assert stats.total_tracks == 11
+        assert stats.key_distribution["5A"] == 2
+        assert stats.rating_distribution == {0: 2, 2: 1, 3: 3, 4: 3, 5: 2}
+        assert stats.most_played_tracks == ["5", "1", "2", "4", "9", "3", "10", "6"]
+        assert stats.recently_added_tracks[:2] == ["11", "10"]
+        assert stats.total_size_bytes is None
+
+    async def test_not_recomputed_until_content_changes(self, database):
+        await database.get_library_stats()
+        with patch.object(
+            LibraryAggregates, "sync", wraps=database._library_aggregates.sync
+        ) as sync:
+            await database.get_library_stats()
+            assert sync.call_count == 0
+
+            await database.remove_tracks_by_ids(["5"])
+            stats = await database.get_library_stats()
+            assert sync.call_count == 1
+        assert stats.total_tracks == 10
+        assert stats.most_played_tracks[0] == "1"
+
+
+class TestDistribution:
+    def test_unknown_zeros_excluded(self):
+        result = distribution(np.array([0, 120.0, 125.0, 130.0]), "bpm", bins=2)
+        assert (result["count"], result["unknown"]) == (3, 1)
+        assert (result["min"], result["max"], result["mean"]) == (120.0, 130.0, 125.0)
+        assert result["percentiles"]["p50"] == 125.0
+        assert result["histogram"]["counts"] == [1, 2]
+
+    def test_zero_is_a_value_for_play_count(self):
+        result = distribution(np.array([0, 0, 3]), "play_count")
+        assert (result["count"], result["unknown"], result["min"]) == (3, 0, 0)
+
+    def test_bin_width_aligns_edges(self):
+        result = distribution(np.array([121.0, 124.0, 130.0]), "bpm", bin_width=5)
+        assert result["histogram"] == {
+            "edges": [120.0, 125.0, 130.0, 135.0],
+            "counts": [2, 0, 1],
+        }
+
+    def test_empty(self):
+        result = distribution(np.array([0.0]), "bpm")
+        assert result["count"] == 0 and result["min"] is None
+
+
+class TestGetDistribution:
+    async def test_filters(self, database):
+        result = await database.get_distribution("bpm", genre="house")
+        assert result["count"] == 4
+        assert (result["min"], result["max"]) == (124.0, 128.0)
+        assert result["filters"] == {"genre": "house"}
+
+        result = await database.get_distribution(
+            "bpm", playlist_id="100", percentiles=[50]
+        )
+        assert result["count"] == 3
+        assert result["percentiles"] == {"p50": 126.0}
+
+        result = await database.get_distribution("bpm", genre="deep", playlist_id="100")
+        assert result["count"] == 1
+
+    async def test_invalid_arguments(self, database):
+        with pytest.raises(ValueError, match="Unknown column"):
+            await database.get_distribution("loudness")
+        with pytest.raises(ValueError, match="bins"):
+            await database.get_distribution("bpm", bins=0)
+        with pytest.raises(ValueError, match="more than"):
+            await database.get_distribution("bpm", bin_width=0.001)
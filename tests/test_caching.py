@@ -1,10 +1,15 @@
 """Tests for content caching and backup deduplication."""
 
+import asyncio
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 from unittest.mock import MagicMock, patch
 from pathlib import Path
 
+from rekordbox_mcp.cache import PayloadCache, TableCache
 from rekordbox_mcp.database import RekordboxDatabase
 
 
@@ -20,7 +25,7 @@ class TestContentCache:
 
     async def test_cache_miss_after_ttl(self, database, mock_db):
         """Cache should refresh after TTL expires."""
-        database._content_cache_ttl = 0.01  # 10ms TTL for testing
+        database._content_cache.ttl = 0.01  # 10ms TTL for testing
 
         await database.get_track_count()
         assert mock_db.get_content.call_count == 1
@@ -38,19 +43,77 @@ class TestContentCache:
         await database.get_track_count()
         assert mock_db.get_content.call_count == 2
 
-    async def test_mutation_invalidates_cache(self, database, mock_db):
-        """Mutation operations should invalidate the cache."""
-        # Prime the cache
+    async def test_related_rename_moves_version(self, database, mock_content_list):
+        """Renaming an artist leaves the content row's USN alone."""
+        database._content_cache.ttl = 0
+        await database.get_track_count()
+        version = database._content_cache.version
+        await database.get_track_count()
+        assert database._content_cache.version == version
+
+        mock_content_list[0].ArtistName = "DJ Renamed"
         await database.get_track_count()
+        assert database._content_cache.version == version + 1
+
+    async def test_playlist_mutation_keeps_content_cache(self, database, mock_db):
+        """Playlist mutations don't touch DjmdContent, so its cache survives."""
+        await database.get_track_count()
+        await database.get_playlists()
         assert mock_db.get_content.call_count == 1
+        assert mock_db.get_playlist_songs.call_count == 1
 
-        # Mutation should invalidate
         await database.add_track_to_playlist("100", "1")
-        assert database._content_cache is None
+        assert database._content_cache.data is not None
+        assert database._playlist_song_cache.data is None
+        assert database._playlist_cache.data is not None
 
-        # Next read should reload
         await database.get_track_count()
-        assert mock_db.get_content.call_count == 2
+        await database.get_playlists()
+        assert mock_db.get_content.call_count == 1
+        assert mock_db.get_playlist_songs.call_count == 2
+
+    async def test_create_playlist_only_invalidates_playlists(self, database):
+        await database.get_playlists()
+        await database.create_playlist("New")
+        assert database._playlist_cache.data is None
+        assert database._playlist_song_cache.data is not None
+
+    async def test_delete_playlist_invalidates_playlists_and_songs(self, database):
+        await database.get_playlists()
+        await database.delete_playlist("101")
+        assert database._playlist_cache.data is None
+        assert database._playlist_song_cache.data is None
+
+    async def test_import_invalidates_content_only(self, database, mock_db, tmp_path):
+        await database.get_track_count()
+        await database.get_playlists()
+        added = MagicMock()
+        added.ID = 4242
+        mock_db.add_content = MagicMock(return_value=added)
+        audio = tmp_path / "new.mp3"
+        audio.write_bytes(b"x")
+
+        await database.import_track(str(audio), auto_tag=False)
+        assert database._content_cache.data is None
+        assert database._playlist_song_cache.data is not None
+
+    async def test_remove_tracks_patches_content_in_place(self, database, mock_db):
+        await database.get_track_count()
+        version = database._content_cache.version
+
+        await database.remove_tracks_by_ids(["11"])
+        assert await database.get_track_count() == 10
+        full_loads = [c for c in mock_db.get_content.call_args_list if not c.kwargs]
+        assert len(full_loads) == 1
+        assert database._content_cache.version > version
+
+    async def test_playlists_load_membership_in_one_query(self, database, mock_db):
+        """Track counts come from one grouped query, not one per playlist."""
+        playlists = await database.get_playlists()
+        assert mock_db.get_playlist_songs.call_count == 1
+        counts = {p.id: p.track_count for p in playlists}
+        assert counts["100"] == 4
+        assert counts["101"] == 2
 
     async def test_filters_deleted_content(self, database):
         """Cache should not contain soft-deleted content."""
@@ -58,6 +121,207 @@ class TestContentCache:
         assert count == 11  # 12 total - 1 deleted
 
 
+def _expire(cache):
+    """Age a cache past its TTL without waiting."""
+    cache._loaded_at -= cache.ttl + 1
+
+
+class TestTableFingerprints:
+    async def test_unchanged_reload_keeps_history_structures(
+        self, database, mock_db, versioned_rows
+    ):
+        await database.get_history_stats()
+        plays = database._history_cache._derived["plays"]
+        version = database._history_cache.version
+
+        _expire(database._history_cache)
+        await database.get_history_stats()
+        assert mock_db.get_history_songs.call_count == 2
+        assert database._history_cache.version == version
+        assert database._history_cache._derived["plays"] is plays
+
+    async def test_changed_row_moves_version(
+        self, database, mock_playlist_songs, versioned_rows
+    ):
+        await database.get_playlists()
+        version = database._playlist_song_cache.version
+
+        mock_playlist_songs[0].rb_local_usn = 2
+        _expire(database._playlist_song_cache)
+        await database.get_playlists()
+        assert database._playlist_song_cache.version == version + 1
+
+    async def test_rows_without_usn_always_reload_as_new(self, database):
+        await database.get_playlists()
+        version = database._playlist_cache.version
+        _expire(database._playlist_cache)
+        await database.get_playlists()
+        assert database._playlist_cache.version == version + 1
+
+
+class TestTableCache:
+    def test_version_stable_when_fingerprint_unchanged(self):
+        data = [1, 2, 3]
+        cache = TableCache("t", lambda: list(data), ttl=0, fingerprint=tuple)
+        cache.get()
+        cache.get()
+        assert cache.version == 1
+
+        data.append(4)
+        cache.get()
+        assert cache.version == 2
+
+    def test_derive_rebuilt_per_version(self):
+        cache = TableCache("t", lambda: [1, 2, 3])
+        builds = []
+
+        def build(d):
+            builds.append(1)
+            return sum(d)
+
+        assert cache.derive("sum", build) == 6
+        assert cache.derive("sum", build) == 6
+        assert len(builds) == 1
+
+        cache.patch(lambda d: d + [4])
+        assert cache.derive("sum", build) == 10
+        assert len(builds) == 2
+
+    def test_concurrent_callers_share_one_build(self):
+        loads, builds = [], []
+
+        def load():
+            loads.append(1)
+            time.sleep(0.02)
+            return [1, 2, 3]
+
+        def build(d):
+            builds.append(1)
+            time.sleep(0.02)
+            return sum(d)
+
+        cache = TableCache("t", load)
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            results = list(pool.map(lambda _: cache.derive("sum", build), range(4)))
+        assert results == [6, 6, 6, 6]
+        assert len(loads) == len(builds) == 1
+
+    def test_nested_derive_uses_outer_snapshot(self):
+        data = [1, 2, 3]
+        cache = TableCache("t", lambda: list(data), ttl=0)
+
+        def build_total(d):
+            # The TTL of 0 would reload here, but the nested read stays pinned
+            data.append(100)
+            return (cache.derive("sum", sum), len(d))
+
+        assert cache.derive("total", build_total) == (6, 3)
+        assert cache._derived["total"][0] == cache._derived["sum"][0]
+
+
+class TestTrackPayloadCache:
+    async def test_payloads_shared_across_tools(self, database):
+        searched = await database.get_listing("search", {"artist": "DJ Alpha"})
+        ranked = await database.get_listing("most_played")
+        by_id = {item["id"]: item for item in ranked}
+        assert all(item is by_id[item["id"]] for item in searched)
+
+    async def test_changed_row_is_reserialised(self, database, mock_content_list):
+        for c in mock_content_list:
+            c.rb_local_usn = 1
+        first = await database.get_listing("playlist_tracks", {"playlist_id": "100"})
+
+        mock_content_list[0].rb_local_usn = 2
+        mock_content_list[0].Title = "Retitled"
+        database._invalidate_content_cache()
+        second = await database.get_listing("playlist_tracks", {"playlist_id": "100"})
+
+        assert second[0]["title"] == "Retitled"
+        assert second[1] is first[1]
+
+    async def test_related_rename_is_reserialised(self, database, mock_content_list):
+        for c in mock_content_list:
+            c.rb_local_usn = 7
+        first = await database.get_listing("playlist_tracks", {"playlist_id": "100"})
+        assert first[0]["artist"] == "DJ Alpha"
+
+        # Renaming the artist leaves the content row's USN at 7
+        mock_content_list[0].ArtistName = "Renamed Artist"
+        database._invalidate_content_cache()
+        second = await database.get_listing("playlist_tracks", {"playlist_id": "100"})
+
+        assert second[0]["artist"] == "Renamed Artist"
+        assert second[1] is first[1]
+
+    async def test_removed_tracks_dropped(self, database):
+        await database.get_listing("search")
+        await database.remove_tracks_by_ids(["1"])
+        assert "1" not in database._track_payloads._entries
+
+    def test_version_mismatch_misses(self):
+        cache = PayloadCache(maxsize=2)
+        cache.put("a", 1, {"id": "a"})
+        assert cache.get("a", 1) == {"id": "a"}
+        assert cache.get("a", 2) is None
+
+        cache.put("b", 1, {})
+        cache.put("c", 1, {})
+        assert len(cache) == 2
+        assert cache.get("a", 1) is None
+
+    def test_concurrent_eviction(self):
+        cache = PayloadCache(maxsize=8)
+
+        def churn(worker):
+            for i in range(2000):
+                key = (worker + i) % 16
+                if cache.get(key, i) is None:
+                    cache.put(key, i, {})
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            list(pool.map(churn, range(4)))
+        assert len(cache) == 8
+
+
+class TestSessionLock:
+    async def test_session_used_by_one_thread_at_a_time(self, database, mock_db):
+        """Warm-up stages and tool calls never query the session concurrently."""
+        active, peak = [0], [0]
+        counter = threading.Lock()
+
+        def track(method):
+            original = method.side_effect
+
+            def call(**kwargs):
+                with counter:
+                    active[0] += 1
+                    peak[0] = max(peak[0], active[0])
+                time.sleep(0.005)
+                try:
+                    return original(**kwargs)
+                finally:
+                    with counter:
+                        active[0] -= 1
+
+            method.side_effect = call
+
+        for method in (
+            mock_db.get_content,
+            mock_db.get_playlist,
+            mock_db.get_playlist_songs,
+            mock_db.get_history_songs,
+        ):
+            track(method)
+
+        await asyncio.gather(
+            database.warm_up(),
+            *(database.get_track_by_id(str(i)) for i in range(1, 9)),
+            database.get_playlists(),
+        )
+        assert database.warmup_status["state"] == "ready"
+        assert peak[0] == 1
+
+
 class TestBackupDedup:
     async def test_first_mutation_creates_backup(self, database, tmp_path):
         """First mutation should create a backup file."""
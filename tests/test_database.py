@@ -1,9 +1,16 @@
 """Tests for the database layer."""
 
 import pytest
+from datetime import datetime
+from types import SimpleNamespace
 from unittest.mock import patch, MagicMock
 from pathlib import Path
 
+try:
+    from pyrekordbox.masterdb.aux_files import MasterPlaylistXml
+except ImportError:  # pyrekordbox < 0.5
+    from pyrekordbox.db6.aux_files import MasterPlaylistXml
+
 from rekordbox_mcp.database import RekordboxDatabase
 from rekordbox_mcp.models import SearchOptions, LibraryStats
 
@@ -13,18 +20,41 @@ class TestConnection:
         """database_path should be passed as db_dir to Rekordbox6Database."""
         db = RekordboxDatabase()
         mock_rb = MagicMock()
-        mock_rb.get_content.return_value = []
+        mock_rb.get_content.return_value.filter_by.return_value.count.return_value = 0
 
         with patch("rekordbox_mcp.database.Rekordbox6Database", return_value=mock_rb) as mock_cls:
             await db.connect(database_path=tmp_path)
             mock_cls.assert_called_once_with(db_dir=str(tmp_path))
             assert db._connected is True
 
+    async def test_connect_counts_without_loading_rows(self, tmp_path):
+        """connect() logs a COUNT(*) of active tracks instead of loading them."""
+        db = RekordboxDatabase()
+        mock_rb = MagicMock()
+        query = mock_rb.get_content.return_value
+        query.filter_by.return_value.count.return_value = 42
+
+        with patch("rekordbox_mcp.database.Rekordbox6Database", return_value=mock_rb):
+            await db.connect(database_path=tmp_path)
+        query.filter_by.assert_called_once_with(rb_local_deleted=0)
+        query.__iter__.assert_not_called()
+        assert db._content_cache.data is None
+        # Commits must not expire the cached ORM rows
+        assert mock_rb.session.expire_on_commit is False
+
+    async def test_table_counts(self, database, mock_db):
+        mock_db.get_content = MagicMock()
+        mock_db.get_content.return_value.filter_by.return_value.count.return_value = 11
+        mock_db.get_playlist = MagicMock()
+        mock_db.get_playlist.return_value.filter_by.return_value.count.return_value = 3
+        assert await database.get_table_counts() == {"tracks": 11, "playlists": 3}
+        mock_db.get_playlist_songs.assert_not_called()
+
     async def test_connect_without_path(self):
         """Without path, auto-detect should be used."""
         db = RekordboxDatabase()
         mock_rb = MagicMock()
-        mock_rb.get_content.return_value = []
+        mock_rb.get_content.return_value.filter_by.return_value.count.return_value = 0
 
         with patch("rekordbox_mcp.database.Rekordbox6Database", return_value=mock_rb) as mock_cls, \
              patch.object(db, "_detect_database_path", return_value=Path("/fake/path")):
@@ -43,6 +73,28 @@ class TestConnection:
         assert await database.is_connected() is False
 
 
+class TestWarmUp:
+    async def test_builds_caches_in_stages(self, database, mock_db):
+        status = await database.warm_up()
+        assert status["state"] == "ready"
+        assert status["completed"] == [name for name, _ in database.WARMUP_STAGES]
+        assert set(status["timings_ms"]) == set(status["completed"])
+        assert database.warmup_status is status
+
+        loads = mock_db.get_content.call_count
+        await database.search_tracks(SearchOptions(genre="House"))
+        await database.get_history_stats()
+        assert mock_db.get_content.call_count == loads
+
+    async def test_failure_is_recorded(self, database, mock_db):
+        mock_db.get_history.side_effect = RuntimeError("locked")
+        with pytest.raises(RuntimeError, match="locked"):
+            await database.warm_up()
+        assert database.warmup_status["state"] == "failed"
+        assert database.warmup_status["stage"] == "history"
+        assert "playlists" in database.warmup_status["completed"]
+
+
 class TestDetectDatabasePath:
     def test_macos(self):
         db = RekordboxDatabase()
@@ -194,6 +246,20 @@ class TestRankedQueries:
         assert len(tracks) == 3
         assert tracks[0].rating >= tracks[1].rating
 
+    async def test_rankings_sorted_once_per_version(self, database):
+        await database.get_most_played_tracks(limit=3)
+        await database.get_top_rated_tracks(limit=3)
+        with patch("rekordbox_mcp.database.sorted", create=True) as resort:
+            most_played = await database.get_most_played_tracks(limit=5)
+            top_rated = await database.get_top_rated_tracks(limit=5)
+        resort.assert_not_called()
+        assert [t.id for t in most_played] == ["5", "1", "2", "4", "9"]
+        assert [t.rating for t in top_rated] == [5, 5, 4, 4, 4]
+
+        database._content_cache.patch(lambda content: [c for c in content if c.ID != 5])
+        tracks = await database.get_most_played_tracks(limit=1)
+        assert tracks[0].id == "1"
+
     async def test_unplayed(self, database):
         tracks = await database.get_unplayed_tracks()
         assert all(t.play_count == 0 for t in tracks)
@@ -493,3 +559,283 @@ class TestImportTrack:
 
         # Same file referenced three ways should be imported once
         assert result["summary"]["scanned"] == 1
+
+
+class TestApplyPlaylistOperations:
+    async def test_single_commit_and_backup(self, database, mock_db, tmp_path):
+        (tmp_path / "master.db").write_text("fake database")
+        result = await database.apply_playlist_operations(
+            [
+                {"op": "create", "name": "Crate", "ref": "crate"},
+                {"op": "add", "playlist_id": "$crate", "track_ids": ["1", "2"]},
+                {"op": "remove", "playlist_id": "100", "track_id": "5"},
+                {"op": "move", "playlist_id": "$crate", "parent_id": "102"},
+                {"op": "delete", "playlist_id": "101"},
+            ]
+        )
+        assert result["status"] == "success"
+        assert result["applied_count"] == 5
+        assert result["created"] == {"crate": "500"}
+        assert mock_db.commit.call_count == 1
+        assert mock_db.add_to_playlist.call_count == 2
+        mock_db.add_to_playlist.assert_any_call(500, 1)
+        mock_db.move_playlist.assert_called_once_with(500, parent=102, seq=None)
+        mock_db.delete_playlist.assert_called_once_with(101)
+        assert len(list(tmp_path.glob("master_backup_*.db"))) == 1
+
+    async def test_remove_renumbers_without_commit(
+        self, database, mock_db, mock_playlist_songs
+    ):
+        await database.apply_playlist_operations(
+            [{"op": "remove", "playlist_id": "100", "track_id": "1"}]
+        )
+        mock_db.delete.assert_called_once_with(mock_playlist_songs[0])
+        mock_db.remove_from_playlist.assert_not_called()
+        assert mock_playlist_songs[1].TrackNo == 1
+        assert mock_playlist_songs[2].TrackNo == 2
+        # Same USN bookkeeping as pyrekordbox: one tracked move, stamped rows
+        mock_db.registry.disabled.assert_called_once()
+        mock_db.registry.on_move.assert_called_once_with(mock_playlist_songs[1:4])
+        assert all(
+            isinstance(song.updated_at, datetime) for song in mock_playlist_songs[1:4]
+        )
+        assert mock_db.commit.call_count == 1
+
+    async def test_add_skips_existing_members(self, database, mock_db):
+        result = await database.apply_playlist_operations(
+            [{"op": "add", "playlist_id": "100", "track_ids": ["1", "2", "2", "5"]}]
+        )
+        assert result["results"][0]["track_ids"] == ["2"]
+        assert result["results"][0]["skipped"] == ["1", "2", "5"]
+        mock_db.add_to_playlist.assert_called_once_with(100, 2)
+
+    async def test_move_track_within_playlist(
+        self, database, mock_db, mock_playlist_songs
+    ):
+        result = await database.apply_playlist_operations(
+            [{"op": "move", "playlist_id": "100", "track_id": "3", "position": 1}]
+        )
+        assert result["results"][0]["position"] == 1
+        mock_db.move_song_in_playlist.assert_called_once_with(
+            100, mock_playlist_songs[2], 1
+        )
+
+    async def test_move_track_requires_position(self, database, mock_db):
+        mock_db.rollback = MagicMock()
+        result = await database.apply_playlist_operations(
+            [{"op": "move", "playlist_id": "100", "track_id": "3"}]
+        )
+        assert result["status"] == "rolled_back"
+        mock_db.move_song_in_playlist.assert_not_called()
+
+    async def test_create_folder(self, database, mock_db):
+        result = await database.apply_playlist_operations(
+            [
+                {"op": "create", "name": "Gigs", "is_folder": True, "ref": "gigs"},
+                {"op": "create", "name": "Friday", "parent_id": "$gigs"},
+            ]
+        )
+        assert result["created"] == {"gigs": "501"}
+        mock_db.create_playlist_folder.assert_called_once_with(name="Gigs", parent=None)
+        mock_db.create_playlist.assert_called_once_with(name="Friday", parent=501)
+
+    async def test_failure_rolls_back(self, database, mock_db):
+        mock_db.rollback = MagicMock()
+        result = await database.apply_playlist_operations(
+            [
+                {"op": "add", "playlist_id": "100", "track_id": "2"},
+                {"op": "remove", "playlist_id": "100", "track_id": "9"},
+                {"op": "delete", "playlist_id": "101"},
+            ]
+        )
+        assert result["status"] == "rolled_back"
+        assert result["failed_index"] == 1
+        assert result["results"][-1]["status"] == "error"
+        mock_db.rollback.assert_called_once()
+        mock_db.commit.assert_not_called()
+        mock_db.delete_playlist.assert_not_called()
+
+    async def test_failure_restores_playlist_xml(self, database, mock_db, tmp_path):
+        xml_path = tmp_path / "masterPlaylists6.xml"
+        xml_path.write_text(
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<MASTER_PLAYLIST Version="1.0.0" AutomaticSync="0">'
+            '<PRODUCT Name="rekordbox" Version="6.0.0" Company="AlphaTheta"/>'
+            "<PLAYLISTS>"
+            '<NODE Id="65" ParentId="0" Attribute="0" Timestamp="0" Lib_Type="0"'
+            ' CheckType="0"/>'
+            "</PLAYLISTS></MASTER_PLAYLIST>"
+        )
+        mock_db.playlist_xml = MasterPlaylistXml(path=xml_path)
+        mock_db.rollback = MagicMock()
+        # Like pyrekordbox, create and delete edit the XML straight away
+        def create_playlist(name, parent):
+            mock_db.playlist_xml.add(500, "root", 0, datetime.now())
+            return SimpleNamespace(ID=500, Name=name)
+
+        mock_db.create_playlist.side_effect = create_playlist
+        mock_db.delete_playlist.side_effect = mock_db.playlist_xml.remove
+
+        result = await database.apply_playlist_operations(
+            [
+                {"op": "create", "name": "Crate"},
+                {"op": "delete", "playlist_id": "101"},
+                {"op": "remove", "playlist_id": "100", "track_id": "9"},
+            ]
+        )
+
+        assert result["status"] == "rolled_back"
+        assert result["failed_index"] == 2
+        restored = mock_db.playlist_xml
+        assert restored.get(500) is None
+        assert restored.get(101) is not None
+        assert not restored.modified
+
+    async def test_unknown_reference_fails(self, database, mock_db):
+        mock_db.rollback = MagicMock()
+        result = await database.apply_playlist_operations(
+            [{"op": "add", "playlist_id": "$missing", "track_id": "1"}]
+        )
+        assert result["status"] == "rolled_back"
+        assert "missing" in result["message"]
+
+
+class TestBulkAddTracksToPlaylist:
+    async def test_single_executemany(self, database, mock_db):
+        result = await database.add_tracks_to_playlist("100", ["2", "1", "2", "999", "9"])
+
+        assert result["added"] == ["2", "9"]
+        assert [s["track_id"] for s in result["skipped"]] == ["1", "2"]
+        assert [f["track_id"] for f in result["failed"]] == ["999"]
+        mock_db.add_to_playlist.assert_not_called()
+        mock_db.session.execute.assert_called_once()
+
+        rows = mock_db.session.execute.call_args.args[1]
+        assert [r["ContentID"] for r in rows] == ["2", "9"]
+        assert [r["TrackNo"] for r in rows] == [5, 6]  # playlist 100 has 4 songs
+        assert [r["rb_local_usn"] for r in rows] == [1001, 1002]
+        assert len({r["ID"] for r in rows}) == 2
+        mock_db.set_local_usn.assert_called_once_with(1002)
+        mock_db.commit.assert_called_once()
+
+    async def test_nothing_to_insert(self, database, mock_db):
+        result = await database.add_tracks_to_playlist("101", ["2", "9"])
+        assert result["added"] == []
+        assert len(result["skipped"]) == 2
+        mock_db.session.execute.assert_not_called()
+
+    async def test_rejects_folder(self, database, mock_db):
+        mock_db.rollback = MagicMock()
+        with pytest.raises(RuntimeError, match="normal playlist"):
+            await database.add_tracks_to_playlist("102", ["1"])
+        mock_db.rollback.assert_called_once()
+
+
+class TestPagination:
+    async def test_pages_cover_full_result(self, database):
+        expected = await database.search_tracks(SearchOptions(limit=1000))
+        seen, cursor = [], None
+        while True:
+            page = await database.get_page("search", {}, cursor=cursor, page_size=3)
+            assert page["total_count"] == len(expected)
+            seen.extend(item["id"] for item in page["items"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+        assert seen == [t.id for t in expected]
+
+    async def test_cursor_carries_params(self, database):
+        first = await database.get_page("search", {"artist": "DJ Alpha"}, page_size=1)
+        assert first["total_count"] == 3
+        second = await database.get_page("search", cursor=first["next_cursor"])
+        assert second["offset"] == 1
+        assert second["items"][0]["artist"] == "DJ Alpha"
+
+    async def test_result_set_computed_once(self, database):
+        first = await database.get_page("most_played", page_size=2)
+        with patch.object(database, "_most_played_rows") as rebuild:
+            await database.get_page("most_played", cursor=first["next_cursor"])
+            rebuild.assert_not_called()
+
+    async def test_cursor_expires_when_library_changes(self, database):
+        from rekordbox_mcp.pagination import CursorError
+
+        first = await database.get_page("playlist_tracks", {"playlist_id": "100"}, page_size=1)
+        await database.add_track_to_playlist("100", "5")
+        with pytest.raises(CursorError, match="expired"):
+            await database.get_page("playlist_tracks", cursor=first["next_cursor"])
+
+    async def test_cursors_survive_unchanged_reload(self, database, versioned_rows):
+        listings = [
+            ("search", {}),
+            ("playlists", {}),
+            ("playlist_tracks", {"playlist_id": "100"}),
+            ("history_sessions", {}),
+            ("session_tracks", {"session_id": "201"}),
+        ]
+        cursors = {}
+        for name, params in listings:
+            first = await database.get_page(name, params, page_size=1)
+            cursors[name] = first["next_cursor"]
+
+        # Every cache reloads past its TTL and finds the same rows
+        for cache in (
+            database._content_cache,
+            database._playlist_cache,
+            database._playlist_song_cache,
+            database._history_cache,
+        ):
+            cache._loaded_at -= cache.ttl + 1
+
+        for name, cursor in cursors.items():
+            page = await database.get_page(name, cursor=cursor)
+            assert page["items"], name
+
+    async def test_invalid_cursor(self, database):
+        from rekordbox_mcp.pagination import CursorError
+
+        with pytest.raises(CursorError, match="Invalid"):
+            await database.get_page("search", cursor="not-a-cursor")
+
+    async def test_cursor_bound_to_listing(self, database):
+        from rekordbox_mcp.pagination import CursorError
+
+        first = await database.get_page("search", page_size=1)
+        with pytest.raises(CursorError, match="belongs to"):
+            await database.get_page("top_rated", cursor=first["next_cursor"])
+
+    async def test_history_sessions_newest_first(self, database):
+        page = await database.get_page("history_sessions", {"since": "2024-08-01"})
+        assert [s["id"] for s in page["items"]] == ["202", "201"]
+        assert page["next_cursor"] is None
+
+
+class TestFieldProjection:
+    async def test_projection_matches_full_tracks(self, database):
+        full = await database.search_tracks(SearchOptions(genre="House"))
+        projected = await database.get_listing(
+            "search", {"genre": "House"}, fields=["id", "title", "bpm"]
+        )
+        assert projected == [
+            {"id": t.id, "title": t.title, "bpm": t.bpm} for t in full
+        ]
+
+    async def test_projection_skips_track_construction(self, database):
+        with patch("rekordbox_mcp.rows.TrackRow.to_track") as build:
+            await database.get_listing("most_played", fields=["id", "play_count"], limit=3)
+            build.assert_not_called()
+
+    async def test_unknown_field_rejected(self, database):
+        with pytest.raises(ValueError, match="Unknown field"):
+            await database.get_listing("search", fields=["id", "nope"])
+
+    async def test_session_track_fields(self, database):
+        items = await database.get_listing(
+            "session_tracks", {"session_id": "201"}, fields=["title", "track_number"]
+        )
+        assert items[0] == {"title": "Deep House Groove", "track_number": 1}
+
+    async def test_cursor_keeps_projection(self, database):
+        first = await database.get_page("search", fields=["id"], page_size=2)
+        second = await database.get_page("search", cursor=first["next_cursor"])
+        assert all(set(item) == {"id"} for item in second["items"])
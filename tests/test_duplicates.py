@@ -0,0 +1,106 @@
+"""Tests for blocked duplicate detection."""
+
+from dataclasses import replace
+
+import pytest
+
+from rekordbox_mcp.duplicates import (
+    DuplicateBlocks,
+    artist_key,
+    choose_keeper,
+    title_key,
+)
+
+
+@pytest.fixture
+def make_titled(make_row):
+    def make(id, title, artist="A", length=300, **extra):
+        return make_row(id, Title=title, ArtistName=artist, Length=length, **extra)
+
+    return make
+
+
+class TestKeys:
+    def test_title_key(self):
+        assert title_key("Strobe (Original Mix)") == "strobe"
+        assert title_key("Strobe feat. Someone") == "strobe"
+        assert title_key("Café del Mar") == "cafe del mar"
+        assert title_key("Strobe (Dub Mix)") == "strobe dub mix"
+        assert title_key("Original") == "original"
+
+    def test_artist_key(self):
+        assert artist_key("B & A") == artist_key("A and B") == "a b"
+        assert artist_key("A feat. C") == "a c"
+
+
+class TestDuplicateBlocks:
+    def test_clusters_by_key_and_length(self, make_titled):
+        rows = [
+            make_titled(1, "Strobe", length=600),
+            make_titled(2, "Strobe (Original Mix)", length=601),
+            make_titled(3, "STROBE", length=603),
+            make_titled(4, "Strobe", length=640),
+            make_titled(5, "Strobe", artist="B", length=600),
+            make_titled(6, "", length=600),
+            make_titled(7, "", length=600),
+        ]
+        blocks = DuplicateBlocks(rows)
+        assert len(blocks.blocks) == 1
+        clusters = blocks.clusters()
+        assert [[r.id for r in c] for c in clusters] == [["1", "2", "3"]]
+        assert [[r.id for r in c] for c in blocks.clusters(0)] == []
+        assert len(blocks.clusters(100)[0]) == 4
+
+    def test_unknown_length_and_file_size(self, make_titled):
+        rows = [
+            make_titled(1, "X", length=0, FileSize=10),
+            make_titled(2, "X", length=0, FileSize=10),
+            make_titled(3, "X", length=1, FileSize=11),
+            make_titled(4, "X", length=2, FileSize=0),
+        ]
+        blocks = DuplicateBlocks(rows)
+        assert [[r.id for r in c] for c in blocks.clusters()] == [
+            ["1", "2"],
+            ["3", "4"],
+        ]
+        sized = blocks.clusters(match_file_size=True)
+        assert [[r.id for r in c] for c in sized] == [["1", "2"]]
+
+    def test_keeper(self, make_titled):
+        cluster = [
+            make_titled(1, "X", FolderPath="apple-music:1", BitRate=1411),
+            make_titled(2, "X", FolderPath="/a.mp3", BitRate=320, DJPlayCount=1),
+            make_titled(3, "X", FolderPath="/a.flac", BitRate=1411),
+        ]
+        assert choose_keeper(cluster).id == "3"
+        assert choose_keeper(cluster[:2]).id == "2"
+
+
+class TestFindDuplicateTracks:
+    async def test_reports_clusters(self, database, mock_content_list):
+        original = mock_content_list[0]
+        mock_content_list.append(
+            replace(
+                original,
+                ID=12,
+                Title="Deep House Groove (Original Mix)",
+                FolderPath="/music/deep_house_groove.flac",
+                BitRate=1411,
+                Length=361,
+            )
+        )
+        result = await database.find_duplicate_tracks()
+        assert result["summary"] == {
+            "cluster_count": 1,
+            "duplicate_track_count": 1,
+            "returned": 1,
+        }
+        (cluster,) = result["clusters"]
+        assert (cluster["keeper"], cluster["remove"]) == ("12", ["1"])
+        assert [t["id"] for t in cluster["tracks"]] == ["1", "12"]
+
+    async def test_no_duplicates(self, database):
+        result = await database.find_duplicate_tracks()
+        assert result["clusters"] == []
+        with pytest.raises(ValueError, match="length_tolerance"):
+            await database.find_duplicate_tracks(length_tolerance=-1)
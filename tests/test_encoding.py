@@ -0,0 +1,67 @@
+"""Tests for columnar response encoding."""
+
+import json
+
+import pytest
+
+from rekordbox_mcp.encoding import check_format, decode_columnar, encode_columnar
+
+
+class TestColumnar:
+    def test_round_trip(self):
+        items = [
+            {"id": "1", "genre": "House", "bpm": 124.0},
+            {"id": "2", "genre": "Techno", "bpm": 138.0},
+            {"id": "3", "genre": "House", "bpm": 126.0},
+        ]
+        encoded = encode_columnar(items)
+        assert encoded["columns"]["genre"] == [0, 1, 0]
+        assert encoded["dictionaries"]["genre"] == ["House", "Techno"]
+        assert encoded["columns"]["bpm"] == [124.0, 138.0, 126.0]
+        assert decode_columnar(encoded) == items
+
+    def test_field_order_and_empty(self):
+        encoded = encode_columnar([], ["id", "key"])
+        assert encoded["count"] == 0
+        assert list(encoded["columns"]) == ["id", "key"]
+        assert decode_columnar(encoded) == []
+
+    def test_smaller_than_rows(self):
+        items = [
+            {"id": str(i), "artist": "DJ Alpha", "genre": "House", "key": "5A"}
+            for i in range(200)
+        ]
+        assert len(json.dumps(encode_columnar(items))) < len(json.dumps(items)) / 2
+
+    def test_unknown_format(self):
+        with pytest.raises(ValueError, match="Unknown format"):
+            check_format("csv")
+
+
+class TestColumnarListings:
+    async def test_listing_matches_rows(self, database):
+        rows = await database.get_listing("playlist_tracks", {"playlist_id": "100"})
+        columnar = await database.get_listing(
+            "playlist_tracks", {"playlist_id": "100"}, format="columnar"
+        )
+        assert decode_columnar(columnar) == rows
+
+    async def test_session_tracks_columnar(self, database):
+        encoded = await database.get_listing(
+            "session_tracks", {"session_id": "201"}, format="columnar"
+        )
+        assert encoded["dictionaries"]["history_id"] == ["201"]
+        assert encoded["columns"]["track_number"] == [1, 2, 3]
+
+    async def test_cursor_keeps_format(self, database):
+        first = await database.get_page(
+            "search", fields=["id", "genre"], page_size=3, format="columnar"
+        )
+        assert first["items"]["format"] == "columnar"
+        second = await database.get_page("search", cursor=first["next_cursor"])
+        assert second["items"]["format"] == "columnar"
+        assert list(second["items"]["columns"]) == ["id", "genre"]
+
+    async def test_rejected_for_playlists(self, database):
+        with pytest.raises(ValueError, match="only supported for track"):
+            await database.get_listing("playlists", format="columnar")
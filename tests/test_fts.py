@@ -0,0 +1,127 @@
+"""Tests for the full-text search sidecar."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from rekordbox_mcp.fts import FullTextIndex, content_document, default_fulltext_path
+from rekordbox_mcp.models import SearchOptions
+
+
+def _content(id, title, artist="", usn=None, **extra):
+    return SimpleNamespace(
+        ID=id, Title=title, ArtistName=artist, rb_local_usn=usn, **extra
+    )
+
+
+@pytest.fixture
+def index(tmp_path):
+    fts = FullTextIndex(tmp_path / "fulltext.db")
+    yield fts
+    fts.close()
+
+
+LIBRARY = [
+    _content(1, "Deep House Groove", "DJ Alpha", usn=1),
+    _content(2, "House Deep Inside", "DJ Beta", usn=1),
+    _content(3, "Techno Blast", "DJ Alpha", usn=1, Commnt="warehouse closer"),
+    _content(4, "Technical Difficulties", "DJ Gamma", usn=1),
+]
+
+
+class TestFullTextIndex:
+    def test_document_columns(self):
+        content = _content(1, "T", "A", GenreName="G", LabelName="L", FolderPath="/p")
+        assert content_document(content) == ("T", "A", "", "G", "L", "", "/p")
+
+    def test_phrase_prefix_boolean(self, index):
+        index.sync(LIBRARY)
+        assert [cid for cid, _ in index.search('"deep house"')] == ["1"]
+        assert {cid for cid, _ in index.search("tech*")} == {"3", "4"}
+        assert {cid for cid, _ in index.search("house NOT groove")} == {"2"}
+        assert {cid for cid, _ in index.search("artist:alpha")} == {"1", "3"}
+        assert [cid for cid, _ in index.search("warehouse")] == ["3"]
+
+    def test_bm25_ranking(self, index):
+        index.sync(
+            [
+                _content(1, "Groove", "Someone", usn=1),
+                _content(2, "Groove Groove Groove", "Groove", usn=1),
+            ]
+            + [_content(i, f"Filler {i}", usn=1) for i in range(3, 8)]
+        )
+        ranked = index.search("groove")
+        assert ranked[0][0] == "2"
+        assert ranked[0][1] > ranked[1][1]
+
+    def test_incremental_sync(self, index):
+        assert index.sync(LIBRARY) == {"added": 4, "updated": 0, "removed": 0}
+        assert index.sync(LIBRARY) == {"added": 0, "updated": 0, "removed": 0}
+
+        changed = [_content(1, "Renamed Anthem", "DJ Alpha", usn=2)] + LIBRARY[1:3]
+        assert index.sync(changed) == {"added": 0, "updated": 1, "removed": 1}
+        assert index.search("groove") == []
+        assert [cid for cid, _ in index.search("anthem")] == ["1"]
+        assert index.search("difficulties") == []
+
+    def test_related_rename_resyncs(self, index):
+        artist = SimpleNamespace(Name="DJ Alpha")
+        content = SimpleNamespace(ID=1, Title="Groove", Artist=artist, rb_local_usn=7)
+        index.sync([content])
+
+        # Renaming the artist row leaves the content row and its USN as they were
+        artist.Name = "DJ Omega"
+        assert index.sync([content]) == {"added": 0, "updated": 1, "removed": 0}
+        assert [cid for cid, _ in index.search("omega")] == ["1"]
+        assert index.search("alpha") == []
+
+    def test_persists_between_opens(self, tmp_path):
+        path = tmp_path / "fulltext.db"
+        first = FullTextIndex(path)
+        first.sync(LIBRARY)
+        first.close()
+
+        reopened = FullTextIndex(path)
+        assert reopened.sync(LIBRARY)["added"] == 0
+        reopened.close()
+
+    def test_invalid_query(self, index):
+        with pytest.raises(ValueError, match="Invalid full-text query"):
+            index.search('"unterminated')
+
+    def test_default_path_from_env(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("REKORDBOX_MCP_FTS_PATH", str(tmp_path / "x.db"))
+        assert default_fulltext_path() == tmp_path / "x.db"
+
+
+class TestDatabaseFullTextSearch:
+    @pytest.fixture(autouse=True)
+    def sidecar(self, database, tmp_path):
+        database.fulltext_path = tmp_path / "fulltext.db"
+        yield
+        database._close_fulltext()
+
+    async def test_search_with_filters(self, database):
+        items = await database.fulltext_search(SearchOptions(query="deep*"))
+        assert {i["id"] for i in items} == {"1", "10"}
+        assert "score" in items[0]
+
+        items = await database.fulltext_search(
+            SearchOptions(query="deep*", bpm_max=121), fields=["id"]
+        )
+        assert items == [{"id": "10", "score": items[0]["score"]}]
+
+    async def test_syncs_on_content_change(self, database, mock_content_list):
+        for c in mock_content_list:
+            c.rb_local_usn = 1
+        await database.fulltext_search(SearchOptions(query="groove"))
+        mock_content_list[0].rb_local_usn = 2
+        mock_content_list[0].Title = "Renamed Anthem"
+        database._invalidate_content_cache()
+        assert await database.fulltext_search(SearchOptions(query="title:groove")) == []
+        items = await database.fulltext_search(SearchOptions(query="anthem"))
+        assert [i["id"] for i in items] == ["1"]
+
+    async def test_requires_query(self, database):
+        with pytest.raises(ValueError, match="requires a query"):
+            await database.fulltext_search(SearchOptions())
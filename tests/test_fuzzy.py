@@ -0,0 +1,71 @@
+"""Tests for fuzzy track search."""
+
+import pytest
+
+from rekordbox_mcp.fuzzy import FuzzyIndex, normalise, trigrams
+from rekordbox_mcp.models import SearchOptions
+
+
+@pytest.fixture
+def make_rows(make_row):
+    def make(*specs):
+        return [
+            make_row(i, Title=title, ArtistName=artist)
+            for i, (title, artist) in enumerate(specs)
+        ]
+
+    return make
+
+
+class TestNormalise:
+    def test_accents_and_case(self):
+        assert normalise("Café del Mar – Énergie") == ["cafe", "del", "mar", "energie"]
+
+    def test_trigrams_padded(self):
+        assert trigrams("ab") == {"$$a", "$ab", "ab$"}
+
+
+class TestFuzzyIndex:
+    def test_typo_matches_and_ranks(self, make_rows):
+        index = FuzzyIndex(
+            make_rows(
+                ("Something", "Solomun"),
+                ("Other", "Solomon Grey"),
+                ("Unrelated", "Tale Of Us"),
+            )
+        )
+        ranked = index.search("solomun")
+        assert [pos for pos, _ in ranked] == [0, 1]
+        assert ranked[0][1] == 1.0
+        assert 0.3 <= ranked[1][1] < 1.0
+
+    def test_multi_token_scores_average(self, make_rows):
+        index = FuzzyIndex(make_rows(("Deep Dub", "A"), ("Deep Space", "B")))
+        ranked = dict(index.search("deep dubb"))
+        assert ranked[0] > ranked[1]
+
+    def test_empty_query(self, make_rows):
+        assert FuzzyIndex(make_rows(("x", "y"))).search("  ") == []
+
+
+class TestDatabaseFuzzySearch:
+    async def test_misspelled_artist(self, database):
+        items = await database.fuzzy_search(SearchOptions(query="Epsilonn"))
+        assert items[0]["id"] == "6"
+        assert "score" in items[0]
+
+    async def test_filters_and_projection(self, database):
+        items = await database.fuzzy_search(
+            SearchOptions(query="technoo", bpm_min=140), fields=["id", "bpm"]
+        )
+        assert items and all(i["bpm"] >= 140 for i in items)
+        assert set(items[0]) == {"id", "bpm", "score"}
+
+    async def test_payload_cache_not_mutated(self, database):
+        await database.fuzzy_search(SearchOptions(query="groove"))
+        plain = await database.get_listing("search", {"query": "groove"})
+        assert "score" not in plain[0]
+
+    async def test_requires_query(self, database):
+        with pytest.raises(ValueError, match="requires a query"):
+            await database.fuzzy_search(SearchOptions())
@@ -0,0 +1,180 @@
+"""Tests for history analytics."""
+
+from datetime import datetime
+from types import SimpleNamespace
+
+from unittest.mock import patch
+
+import pytest
+
+from rekordbox_mcp.history import (
+    PlayFrequency,
+    SessionIndex,
+    TransitionGraph,
+    date_range,
+    session_month,
+)
+
+
+def _session(id, date, attribute=0):
+    return SimpleNamespace(ID=id, DateCreated=date, Attribute=attribute)
+
+
+def _songs(*content_ids):
+    return [SimpleNamespace(ContentID=c) for c in content_ids]
+
+
+class TestPlayFrequency:
+    def test_session_month(self):
+        assert session_month(_session(1, "2024-08-15 22:00:00")) == "2024-08"
+        assert session_month(_session(1, datetime(2024, 9, 1))) == "2024-09"
+        assert session_month(_session(1, None)) is None
+
+    def test_incremental_sync(self):
+        plays = PlayFrequency()
+        histories = [_session(1, "2024-08-01"), _session(9, "2024", attribute=1)]
+        songs = {"1": _songs(10, 11, 10)}
+        assert plays.sync(histories, songs) == {"added": 1, "updated": 0, "removed": 0}
+        assert plays.sync(histories, songs) == {"added": 0, "updated": 0, "removed": 0}
+        assert plays.track_plays == {"10": 2, "11": 1}
+
+        histories.append(_session(2, "2024-09-01"))
+        songs["2"] = _songs(11)
+        songs["1"] = _songs(10)
+        assert plays.sync(histories, songs) == {"added": 1, "updated": 1, "removed": 0}
+        assert plays.track_plays == {"10": 1, "11": 1}
+        assert plays.month_sessions == {"2024-08": 1, "2024-09": 1}
+
+        assert plays.sync(histories[1:], songs)["removed"] == 1
+        assert plays.track_plays == {"11": 1}
+        assert plays.month_plays == {"2024-09": 1}
+
+
+class TestHistoryStats:
+    async def test_fills_play_fields(
+        self, database, mock_histories, mock_history_songs
+    ):
+        mock_histories.append(_session(203, "2024-09-20 20:00:00"))
+        mock_history_songs.extend(
+            SimpleNamespace(HistoryID=203, ContentID=9, TrackNo=n) for n in (1, 2)
+        )
+
+        stats = await database.get_history_stats()
+        assert stats.total_sessions == 3
+        assert stats.total_tracks_played == 7
+        assert stats.most_played_track["id"] == "9"
+        assert stats.most_played_track["play_count"] == 3
+        assert stats.favorite_genres[0] == {"genre": "Techno", "play_count": 4}
+        assert stats.sessions_by_month == {"2024-08": 1, "2024-09": 2}
+        assert stats.plays_by_month == {"2024-08": 3, "2024-09": 4}
+
+    async def test_cached_until_history_changes(self, database, mock_history_songs):
+        first = await database.get_history_stats()
+        assert (await database.get_history_stats()) == first
+
+        mock_history_songs.append(
+            SimpleNamespace(HistoryID=202, ContentID=1, TrackNo=3)
+        )
+        database._history_cache.invalidate()
+        stats = await database.get_history_stats()
+        assert stats.total_tracks_played == first.total_tracks_played + 1
+
+
+class TestSessionIndex:
+    def test_range_is_most_recent_first(self):
+        index = SessionIndex(
+            [
+                _session(1, "2024-08-15 22:00:00"),
+                _session(2, None),
+                _session(3, datetime(2024, 9, 1, 21)),
+                _session(4, "2024-08-01"),
+                _session(5, "2024-08-15 22:00:00"),
+                _session(6, "not a date"),
+            ]
+        )
+        assert len(index) == 6
+        assert [h.ID for h in index.all()] == [3, 1, 5, 4, 2, 6]
+        august = index.between(*date_range(year="2024", month="8"))
+        assert [h.ID for h in august] == [1, 5, 4]
+        assert [h.ID for h in index.between(datetime(2024, 8, 15))] == [3, 1, 5]
+        assert index.between(datetime(2025, 1, 1)) == []
+
+    def test_date_range(self):
+        assert date_range(year="2024", month="12") == (
+            datetime(2024, 12, 1),
+            datetime(2025, 1, 1),
+        )
+        assert date_range(since="2024-03-01", year="2024") == (
+            datetime(2024, 3, 1),
+            datetime(2025, 1, 1),
+        )
+        assert date_range(month="08") == (None, None)
+        with pytest.raises(ValueError, match="Invalid year"):
+            date_range(year="24")
+
+
+class TestSessionListings:
+    async def test_filters_use_index(self, database):
+        sessions = await database.get_listing(
+            "history_sessions", {"year": "2024", "month": "09"}
+        )
+        assert [s["id"] for s in sessions] == ["202"]
+        since = await database.get_listing("history_sessions", {"since": "2024-08-15"})
+        assert [s["id"] for s in since] == ["202", "201"]
+
+    async def test_only_returned_sessions_are_built(self, database):
+        with patch.object(
+            database,
+            "_build_history_session",
+            wraps=database._build_history_session,
+        ) as build:
+            sessions = await database.get_listing(
+                "history_sessions", {"year": "2024"}, limit=1
+            )
+        assert [s["id"] for s in sessions] == ["202"]
+        assert build.call_count == 1
+
+
+class TestTransitionGraph:
+    def test_counts_consecutive_pairs(self):
+        graph = TransitionGraph()
+        histories = [_session(1, "2024-08-01"), _session(2, "2024-08-02")]
+        songs = {"1": _songs(10, 11, 12), "2": _songs(10, 11, 11, 13)}
+        graph.sync(histories, songs)
+        assert graph.neighbours("10") == [("11", 2)]
+        assert graph.neighbours("11") == [("12", 1), ("13", 1)]
+        assert graph.neighbours("11", "previous") == [("10", 2)]
+        assert graph.total_transitions == 4
+
+    def test_incremental_sync_removes_edges(self):
+        graph = TransitionGraph()
+        histories = [_session(1, "2024-08-01")]
+        graph.sync(histories, {"1": _songs(10, 11)})
+        histories.append(_session(2, "2024-08-02"))
+        result = graph.sync(histories, {"1": _songs(10, 12), "2": _songs(11, 10)})
+        assert result == {"added": 1, "updated": 1, "removed": 0}
+        assert graph.neighbours("10") == [("12", 1)]
+        assert graph.neighbours("10", "previous") == [("11", 1)]
+        assert graph.sync([], {})["removed"] == 2
+        assert graph.outgoing == graph.incoming == {}
+        assert graph.total_transitions == 0
+
+
+class TestGetTransitions:
+    async def test_next_and_previous(self, database):
+        result = await database.get_transitions("2")
+        assert result["track"]["title"] == "Techno Blast"
+        assert result["total"] == 1
+        (step,) = result["transitions"]
+        assert (step["id"], step["count"]) == ("5", 1)
+        assert step["bpm_delta"] == -12.0
+        assert step["key_distance"] == 4
+
+        previous = await database.get_transitions("2", direction="previous")
+        assert [t["id"] for t in previous["transitions"]] == ["1"]
+
+    async def test_unplayed_and_invalid(self, database):
+        result = await database.get_transitions("7")
+        assert (result["total"], result["transitions"]) == (0, [])
+        with pytest.raises(ValueError, match="direction"):
+            await database.get_transitions("1", direction="sideways")
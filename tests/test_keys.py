@@ -0,0 +1,28 @@
+"""Tests for musical key parsing."""
+
+from rekordbox_mcp.keys import camelot, camelot_name, key_distance
+
+
+class TestCamelot:
+    def test_camelot_and_classical_names(self):
+        assert camelot("8A") == (8, "A")
+        assert camelot("12b") == (12, "B")
+        assert camelot("Am") == (8, "A")
+        assert camelot("F#m") == camelot("Gbm") == (11, "A")
+        assert camelot("Db") == (3, "B")
+        assert camelot("E minor") == (9, "A")
+        assert camelot_name("C maj") == "8B"
+
+    def test_unrecognised(self):
+        assert camelot("") is None
+        assert camelot(None) is None
+        assert camelot("13A") is None
+        assert camelot_name("H") is None
+
+    def test_distance(self):
+        assert key_distance("8A", "Am") == 0
+        assert key_distance("8A", "9A") == 1
+        assert key_distance("8A", "8B") == 1
+        assert key_distance("12A", "1A") == 1
+        assert key_distance("5A", "8B") == 4
+        assert key_distance("5A", "") is None
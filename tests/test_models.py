@@ -63,6 +63,13 @@ class TestSearchOptions:
         with pytest.raises(ValidationError):
             SearchOptions(rating_min=4, rating_max=2)
 
+    def test_extended_range_validation(self):
+        with pytest.raises(ValidationError):
+            SearchOptions(play_count_min=10, play_count_max=5)
+        with pytest.raises(ValidationError):
+            SearchOptions(date_added_from="2024-05-01", date_added_to="2024-01-01")
+        assert SearchOptions(year_min=2000, year_max=2000).year_max == 2000
+
     def test_limit_bounds(self):
         with pytest.raises(ValidationError):
             SearchOptions(limit=0)
@@ -0,0 +1,56 @@
+"""Tests for internal track rows."""
+
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from rekordbox_mcp.models import SearchOptions, Track
+from rekordbox_mcp.rows import TRACK_FIELDS, TrackRow
+
+
+class TestTrackRow:
+    def test_matches_track_fields(self, mock_content_list):
+        row = TrackRow.from_content(mock_content_list[0])
+        track = row.to_track()
+        assert isinstance(track, Track)
+        assert track.model_dump() == row.as_dict()
+        assert row.bpm == 124.0
+        assert row.artist == "DJ Alpha"
+
+    def test_related_name_fallback(self):
+        content = SimpleNamespace(
+            ID=9, Title=None, Artist=SimpleNamespace(Name="Via Relation"), Key=None
+        )
+        row = TrackRow.from_content(content)
+        assert row.title == ""
+        assert row.artist == "Via Relation"
+        assert row.key == ""
+        assert row.album == ""
+
+    def test_slotted(self, mock_content_list):
+        row = TrackRow.from_content(mock_content_list[0])
+        assert not hasattr(row, "__dict__")
+        assert TrackRow.__slots__[: len(TRACK_FIELDS)] == TRACK_FIELDS
+        assert tuple(TrackRow.__annotations__) == TrackRow.__slots__
+        with pytest.raises(AttributeError):
+            row.unknown = 1
+
+    def test_projection(self, mock_content_list):
+        row = TrackRow.from_content(mock_content_list[1])
+        assert row.as_dict(["id", "key"]) == {"id": "2", "key": "8B"}
+
+
+class TestHotPathValidation:
+    async def test_search_validates_only_returned_rows(self, database):
+        with patch.object(TrackRow, "to_track", autospec=True) as to_track:
+            await database.search_tracks(SearchOptions(limit=2))
+            assert to_track.call_count == 2
+
+    async def test_rows_built_once_per_content_version(self, database):
+        with patch.object(
+            TrackRow, "from_content", wraps=TrackRow.from_content
+        ) as build:
+            await database.search_tracks(SearchOptions(query="House"))
+            await database.get_most_played_tracks(5)
+            assert build.call_count == await database.get_track_count()
@@ -0,0 +1,161 @@
+"""Tests for the search planner."""
+
+from types import SimpleNamespace
+
+import pytest
+from unittest.mock import patch
+
+from rekordbox_mcp.models import SearchOptions
+from rekordbox_mcp.rows import TrackRow
+from rekordbox_mcp.search import (
+    Contains,
+    Equals,
+    Range,
+    SearchIndex,
+    SearchPlan,
+    predicates_from_options,
+)
+
+
+def _naive(rows, options):
+    """Reference implementation: test every predicate on every row."""
+    predicates = predicates_from_options(options)
+    return [r for r in rows if all(p.test(r) for p in predicates)]
+
+
+@pytest.fixture
+def library():
+    genres = ["House", "Deep House", "Techno", "Trance"]
+    content = [
+        SimpleNamespace(
+            ID=i,
+            Title=f"Track {i}",
+            ArtistName=f"Artist {i % 7}",
+            GenreName=genres[i % 4],
+            KeyName=f"{i % 12 + 1}A",
+            BPM=11000 + (i * 53) % 4000,
+            Rating=i % 6,
+            AlbumName=f"Album {i % 5}",
+            ReleaseYear=1990 + i % 30 if i % 10 else None,
+            Length=120 + i,
+        )
+        for i in range(300)
+    ]
+    return SearchIndex([TrackRow.from_content(c) for c in content])
+
+
+class TestPlanner:
+    def test_matches_naive_scan(self, library):
+        option_sets = [
+            SearchOptions(genre="house"),
+            SearchOptions(key="5A", bpm_min=120),
+            SearchOptions(artist="artist 3", rating_min=4, bpm_max=130),
+            SearchOptions(query="track 1", genre="techno"),
+            SearchOptions(title="7", key="8A", bpm_min=110, bpm_max=140),
+            SearchOptions(album="album 2", year_min=2000),
+            SearchOptions(year_max=1995, rating_max=2, length_min=200),
+            SearchOptions(play_count_max=0, genre="trance"),
+            SearchOptions(),
+        ]
+        for options in option_sets:
+            plan = SearchPlan(library, predicates_from_options(options))
+            assert plan.execute() == _naive(library.rows, options), options
+
+    def test_most_selective_index_first(self, library):
+        plan = SearchPlan(
+            library,
+            [Contains("genre", "house"), Equals("key", "5A"), Range("bpm", 110, 150)],
+        )
+        plan.execute()
+        assert plan.steps[0]["predicate"] == "key = '5A'"
+        assert plan.steps[0]["access"] == "index"
+        assert plan.steps[0]["remaining"] == 25
+
+    def test_unselective_index_falls_back_to_filter(self, library):
+        plan = SearchPlan(library, [Equals("key", "5A"), Range("bpm", 0, 1000)])
+        steps = plan.explain()["steps"]
+        assert [s["access"] for s in steps] == ["index", "filter"]
+
+    def test_explain_reports_counts(self, library):
+        options = SearchOptions(query="track", genre="trance", rating_min=5)
+        report = SearchPlan(library, predicates_from_options(options)).explain()
+        assert report["total_rows"] == 300
+        assert report["full_scan"] is False
+        assert report["steps"][-1]["access"] == "filter"
+        assert report["matched"] == len(_naive(library.rows, options))
+
+    def test_full_scan_without_indexed_predicates(self, library):
+        report = SearchPlan(
+            library, predicates_from_options(SearchOptions(query="track 29"))
+        ).explain()
+        assert report["full_scan"] is True
+        assert report["matched"] == 11
+
+    def test_unknown_year_excluded(self, library):
+        options = SearchOptions(year_max=2030)
+        matched = SearchPlan(library, predicates_from_options(options)).execute()
+        assert len(matched) == 270
+        assert all(row.year for row in matched)
+
+
+class TestExtendedFilters:
+    async def test_play_count_range(self, database):
+        unplayed = await database.search_tracks(SearchOptions(play_count_max=0))
+        assert {t.id for t in unplayed} == {"7", "8", "11"}
+        busy = await database.search_tracks(SearchOptions(play_count_min=30))
+        assert {t.id for t in busy} == {"1", "2", "5"}
+
+    async def test_rating_max(self, database):
+        tracks = await database.search_tracks(SearchOptions(rating_max=2, limit=100))
+        assert tracks and all(t.rating <= 2 for t in tracks)
+
+    async def test_length_and_bitrate(self, database):
+        tracks = await database.search_tracks(
+            SearchOptions(length_min=400, bitrate_min=320, limit=100)
+        )
+        assert {t.id for t in tracks} == {"2", "5", "7", "10"}
+
+    async def test_date_added_inclusive(self, database):
+        tracks = await database.search_tracks(
+            SearchOptions(date_added_from="2024-08-15", date_added_to="2024-10-10")
+        )
+        assert {t.id for t in tracks} == {"8", "9", "10"}
+
+
+class TestExplainSearch:
+    async def test_database_explain(self, database):
+        report = await database.explain_search(SearchOptions(key="5A", genre="house"))
+        assert report["matched"] == 2
+        assert {s["predicate"] for s in report["steps"]} == {
+            "key = '5A'",
+            "genre contains 'house'",
+        }
+
+
+class TestLazyPipeline:
+    def test_stops_after_limit(self, library):
+        tested = []
+        predicate = predicates_from_options(SearchOptions(query="track"))[0]
+        original = predicate.test
+        predicate.test = lambda row: tested.append(row) or original(row)
+
+        rows = SearchPlan(library, [predicate]).iter_rows()
+        first = [next(rows) for _ in range(5)]
+        assert len(first) == 5
+        assert len(tested) == 5
+
+    def test_count_matches_execute(self, library):
+        plan = SearchPlan(
+            library, predicates_from_options(SearchOptions(genre="house"))
+        )
+        assert plan.count() == len(plan.execute()) == 150
+
+    async def test_limited_listing_not_fully_evaluated(self, database):
+        with patch("rekordbox_mcp.rows.TrackRow.to_track") as to_track:
+            await database.get_unplayed_tracks(limit=1)
+            assert to_track.call_count == 1
+        assert database._result_sets._entries == {}
+
+    async def test_count_listing(self, database):
+        assert await database.count_listing("search", {"genre": "house"}) == 4
+        assert await database.count_listing("filename", {"filename": "techno"}) == 2
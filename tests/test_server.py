@@ -1,5 +1,7 @@
 """Tests for MCP server tool handlers."""
 
+import asyncio
+
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -20,9 +22,15 @@ def reset_server_globals():
     import rekordbox_mcp.server as srv
     srv.db = None
     srv._db_initialized = False
+    srv._startup_task = None
+    srv._warmup_task = None
+    srv._startup_status.clear()
+    srv._startup_status["state"] = "pending"
     yield
     srv.db = None
     srv._db_initialized = False
+    srv._startup_task = None
+    srv._warmup_task = None
 
 
 @pytest.fixture
@@ -42,13 +50,13 @@ class TestEnsureDatabaseConnected:
         mock_rdb = MagicMock()
         mock_rdb.connect = AsyncMock()
         mock_rdb.is_connected = AsyncMock(return_value=True)
-        mock_rdb.get_track_count = AsyncMock(return_value=100)
-        mock_rdb.get_playlists = AsyncMock(return_value=[])
+        mock_rdb.get_table_counts = AsyncMock(return_value={"tracks": 100, "playlists": 0})
 
         with patch("rekordbox_mcp.server.RekordboxDatabase", return_value=mock_rdb):
             await srv.ensure_database_connected()
             assert srv._db_initialized is True
             mock_rdb.connect.assert_called_once()
+            mock_rdb.get_playlists.assert_not_called()
 
     async def test_skips_if_already_connected(self, mock_server_db):
         """Should not reinitialize if already connected."""
@@ -59,6 +67,56 @@ class TestEnsureDatabaseConnected:
             # Should not have tried to reconnect
 
 
+class TestBackgroundStartup:
+    async def test_tools_wait_for_background_start(self, database):
+        import rekordbox_mcp.server as srv
+
+        with patch("rekordbox_mcp.server.RekordboxDatabase", return_value=database), \
+             patch.object(database, "connect", new=AsyncMock()) as connect, \
+             patch.object(database, "get_table_counts", new=AsyncMock(return_value={"tracks": 11, "playlists": 2})):
+            srv.start_background_initialization()
+            assert srv.start_background_initialization() is srv._startup_task
+            await srv.ensure_database_connected()
+            connect.assert_called_once()
+
+        # Tools only wait for the connection; the warm-up carries on
+        assert srv._startup_task is None
+        assert srv._startup_status["state"] == "warming"
+        await srv._warmup_task
+        assert srv._startup_status["state"] == "ready"
+        assert database.warmup_status["state"] == "ready"
+        with patch.object(database, "get_table_counts", new=AsyncMock(return_value={"tracks": 11, "playlists": 2})):
+            status = await _get_fn(srv.database_status)()
+        assert "Total tracks: 11" in status
+        assert "Caches ready in" in status
+
+    async def test_status_does_not_wait_for_content_cache(self, mock_server_db):
+        import rekordbox_mcp.server as srv
+
+        counts = AsyncMock(return_value={"tracks": 11, "playlists": 2})
+        with patch.object(mock_server_db, "get_table_counts", new=counts), \
+             patch.object(mock_server_db, "get_track_count") as full_count:
+            status = await _get_fn(srv.database_status)()
+        assert "Total tracks: 11" in status
+        full_count.assert_not_called()
+        assert mock_server_db._content_cache.data is None
+
+    async def test_failed_start_is_retried(self):
+        import rekordbox_mcp.server as srv
+
+        mock_rdb = MagicMock()
+        mock_rdb.connect = AsyncMock(side_effect=RuntimeError("no key"))
+        mock_rdb.is_connected = AsyncMock(return_value=False)
+
+        with patch("rekordbox_mcp.server.RekordboxDatabase", return_value=mock_rdb):
+            srv.start_background_initialization()
+            await asyncio.sleep(0)
+            with pytest.raises(RuntimeError, match="initialization failed"):
+                await srv.ensure_database_connected()
+        assert mock_rdb.connect.call_count == 2
+        assert srv._startup_status["state"] == "failed"
+
+
 class TestSearchTracksTool:
     async def test_returns_list_of_dicts(self, mock_server_db):
         import rekordbox_mcp.server as srv
@@ -113,3 +171,103 @@ class TestLibraryStatsTool:
         result = await fn()
         assert isinstance(result, dict)
         assert "total_tracks" in result
+
+
+class TestPaginatedTools:
+    async def test_page_size_returns_envelope(self, mock_server_db):
+        import rekordbox_mcp.server as srv
+        fn = _get_fn(srv.get_tracks_by_key)
+        page = await fn(key="5A", page_size=1)
+        assert set(page) >= {"items", "next_cursor", "total_count"}
+        assert page["total_count"] == 2
+
+        rest = await fn(key="ignored", cursor=page["next_cursor"])
+        assert rest["items"][0]["key"] == "5A"
+        assert rest["next_cursor"] is None
+
+    async def test_without_pagination_returns_list(self, mock_server_db):
+        import rekordbox_mcp.server as srv
+        fn = _get_fn(srv.get_session_tracks)
+        assert isinstance(await fn("201"), list)
+
+    async def test_fields_projects_items(self, mock_server_db):
+        import rekordbox_mcp.server as srv
+        fn = _get_fn(srv.get_playlist_tracks)
+        result = await fn("100", fields=["id", "artist"])
+        assert result and all(set(r) == {"id", "artist"} for r in result)
+
+    async def test_columnar_format(self, mock_server_db):
+        import rekordbox_mcp.server as srv
+        fn = _get_fn(srv.search_tracks)
+        result = await fn(artist="DJ Alpha", fields=["id", "artist"], format="columnar")
+        assert result["count"] == 3
+        assert result["dictionaries"]["artist"] == ["DJ Alpha"]
+
+    async def test_search_explain(self, mock_server_db):
+        import rekordbox_mcp.server as srv
+        fn = _get_fn(srv.search_tracks)
+        result = await fn(key="5A", explain=True)
+        assert result["plan"]["steps"][0]["access"] == "index"
+        assert len(result["results"]) == 2
+
+    async def test_search_extended_filters(self, mock_server_db):
+        import rekordbox_mcp.server as srv
+        fn = _get_fn(srv.search_tracks)
+        result = await fn(genre="house", play_count_max=0, fields=["id"])
+        assert {r["id"] for r in result} == {"8", "11"}
+
+    async def test_search_include_total(self, mock_server_db):
+        import rekordbox_mcp.server as srv
+        fn = _get_fn(srv.search_tracks)
+        result = await fn(genre="house", limit=2, include_total=True)
+        assert len(result["results"]) == 2
+        assert result["total_count"] == 4
+
+
+class TestAnalyticsTools:
+    async def test_get_distribution(self, mock_server_db):
+        import rekordbox_mcp.server as srv
+        fn = _get_fn(srv.get_distribution)
+        result = await fn(column="length", bin_width=60)
+        assert result["count"] == 11
+        assert sum(result["histogram"]["counts"]) == 11
+
+    async def test_suggest_next_tracks(self, mock_server_db):
+        import rekordbox_mcp.server as srv
+        fn = _get_fn(srv.suggest_next_tracks)
+        result = await fn(track_id="1", fields=["id"])
+        (suggestion,) = result["suggestions"]
+        assert (suggestion["id"], suggestion["key_distance"]) == ("5", 0)
+
+    async def test_find_similar_tracks(self, mock_server_db):
+        import rekordbox_mcp.server as srv
+        fn = _get_fn(srv.find_similar_tracks)
+        result = await fn(track_id="1", k=3, fields=["id"])
+        assert [r["id"] for r in result["results"]] == ["5", "11", "9"]
+
+    async def test_find_duplicate_tracks(self, mock_server_db):
+        import rekordbox_mcp.server as srv
+        fn = _get_fn(srv.find_duplicate_tracks)
+        result = await fn(length_tolerance=0)
+        assert result["summary"]["cluster_count"] == 0
+
+
+class TestHistorySessionTools:
+    async def test_recent_sessions(self, mock_server_db):
+        import rekordbox_mcp.server as srv
+        fn = _get_fn(srv.get_recent_sessions)
+        result = await fn(days=100_000)
+        assert [s["id"] for s in result] == ["202", "201"]
+        assert result[0]["track_count"] == 2
+
+    async def test_search_sessions_by_month(self, mock_server_db):
+        import rekordbox_mcp.server as srv
+        fn = _get_fn(srv.search_history_sessions)
+        result = await fn(year="2024", month="8", min_tracks=3)
+        assert [s["id"] for s in result] == ["201"]
+
+    async def test_get_transitions(self, mock_server_db):
+        import rekordbox_mcp.server as srv
+        fn = _get_fn(srv.get_transitions)
+        result = await fn(track_id="1")
+        assert [(t["id"], t["count"]) for t in result["transitions"]] == [("2", 1)]
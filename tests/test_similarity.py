@@ -0,0 +1,77 @@
+"""Tests for metadata-vector similarity search."""
+
+import numpy as np
+import pytest
+
+from rekordbox_mcp.analytics import LibraryColumns
+from rekordbox_mcp.similarity import TrackVectors
+
+
+@pytest.fixture
+def make_vectors(make_row):
+    def make(specs):
+        rows = [
+            make_row(i, BPM=int(bpm * 100), KeyName=key, GenreName=genre)
+            for i, (bpm, key, genre) in enumerate(specs)
+        ]
+        return TrackVectors(LibraryColumns(rows))
+
+    return make
+
+
+class TestTrackVectors:
+    def test_nearest_matches_brute_force(self, make_vectors):
+        rng = np.random.default_rng(5)
+        keys = [f"{n}{l}" for n in range(1, 13) for l in "AB"]
+        vectors = make_vectors(
+            [
+                (rng.uniform(80, 180), keys[rng.integers(24)], "House")
+                for _ in range(500)
+            ]
+        )
+        found = vectors.nearest(0, k=5)
+        distances = np.linalg.norm(vectors.matrix - vectors.matrix[0], axis=1)
+        distances[0] = np.inf
+        assert [p for p, _ in found] == np.argsort(distances)[:5].tolist()
+        assert [d for _, d in found] == pytest.approx(
+            np.sort(distances)[:5].tolist(), abs=1e-3
+        )
+
+    def test_features_rank_neighbours(self, make_vectors):
+        vectors = make_vectors(
+            [
+                (124.0, "8A", "Deep House"),
+                (125.0, "8A", "House"),
+                (124.0, "2B", "Techno"),
+                (170.0, "8A", "Drum and Bass"),
+            ]
+        )
+        assert [p for p, _ in vectors.nearest(0, k=3)] == [1, 2, 3]
+
+    def test_mask(self, make_vectors):
+        vectors = make_vectors([(124.0, "8A", "House")] * 3)
+        mask = np.array([True, False, True])
+        assert [p for p, _ in vectors.nearest(0, k=5, mask=mask)] == [2]
+        assert vectors.nearest(0, k=5, mask=np.zeros(3, dtype=bool)) == []
+
+
+class TestFindSimilarTracks:
+    async def test_nearest_with_filters(self, database):
+        result = await database.find_similar_tracks("1", k=2, fields=["id"])
+        assert result["track"]["key"] == "5A"
+        assert [r["id"] for r in result["results"]] == ["5", "11"]
+        assert result["results"][0]["distance"] < result["results"][1]["distance"]
+
+        house = await database.find_similar_tracks("1", k=5, genre="house")
+        assert [r["id"] for r in house["results"]] == ["5", "11", "8"]
+
+        unplayed = await database.find_similar_tracks(
+            "1", k=1, exclude_session_id="201"
+        )
+        assert [r["id"] for r in unplayed["results"]] == ["11"]
+
+    async def test_invalid(self, database):
+        with pytest.raises(ValueError, match="not found"):
+            await database.find_similar_tracks("99")
+        with pytest.raises(ValueError, match="k must"):
+            await database.find_similar_tracks("1", k=0)
@@ -0,0 +1,93 @@
+"""Tests for streaming sketches and approximate analytics."""
+
+import random
+from collections import Counter
+
+import pytest
+
+from rekordbox_mcp.sketches import HyperLogLog, LibrarySketches, SpaceSaving
+
+
+@pytest.fixture
+def make_genre_row(make_row):
+    def make(id, genre, artist="A"):
+        return make_row(id, GenreName=genre, ArtistName=artist)
+
+    return make
+
+
+class TestHyperLogLog:
+    def test_small_counts_near_exact(self):
+        hll = HyperLogLog()
+        for i in range(100):
+            hll.add(f"artist {i}")
+            hll.add(f"artist {i}")
+        assert abs(hll.count() - 100) <= 2
+
+    def test_large_count_within_error(self):
+        hll = HyperLogLog(precision=12)
+        for i in range(50_000):
+            hll.add(str(i))
+        assert abs(hll.count() - 50_000) <= 3 * hll.relative_error * 50_000
+
+    def test_precision_range(self):
+        with pytest.raises(ValueError):
+            HyperLogLog(precision=2)
+
+
+class TestSpaceSaving:
+    def test_counts_bound_true_frequencies(self):
+        rng = random.Random(3)
+        stream = [f"g{int(rng.paretovariate(1.2))}" for _ in range(20_000)]
+        sketch = SpaceSaving(capacity=50)
+        for item in stream:
+            sketch.add(item)
+
+        truth = Counter(stream)
+        top = sketch.top(10)
+        assert [item for item, _, _ in top[:3]] == [
+            item for item, _ in truth.most_common(3)
+        ]
+        for item, count, error in top:
+            assert count - error <= truth[item] <= count
+        monitored = {item for item, _, _ in sketch.top(50)}
+        assert all(
+            c <= sketch.min_count for item, c in truth.items() if item not in monitored
+        )
+
+
+class TestLibrarySketches:
+    def test_incremental_then_rebuild(self, make_genre_row):
+        sketches = LibrarySketches(capacity=10)
+        rows = [make_genre_row(i, "House" if i % 3 else "Techno") for i in range(30)]
+        assert sketches.sync(rows)["added"] == 30
+        assert sketches.sync(rows) == {"added": 0, "stale": 0, "rebuilds": 0}
+
+        rows.append(make_genre_row(30, "Techno"))
+        assert sketches.sync(rows) == {"added": 1, "stale": 0, "rebuilds": 0}
+
+        rows[0] = make_genre_row(0, "Ambient")
+        assert sketches.sync(rows) == {"added": 1, "stale": 1, "rebuilds": 0}
+        assert sketches.top("genre", 5)["results"]["House"]["error"] == 1
+
+        assert sketches.sync(rows[:20]) == {"added": 20, "stale": 0, "rebuilds": 1}
+        assert sketches.top("genre", 5)["error_bounds"]["stale_rows"] == 0
+
+
+class TestApproximateAnalyzeLibrary:
+    async def test_top_genres_with_bounds(self, database):
+        result = await database.analyze_library("genre", "count", 2, approximate=True)
+        assert result["approximate"] is True
+        assert result["results"] == {
+            "Techno": {"count": 2, "error": 0},
+            "House": {"count": 2, "error": 0},
+        }
+        assert result["total_groups"] == 9
+        assert result["distinct"] == {"genres": 9, "artists": 7, "labels": 0}
+        assert result["error_bounds"]["max_overcount"] == 0
+
+    async def test_rejects_unsupported(self, database):
+        with pytest.raises(ValueError, match="groups by one of"):
+            await database.analyze_library("genre,key", "count", 5, approximate=True)
+        with pytest.raises(ValueError, match="aggregate_by=count"):
+            await database.analyze_library("genre", "playCount", 5, approximate=True)
@@ -0,0 +1,96 @@
+"""Tests for the next-track grid index."""
+
+import random
+
+import pytest
+
+from rekordbox_mcp.analytics import LibraryColumns
+from rekordbox_mcp.keys import key_distance
+from rekordbox_mcp.suggest import NextTrackIndex, wheel_position
+
+
+@pytest.fixture
+def make_index(make_row):
+    def make(specs):
+        rows = [
+            make_row(i, BPM=int(bpm * 100), KeyName=key, GenreName=genre)
+            for i, (bpm, key, genre) in enumerate(specs)
+        ]
+        return NextTrackIndex(LibraryColumns(rows))
+
+    return make
+
+
+class TestNextTrackIndex:
+    def test_wheel_position(self):
+        assert wheel_position("1A") == 0
+        assert wheel_position("Am") == wheel_position("8A") == 14
+        assert wheel_position("12B") == 23
+        assert wheel_position("") == -1
+
+    def test_matches_brute_force(self, make_index):
+        rng = random.Random(7)
+        keys = [f"{n}{l}" for n in range(1, 13) for l in "AB"] + [""]
+        specs = [
+            (rng.choice([0, rng.uniform(80, 180)]), rng.choice(keys), "House")
+            for _ in range(2000)
+        ]
+        index = make_index(specs)
+        assert len(index) == sum(1 for bpm, key, _ in specs if bpm and key)
+
+        seed = next(i for i, (bpm, key, _) in enumerate(specs) if bpm and key)
+        bpm, key, _ = specs[seed]
+        expected = {
+            i
+            for i, (b, k, _) in enumerate(specs)
+            if i != seed
+            and b
+            and k
+            and abs(b - bpm) <= bpm * 0.06
+            and key_distance(key, k) <= 1
+        }
+        found = index.suggest(seed, k=len(specs))
+        assert {position for position, *_ in found} == expected
+        scores = [score for _, score, _, _ in found]
+        assert scores == sorted(scores)
+
+    def test_ranks_closer_mixes_first(self, make_index):
+        index = make_index(
+            [
+                (124.0, "8A", "Deep House"),
+                (130.0, "9A", "Techno"),
+                (124.5, "8A", "Deep House"),
+                (124.0, "8B", "House"),
+            ]
+        )
+        assert [p for p, *_ in index.suggest(0, k=3)] == [2, 3, 1]
+        assert [p for p, *_ in index.suggest(0, k=1)] == [2]
+
+    def test_seed_without_key(self, make_index):
+        index = make_index([(124.0, "", "House")])
+        with pytest.raises(ValueError, match="recognised key"):
+            index.suggest(0, k=5)
+
+
+class TestSuggestNextTracks:
+    async def test_suggestions(self, database):
+        result = await database.suggest_next_tracks("1")
+        assert result["track"]["key"] == "5A"
+        assert [s["id"] for s in result["suggestions"]] == ["5"]
+        assert result["suggestions"][0]["bpm_delta"] == 2.0
+        assert result["suggestions"][0]["key_distance"] == 0
+
+        wider = await database.suggest_next_tracks(
+            "1", max_key_distance=2, fields=["id", "key"]
+        )
+        assert {s["id"] for s in wider["suggestions"]} == {"5", "10", "11"}
+        assert wider["suggestions"][0]["id"] == "5"
+
+        dub = await database.suggest_next_tracks("1", max_key_distance=2, genre="dub")
+        assert [s["id"] for s in dub["suggestions"]] == ["10"]
+
+    async def test_invalid(self, database):
+        with pytest.raises(ValueError, match="not found"):
+            await database.suggest_next_tracks("99")
+        with pytest.raises(ValueError, match="max_key_distance"):
+            await database.suggest_next_tracks("1", max_key_distance=9)